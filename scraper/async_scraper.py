@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Asyncio scraping engine with a global concurrency cap and per-host rate limits
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+import config
+from db_writer import DatabaseWriter
+from fetcher import HttpRequest, advance
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket limiting how often requests start against one host."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = None
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.updated is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    """Per-host concurrency semaphore plus token bucket, created on first use."""
+
+    def __init__(self, max_in_flight: int = None, rate: float = None, burst: int = None):
+        max_in_flight = max_in_flight or config.PER_HOST_CONCURRENCY
+        rate = rate or config.PER_HOST_RATE
+        burst = burst or config.PER_HOST_BURST
+        self.semaphores = defaultdict(lambda: asyncio.Semaphore(max_in_flight))
+        self.buckets = defaultdict(lambda: TokenBucket(rate, burst))
+
+    def for_url(self, url: str):
+        host = urlparse(url).netloc.lower()
+        return self.semaphores[host], self.buckets[host]
+
+
+class AsyncScrapeEngine:
+    """Scrape internships from a shared queue with httpx, saving through a single writer thread."""
+
+    def __init__(self, scraper, concurrency: int = None):
+        self.scraper = scraper
+        self.concurrency = concurrency or config.ASYNC_CONCURRENCY
+        self.hosts = HostLimiter()
+        self.writer = None
+        self.pending = []
+        # Shared requests (whole ATS boards) by URL and headers, kept for the run so the postings
+        # of one company wait for, or reuse, a single download
+        self.shared = {}
+
+    async def get(self, client: httpx.AsyncClient, request: HttpRequest) -> Optional[httpx.Response]:
+        """Make a tier's GET, reusing an identical request if it is a shared one."""
+        if not request.shared:
+            return await self.fetch(client, request)
+        key = (request.url, tuple(sorted(request.headers.items())))
+        task = self.shared.get(key)
+        if task is None:
+            task = self.shared[key] = asyncio.ensure_future(self.fetch(client, request))
+        # One waiter being cancelled must not cancel the download for the others
+        return await asyncio.shield(task)
+
+    async def fetch(self, client: httpx.AsyncClient, request: HttpRequest) -> Optional[httpx.Response]:
+        """Make a tier's GET within the host's limits."""
+        semaphore, bucket = self.hosts.for_url(request.url)
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                response = await client.get(request.url, headers=request.headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                logger.debug(f"{request.tier} fetch failed for {request.url}: {e}")
+                return None
+
+    def scrape_with_browser(self, url: str) -> Optional[str]:
+        """Blocking browser fallback run on a worker thread."""
+        driver = self.scraper.get_driver()
+        try:
+            return self.scraper.scrape_with_driver(url, driver)
+        finally:
+            self.scraper.return_driver(driver)
+
+    async def scrape_description(self, client: httpx.AsyncClient, browsers: asyncio.Semaphore,
+                                 url: str) -> Optional[str]:
+        """Run the fetcher's tier plan for a URL, making its requests with httpx."""
+        steps = self.scraper.fetcher.tiers(url)
+        answer = None
+        while True:
+            # Cache lookups, parsing and cache writes happen between requests and block,
+            # so the plan is advanced on a worker thread
+            done, step = await asyncio.to_thread(advance, steps, answer)
+            if done:
+                return step
+            if isinstance(step, HttpRequest):
+                answer = await self.get(client, step)
+            else:
+                semaphore, bucket = self.hosts.for_url(url)
+                async with browsers, semaphore:
+                    await bucket.acquire()
+                    answer = await asyncio.to_thread(self.scrape_with_browser, url)
+
+    async def add_keywords(self, batch: List[Tuple[Dict[str, Any], Optional[str]]]):
+        """Extract keywords for a batch of scraped internships in one NLP pass and queue them for saving."""
+        internships = [internship for internship, _ in batch]
+        try:
+            await asyncio.to_thread(self.scraper.add_keywords, internships,
+                                    [description for _, description in batch])
+        except Exception as e:
+            logger.error(f"Error extracting keywords: {e}")
+            for internship in internships:
+                internship['keywords'] = []
+
+        for internship in internships:
+            # put() blocks when the writer is backed up, so run it off the event loop
+            await asyncio.to_thread(self.writer.put, internship)
+
+    async def worker(self, queue: asyncio.Queue, client: httpx.AsyncClient, browsers: asyncio.Semaphore):
+        """Pull internships off the shared queue until it is drained.
+
+        Descriptions are collected until NLP_BATCH_SIZE are ready, then the worker that
+        fills the batch extracts its keywords in one pass like the threaded scraper.
+        """
+        while True:
+            internship = await queue.get()
+            job_description = None
+            try:
+                job_description = await self.scrape_description(client, browsers, internship['url'])
+                if not job_description:
+                    logger.debug(f"Could not scrape description for {internship['url']}")
+            except Exception as e:
+                logger.error(f"Error processing {internship.get('id', 'unknown')}: {e}")
+
+            self.pending.append((internship, job_description))
+            if len(self.pending) >= config.NLP_BATCH_SIZE:
+                batch, self.pending = self.pending, []
+                await self.add_keywords(batch)
+            queue.task_done()
+
+    async def run(self, internships: List[Dict[str, Any]]) -> int:
+        """Scrape and save all internships, returning how many were saved."""
+        queue = asyncio.Queue()
+        for internship in internships:
+            queue.put_nowait(internship)
+
+        # Browsers are expensive, so cap them separately from HTTP fetches
+        browsers = asyncio.Semaphore(self.scraper.max_workers)
+        limits = httpx.Limits(max_connections=self.concurrency,
+                              max_keepalive_connections=config.HTTP_POOL_SIZE)
+        timeout = httpx.Timeout(config.HTTP_TIMEOUT)
+
+        # Results are persisted continuously by a single writer thread
+        self.writer = DatabaseWriter(self.scraper.engine)
+        self.writer.start()
+
+        async with httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True) as client:
+            workers = [
+                asyncio.create_task(self.worker(queue, client, browsers))
+                for _ in range(min(self.concurrency, len(internships)))
+            ]
+            try:
+                await queue.join()
+                # Workers only extract full batches, the last partial one is left here
+                batch, self.pending = self.pending, []
+                if batch:
+                    await self.add_keywords(batch)
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                await asyncio.to_thread(self.writer.close)
+
+        return self.writer.rows_written
+
+
+if __name__ == "__main__":
+    from fast_scraper import FastInternshipScraper
+
+    scraper = FastInternshipScraper()
+    try:
+        scraper.scrape_all_async()
+    finally:
+        scraper.close()
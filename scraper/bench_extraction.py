@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: description extraction in one execute_script() vs a find_elements() /
+element.text round trip per selector, on the saved pages in fixtures/pages
+
+Needs Chrome and ChromeDriver, like the scrapers.
+
+Usage: python bench_extraction.py [repeats]   (default: 20)
+"""
+
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+
+import config
+from page_extraction import extract_in_page
+from resources import get_chromedriver_path
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+def find_elements_extract(driver) -> str:
+    """The previous approach: one WebDriver call per selector and per matching element."""
+    from selenium.webdriver.common.by import By
+
+    job_description = ""
+    for selector in config.JOB_DESCRIPTION_SELECTORS:
+        try:
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            for element in elements:
+                text = element.text.strip()
+                if len(text) > len(job_description) and len(text) > 100:
+                    job_description = text
+        except Exception:
+            continue
+        if job_description and len(job_description) > 500:
+            break
+    if not job_description:
+        job_description = driver.find_element(By.TAG_NAME, "body").text
+    return re.sub(r'\s+', ' ', job_description).strip()
+
+
+def timed(fn, repeats: int):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
+
+
+if __name__ == "__main__":
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=options)
+    driver.implicitly_wait(0)
+
+    try:
+        print(f"{len(config.JOB_DESCRIPTION_SELECTORS)} selectors, median of {repeats} runs per page")
+        for path in sorted(glob.glob(os.path.join(PAGES_DIR, '*.html'))):
+            driver.get('file://' + path)
+            old_text, old_ms = timed(lambda: find_elements_extract(driver), repeats)
+            new, new_ms = timed(lambda: extract_in_page(driver), repeats)
+            name = os.path.splitext(os.path.basename(path))[0]
+            print(f"  {name:<14} find_elements {old_ms:>7.1f} ms | execute_script {new_ms:>6.2f} ms "
+                  f"({new_ms and old_ms / new_ms:.0f}x) | {len(old_text):>5} vs {len(new.text):>5} chars "
+                  f"via {new.selector or 'body'}")
+    finally:
+        driver.quit()
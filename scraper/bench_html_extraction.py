@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: static HTML extraction with lxml and compiled selectors vs BeautifulSoup,
+on the saved pages in fixtures/pages
+
+Usage: python bench_html_extraction.py [repeats]   (default: 50)
+"""
+
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+import config
+from html_extraction import NON_CONTENT_TAGS, SelectorEngine
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+def soup_extract(html: str) -> str:
+    """The previous approach: BeautifulSoup, soup.select() per selector and a regex cleanup."""
+    soup = BeautifulSoup(html, 'lxml')
+    for tag in soup(NON_CONTENT_TAGS):
+        tag.decompose()
+
+    job_description = ""
+    for selector in config.JOB_DESCRIPTION_SELECTORS:
+        try:
+            elements = soup.select(selector)
+        except Exception:
+            continue
+        for element in elements:
+            text = element.get_text(' ', strip=True)
+            if len(text) > len(job_description) and len(text) > 100:
+                job_description = text
+        if job_description and len(job_description) > 500:
+            break
+
+    if not job_description and soup.body:
+        job_description = soup.body.get_text(' ', strip=True)
+    return re.sub(r'\s+', ' ', job_description).strip()
+
+
+def timed(fn, repeats: int):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    start = time.perf_counter()
+    engine = SelectorEngine()
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(engine.compiled)} selectors compiled in {compile_ms:.1f} ms, median of {repeats} runs per page")
+
+    soup_total = engine_total = 0.0
+    paths = sorted(glob.glob(os.path.join(PAGES_DIR, '*.html')))
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        old_text, old_ms = timed(lambda: soup_extract(html), repeats)
+        block, new_ms = timed(lambda: engine.best_block(html), repeats)
+        soup_total += old_ms
+        engine_total += new_ms
+        name = os.path.splitext(os.path.basename(path))[0]
+        print(f"  {name:<14} {len(html) // 1024:>4} KB | BeautifulSoup {old_ms:>6.2f} ms | lxml {new_ms:>5.2f} ms "
+              f"({old_ms / new_ms:.0f}x) | {len(old_text):>5} vs {len(block.text):>5} chars via "
+              f"{block.selector or 'fallback'}")
+
+    print(f"\n  Pages per minute per core: BeautifulSoup {len(paths) / soup_total * 60000:,.0f} | "
+          f"lxml {len(paths) / engine_total * 60000:,.0f}")
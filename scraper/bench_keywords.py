@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-keyword substring loop vs the compiled keyword matcher
+
+Usage: python bench_keywords.py [descriptions]   (default: 2000)
+"""
+
+import random
+import sys
+import time
+
+import config
+from keyword_matcher import MATCHER
+
+FILLER = (
+    "the team is looking for a motivated intern to join our engineering group and work on "
+    "production systems used by millions of customers across the world you will design build "
+    "and ship features review code write documentation and go to market with product partners"
+).split()
+
+
+def make_descriptions(count: int, seed: int = 0):
+    """Synthetic descriptions: ~3000 characters of filler with a handful of real keywords."""
+    rng = random.Random(seed)
+    keywords = sorted(config.TECH_KEYWORDS)
+    descriptions = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(450)]
+        for keyword in rng.sample(keywords, 12):
+            words.insert(rng.randrange(len(words)), keyword.title() + rng.choice(["", ",", "."]))
+        descriptions.append(' '.join(words))
+    return descriptions
+
+
+def substring_loop(text: str):
+    """The previous matcher: one substring scan per keyword."""
+    text_lower = text.lower()
+    return {keyword for keyword in config.TECH_KEYWORDS if keyword in text_lower}
+
+
+def timed(fn, descriptions):
+    start = time.perf_counter()
+    results = [fn(text) for text in descriptions]
+    return time.perf_counter() - start, results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    descriptions = make_descriptions(count)
+
+    loop_time, loop_results = timed(substring_loop, descriptions)
+    matcher_time, matcher_results = timed(MATCHER.find, descriptions)
+
+    loop_hits = sum(len(r) for r in loop_results) / count
+    matcher_hits = sum(len(r) for r in matcher_results) / count
+    print(f"{count} descriptions, {len(config.TECH_KEYWORDS)} keywords")
+    print(f"substring loop: {count / loop_time:>8,.0f} docs/s | {loop_hits:.1f} keywords/doc")
+    print(f"matcher:        {count / matcher_time:>8,.0f} docs/s | {matcher_hits:.1f} keywords/doc")
+    print(f"speedup: {loop_time / matcher_time:.1f}x")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized match scoring vs scoring posting by posting in Python
+
+Usage: python bench_scoring.py [postings]   (default: 100000)
+"""
+
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+from match_scoring import MatchScorer
+from taxonomy import SKILLS_BY_ID
+
+RESUME = ["python", "java", "sql", "react", "aws", "docker", "git", "machine learning", "pandas", "linux"]
+
+
+def make_scorer(count: int, seed: int = 0) -> MatchScorer:
+    """Postings with ~12 skills each, drawn with a skewed popularity like real descriptions."""
+    rng = random.Random(seed)
+    skill_ids = sorted(SKILLS_BY_ID)
+    weights = [1 / (rank + 1) for rank in range(len(skill_ids))]
+    rows, columns = [], []
+    for i in range(count):
+        for skill_id in set(rng.choices(skill_ids, weights, k=12)):
+            rows.append(i)
+            columns.append(skill_id)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)),
+                               shape=(count, max(skill_ids) + 1))
+    return MatchScorer([f"bench-{i}" for i in range(count)], matrix)
+
+
+def python_top_matches(scorer: MatchScorer, skills, k: int):
+    """Per-posting loop like the web app's: overlap / posting skill count, then a full sort."""
+    resume = set(scorer.query_vector(skills).nonzero()[0])
+    matrix = scorer.matrix
+    scores = []
+    for i in range(matrix.shape[0]):
+        posting = matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]
+        matches = sum(1 for skill_id in posting if skill_id in resume)
+        scores.append((100 * matches / max(1, len(posting)), scorer.ids[i]))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def median_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    scorer = make_scorer(count)
+    print(f"{count} postings, {scorer.matrix.nnz} posting skills, top 20 for a {len(RESUME)}-skill resume")
+
+    vectorized = median_ms(lambda: scorer.top_matches(RESUME, 20), runs=50)
+    weighted = median_ms(lambda: scorer.top_matches(RESUME, 20, idf=True), runs=50)
+    loop = median_ms(lambda: python_top_matches(scorer, RESUME, 20), runs=3)
+    print(f"vectorized:       {vectorized:>8.2f} ms")
+    print(f"vectorized (IDF): {weighted:>8.2f} ms")
+    print(f"Python loop:      {loop:>8.2f} ms ({loop / vectorized:.0f}x slower)")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: skill queries through the internship_skills index (SQL and in-memory bitmaps)
+vs scanning keywords JSON
+
+Usage: python bench_skill_index.py [postings]   (default: 100000)
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import select
+
+from database import create_db_engine, ensure_schema, upsert_internships
+from models import Internship
+from skill_index import SkillIndex, find_internships
+from taxonomy import SKILLS_BY_ID
+
+SEASONS = ["Summer", "Fall", "Winter", "Spring"]
+SPONSORSHIPS = ["Offers Sponsorship", "Does Not Offer Sponsorship", "Other"]
+
+QUERIES = [
+    {'all_of': ["python", "kubernetes"]},
+    {'all_of': ["java"], 'season': "Summer"},
+    {'all_of': ["rust", "go"], 'none_of': ["java"]},
+    {'any_of': ["react", "vue", "angular"], 'sponsorship': "Offers Sponsorship"},
+    {'all_of': ["python"], 'any_of': ["pytorch", "tensorflow"], 'none_of': ["c++"]},
+]
+
+
+def make_rows(count: int, seed: int = 0):
+    """Postings with ~12 skills each, drawn with a skewed popularity like real descriptions."""
+    rng = random.Random(seed)
+    skill_names = [skill.name for skill in SKILLS_BY_ID.values()]
+    weights = [1 / (rank + 1) for rank in range(len(skill_names))]
+    rows = []
+    for i in range(count):
+        keywords = set(rng.choices(skill_names, weights, k=12))
+        rows.append({
+            'id': f"bench-{i}",
+            'active': rng.random() > 0.1,
+            'company_name': f"Company {i % 500}",
+            'season': rng.choice(SEASONS),
+            'sponsorship': rng.choice(SPONSORSHIPS),
+            'title': f"Software Engineering Intern {i}",
+            'keywords': sorted(keywords),
+        })
+    return rows
+
+
+def scan(engine, all_of=(), any_of=(), none_of=(), season=None, sponsorship=None):
+    """The previous approach: load every row's keywords and filter in Python."""
+    all_of, any_of, none_of = set(all_of), set(any_of), set(none_of)
+    table = Internship.__table__
+    with engine.connect() as conn:
+        rows = conn.execute(select(table.c.id, table.c.keywords, table.c.season,
+                                   table.c.sponsorship, table.c.active)).all()
+    return [
+        row.id for row in rows
+        if row.active and (not season or row.season == season)
+        and (not sponsorship or row.sponsorship == sponsorship)
+        and all_of <= set(row.keywords or []) and (not any_of or any_of & set(row.keywords or []))
+        and not none_of & set(row.keywords or [])
+    ]
+
+
+def median_ms(fn, runs: int = 20) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(os.path.join(tmp, "bench.db"))
+        ensure_schema(engine)
+        upsert_internships(engine, make_rows(count))
+        start = time.perf_counter()
+        index = SkillIndex(engine)
+        print(f"{count} postings, SQLite (bitmaps loaded in {time.perf_counter() - start:.2f} s)")
+
+        for query in QUERIES:
+            ids = index.query(**query)
+            assert sorted(ids) == sorted(find_internships(engine, **query)) == sorted(scan(engine, **query)), query
+            bitmap_ms = median_ms(lambda: index.query(**query), runs=200)
+            sql_ms = median_ms(lambda: find_internships(engine, **query))
+            scan_ms = median_ms(lambda: scan(engine, **query), runs=3)
+            print(f"{query}\n    {len(ids):>6} hits | bitmaps {bitmap_ms:>7.3f} ms | "
+                  f"SQL {sql_ms:>7.2f} ms | JSON scan {scan_ms:>7.1f} ms")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup time of each CLI entry point
+
+Every measurement runs in a fresh interpreter, so import and model-loading costs are
+included. "import" is the time to import the script; "ready" also constructs the
+scraper (against a throwaway database) where the script has one.
+
+Usage: python bench_startup.py [runs]   (default: 5)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ENTRY_POINTS = [
+    # (script, code that gets it ready to work)
+    ("stats", None),
+    ("view_data", None),
+    ("check_dates", None),
+    ("feed_snapshot", None),
+    ("test_api", None),
+    ("run_scraper", "from scraper import InternshipScraper; InternshipScraper({db!r}).close()"),
+    ("batch_scraper", "from scraper import InternshipScraper; InternshipScraper({db!r}).close()"),
+    ("run_fast", "from fast_scraper import FastInternshipScraper; FastInternshipScraper({db!r}).close()"),
+    ("super_fast_batch", "from fast_scraper import FastInternshipScraper; FastInternshipScraper({db!r}).close()"),
+    ("async_scraper", None),
+]
+
+
+def time_python(code: str, runs: int) -> float:
+    """Median wall-clock seconds to run code in a new interpreter."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=SCRIPT_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        baseline = time_python("pass", runs)
+        print(f"Median of {runs} runs, bare interpreter: {baseline * 1000:.0f} ms")
+        print(f"{'entry point':<18} {'import':>10} {'ready':>10}")
+        for script, ready_code in ENTRY_POINTS:
+            import_time = time_python(f"import {script}", runs)
+            ready = time_python(f"import {script}; " + ready_code.format(db=db_path), runs) if ready_code else None
+            ready_text = f"{ready * 1000:>8.0f}ms" if ready is not None else f"{'-':>10}"
+            print(f"{script:<18} {import_time * 1000:>8.0f}ms {ready_text}")
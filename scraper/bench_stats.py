@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stats aggregations in SQL (json_each / skill index) and skill pairs from the
+co-occurrence matrix vs flattening JSON in Python
+
+Usage: python bench_stats.py [postings]   (default: 100000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from sqlalchemy.orm import sessionmaker
+
+from bench_skill_index import make_rows
+from database import create_db_engine, ensure_schema, upsert_internships
+from models import Internship
+from cooccurrence import load_cooccurrence
+from stats import skill_counts, top_json_values
+
+CITIES = ["New York, NY", "San Francisco, CA", "Seattle, WA", "Austin, TX", "Toronto, ON", "Remote"]
+
+
+def python_locations(session):
+    """The previous approach: load every row's locations and count them in Python."""
+    counts = Counter()
+    for (locations,) in session.query(Internship.locations).all():
+        counts.update(locations or [])
+    return counts.most_common(10)
+
+
+def python_pairs(session):
+    counts = Counter()
+    for (skill_ids,) in session.query(Internship.skill_ids).all():
+        skill_ids = skill_ids or []
+        for i in range(len(skill_ids)):
+            for j in range(i + 1, len(skill_ids)):
+                counts[skill_ids[i], skill_ids[j]] += 1
+    return counts.most_common(15)
+
+
+def python_skill_counts(session):
+    counts = Counter()
+    for (skill_ids,) in session.query(Internship.skill_ids).all():
+        counts.update(skill_ids or [])
+    return counts.most_common()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(os.path.join(tmp, "bench.db"))
+        ensure_schema(engine)
+        rows = make_rows(count)
+        for row in rows:
+            row['locations'] = rng.sample(CITIES, rng.randint(1, 3))
+        upsert_internships(engine, rows)
+        session = sessionmaker(bind=engine)()
+        print(f"{count} postings, SQLite")
+
+        cases = [
+            ("Top locations", lambda: top_json_values(session, Internship.locations, 10), lambda: python_locations(session)),
+            ("Top skill pairs", lambda: [pair[:3] for pair in load_cooccurrence(engine, cache_dir=tmp).top_pairs(15)],
+             lambda: python_pairs(session)),
+            ("Skill counts", lambda: skill_counts(session), lambda: python_skill_counts(session)),
+        ]
+        for name, sql, python in cases:
+            sql_result, sql_ms = timed(sql)
+            python_result, python_ms = timed(python)
+            assert [tuple(r)[-1] for r in sql_result] == [c for _, c in python_result], name
+            print(f"  {name:<16} SQL {sql_ms:>8.1f} ms | Python {python_ms:>8.1f} ms")
+
+        _, cached_ms = timed(lambda: load_cooccurrence(engine, cache_dir=tmp).top_pairs(15))
+        print(f"  {'(cached pairs)':<16} {cached_ms:>12.1f} ms")
+        session.close()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row ORM saves vs set-based bulk upsert
+
+Usage: python bench_upsert.py [sizes...]   (default: 1000 10000 100000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Internship
+from database import upsert_internships
+
+SEASONS = ["Summer", "Fall", "Winter", "Spring"]
+KEYWORDS = ["python", "java", "react", "aws", "docker", "sql", "kubernetes", "git", "linux", "pandas"]
+
+
+def make_rows(count: int, seed: int = 0):
+    """Synthetic internships shaped like the API feed."""
+    rng = random.Random(seed)
+    return [{
+        'id': f"bench-{i}",
+        'active': True,
+        'company_name': f"Company {i % 500}",
+        'date_posted': 1746057600 + i,
+        'date_updated': 1746057600 + i,
+        'is_visible': True,
+        'locations': [f"City {rng.randint(1, 50)}"],
+        'season': rng.choice(SEASONS),
+        'sponsorship': "Other",
+        'title': f"Software Engineering Intern {i}",
+        'url': f"https://example.com/jobs/{i}",
+        'keywords': rng.sample(KEYWORDS, 4),
+        'xata': {'version': 1},
+    } for i in range(count)]
+
+
+def orm_save(session_factory, rows):
+    """The previous save path: SELECT per row, then mutate or add ORM objects."""
+    session = session_factory()
+    try:
+        for data in rows:
+            existing = session.query(Internship).filter_by(id=data['id']).first()
+            if existing:
+                for key, value in data.items():
+                    setattr(existing, key, value)
+                existing.scraped_at = datetime.utcnow()
+            else:
+                session.add(Internship(**data))
+        session.commit()
+    finally:
+        session.close()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench(count: int):
+    rows = make_rows(count)
+    # Second pass updates half of the rows and inserts as many new ones, like a re-scrape
+    new_rows = make_rows(count // 2, seed=1)
+    for row in new_rows:
+        row['id'] += "-new"
+    rerun = rows[count // 2:] + new_rows
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("orm", "upsert"):
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, name + '.db')}")
+            Base.metadata.create_all(engine)
+            if name == "orm":
+                session_factory = sessionmaker(bind=engine)
+                save = lambda batch: orm_save(session_factory, batch)
+            else:
+                save = lambda batch: upsert_internships(engine, batch)
+            elapsed = timed(lambda: save(rows)) + timed(lambda: save(rerun))
+            results[name] = (len(rows) + len(rerun)) / elapsed
+            engine.dispose()
+
+    print(f"{count:>8} rows | ORM: {results['orm']:>10,.0f} rows/s | "
+          f"upsert: {results['upsert']:>10,.0f} rows/s | {results['upsert'] / results['orm']:.1f}x")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    print("Insert pass + mixed insert/update pass, SQLite")
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,280 @@
+"""
+Bounded pool of Selenium browsers shared by scraper threads
+
+Browsers are created on demand (or pre-warmed) up to a fixed size, checked for
+liveness before each reuse, and restarted after BROWSER_MAX_PAGES pages or once
+their process tree grows past BROWSER_MAX_MEMORY_MB, since Chrome leaks memory
+over long sessions.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+
+import config
+
+# Selenium is only imported once a browser is actually needed
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+RECYCLE_PAGES = 'pages'
+RECYCLE_MEMORY = 'memory'
+RECYCLE_DEAD = 'dead'
+RECYCLE_BROKEN = 'broken'
+
+
+def process_tree_memory_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process and all its descendants (Linux /proc only)."""
+    if not os.path.isdir('/proc'):
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so parse after its closing parenthesis
+                parent = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        pending.extend(children.get(current, ()))
+    return total / (1024 * 1024)
+
+
+class _Browser:
+    """A pooled driver and its usage."""
+
+    def __init__(self, driver: "webdriver.Chrome"):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = getattr(getattr(self.driver, 'service', None), 'process', None)
+        return process.pid if process is not None else None
+
+
+class BrowserPool:
+    """Hands out at most `size` live browsers to worker threads.
+
+    acquire() reuses an idle browser if it still answers, creates one if the pool is
+    below its size, and otherwise waits for a release. Use `with pool.driver() as driver:`
+    to borrow one for a page.
+    """
+
+    def __init__(self, factory: Callable[[], "webdriver.Chrome"], size: int = None,
+                 max_pages: int = None, max_memory_mb: float = None, acquire_timeout: float = None):
+        self.factory = factory
+        self.size = size or config.BROWSER_POOL_SIZE or config.CONCURRENT_WORKERS
+        self.max_pages = max_pages if max_pages is not None else config.BROWSER_MAX_PAGES
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else config.BROWSER_MAX_MEMORY_MB
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else config.BROWSER_ACQUIRE_TIMEOUT
+
+        self._condition = threading.Condition()
+        self._idle: List[_Browser] = []
+        self._leased: Dict[int, _Browser] = {}
+        self._live = 0  # Idle + leased + being created
+        self._closed = False
+
+        self.created = 0
+        self.failed = 0
+        self.acquired = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.recycled: Dict[str, int] = {}
+
+    def _create(self) -> _Browser:
+        """Start a browser for a slot already counted in _live."""
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._condition:
+                self._live -= 1
+                self.failed += 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+        logger.debug(f"Started browser in {time.perf_counter() - start:.1f}s")
+        return _Browser(driver)
+
+    def _discard(self, browser: _Browser, reason: str = None):
+        """Quit a browser and free its slot; reason counts it as recycled."""
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser: {e}")
+        with self._condition:
+            self._live -= 1
+            if reason:
+                self.recycled[reason] = self.recycled.get(reason, 0) + 1
+            self._condition.notify()
+
+    @staticmethod
+    def is_alive(browser: _Browser) -> bool:
+        """Liveness probe: the driver process is running and the browser answers a script."""
+        process = getattr(getattr(browser.driver, 'service', None), 'process', None)
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def recycle_reason(self, browser: _Browser) -> Optional[str]:
+        if self.max_pages and browser.pages >= self.max_pages:
+            return RECYCLE_PAGES
+        if self.max_memory_mb and browser.pid is not None:
+            memory = process_tree_memory_mb(browser.pid)
+            if memory is not None and memory > self.max_memory_mb:
+                logger.info(f"Recycling browser using {memory:.0f} MB after {browser.pages} pages")
+                return RECYCLE_MEMORY
+        return None
+
+    def acquire(self, timeout: float = None) -> "webdriver.Chrome":
+        """Borrow a live browser, waiting up to timeout seconds for one to be free."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        while True:
+            with self._condition:
+                browser = None
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    if self._idle:
+                        browser = self._idle.pop()
+                        break
+                    if self._live < self.size:
+                        self._live += 1
+                        break
+                    remaining = timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser free after {timeout:g}s ({self.size} in use)")
+                    self._condition.wait(remaining)
+
+            if browser is None:
+                browser = self._create()
+            elif not self.is_alive(browser):
+                logger.info("Replacing a browser that stopped responding")
+                self._discard(browser, RECYCLE_DEAD)
+                continue
+
+            waited = time.monotonic() - start
+            with self._condition:
+                self._leased[id(browser.driver)] = browser
+                self.acquired += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+            return browser.driver
+
+    def release(self, driver: "webdriver.Chrome", broken: bool = False):
+        """Return a borrowed browser after one page; broken=True restarts it."""
+        with self._condition:
+            browser = self._leased.pop(id(driver), None)
+        if browser is None:
+            logger.warning("Released a browser that was not borrowed from this pool")
+            return
+
+        browser.pages += 1
+        reason = RECYCLE_BROKEN if broken else self.recycle_reason(browser)
+        if reason or self._closed:
+            self._discard(browser, reason)
+            return
+        with self._condition:
+            self._idle.append(browser)
+            self._condition.notify()
+
+    @contextmanager
+    def driver(self, timeout: float = None) -> Iterator["webdriver.Chrome"]:
+        """Borrow a browser for the duration of the block."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def prewarm(self, count: int = None, background: bool = True):
+        """Start browsers ahead of the first page, in a background thread by default."""
+        count = config.BROWSER_PREWARM if count is None else count
+
+        def warm():
+            for _ in range(count):
+                with self._condition:
+                    if self._closed or self._live >= self.size:
+                        return
+                    self._live += 1
+                try:
+                    browser = self._create()
+                except Exception as e:
+                    logger.warning(f"Could not pre-warm browser: {e}")
+                    return
+                with self._condition:
+                    if not self._closed:
+                        self._idle.append(browser)
+                        self._condition.notify()
+                        continue
+                self._discard(browser)
+
+        if count <= 0:
+            return
+        if background:
+            threading.Thread(target=warm, name="browser-prewarm", daemon=True).start()
+        else:
+            warm()
+
+    def clear(self):
+        """Quit every idle browser; the pool stays usable."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._discard(browser)
+
+    def close(self):
+        """Quit idle browsers now and leased ones as they are released."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'size': self.size,
+                'live': self._live,
+                'idle': len(self._idle),
+                'in_use': len(self._leased),
+                'created': self.created,
+                'failed': self.failed,
+                'acquired': self.acquired,
+                'avg_wait_ms': self.wait_time / self.acquired * 1000 if self.acquired else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+                'recycled': dict(self.recycled),
+            }
+
+    def log_stats(self):
+        stats = self.stats()
+        if not stats['acquired'] and not stats['created']:
+            return
+        recycled = ', '.join(f"{reason} {count}" for reason, count in sorted(stats['recycled'].items())) or 'none'
+        logger.info(f"Browser pool: {stats['created']} started ({stats['failed']} failed), "
+                    f"{stats['acquired']} pages served, wait avg {stats['avg_wait_ms']:.0f} ms / "
+                    f"max {stats['max_wait_ms']:.0f} ms, recycled: {recycled}")
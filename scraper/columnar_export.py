@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Columnar export of the internships table to Parquet or Arrow IPC
+
+Rows are streamed from the database in chunks and each chunk is written as one
+Parquet row group (or Arrow record batch), so memory stays flat however large the
+table is. locations, keywords and skill_ids are list columns; company_name, season
+and sponsorship are dictionary encoded. Needs pyarrow (pip install pyarrow).
+
+Usage:
+    python columnar_export.py                                 # internships.parquet
+    python columnar_export.py internships.arrows --format arrow
+    python columnar_export.py exports/ --incremental          # New part file with rows written since the last run
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+import config
+from database import get_metadata, set_metadata, stream_rows
+from models import Internship
+
+logger = logging.getLogger(__name__)
+
+# Format -> file extension (".arrows" is the Arrow IPC stream format)
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrows'}
+
+DICTIONARY_COLUMNS = ('company_name', 'season', 'sponsorship')
+
+# sync_metadata key holding the highest row_version already exported to a directory
+MARK_KEY = 'columnar_export_version:{}'
+
+
+def _pyarrow():
+    """Import pyarrow on first use so the scrapers don't need it installed."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Columnar export needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def arrow_schema(pa):
+    """Arrow schema of the export, in internships column order."""
+    text_dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        pa.field('id', pa.string(), nullable=False),
+        ('active', pa.bool_()),
+        ('company_name', text_dictionary),
+        ('date_posted', pa.int64()),
+        ('date_updated', pa.int64()),
+        ('is_visible', pa.bool_()),
+        ('locations', pa.list_(pa.string())),
+        ('season', text_dictionary),
+        ('sponsorship', text_dictionary),
+        ('title', pa.string()),
+        ('url', pa.string()),
+        ('keywords', pa.list_(pa.string())),
+        ('skill_ids', pa.list_(pa.int32())),
+        ('xata', pa.string()),  # JSON text
+        ('scraped_at', pa.timestamp('us')),
+        ('row_version', pa.int64()),
+    ])
+
+
+class _Dictionary:
+    """Value -> code mapping shared by every batch of one column.
+
+    The dictionary only ever grows, so an Arrow stream ships just the new values of
+    each batch (dictionary deltas) and codes stay the same across the whole file.
+    """
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, pa, values: List[Optional[str]]):
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+                continue
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            indices.append(code)
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(self.values, pa.string()))
+
+
+def _record_batch(pa, schema, rows, dictionaries: Dict[str, _Dictionary]):
+    columns = dict(zip(schema.names, map(list, zip(*rows))))
+    columns['xata'] = [None if value is None else json.dumps(value) for value in columns['xata']]
+    arrays = []
+    for field in schema:
+        if field.name in dictionaries:
+            arrays.append(dictionaries[field.name].encode(pa, columns[field.name]))
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _open_writer(pa, fmt: str, path: str, schema):
+    if fmt == 'parquet':
+        return pa.parquet.ParquetWriter(path, schema, compression=config.EXPORT_COMPRESSION)
+    options = pa.ipc.IpcWriteOptions(compression=config.EXPORT_COMPRESSION, emit_dictionary_deltas=True)
+    return pa.ipc.new_stream(path, schema, options=options)
+
+
+def export_columnar(engine, output: str, fmt: str = 'parquet', incremental: bool = False,
+                    chunk_size: int = None) -> Tuple[Optional[str], int]:
+    """Export internships, least recently written first. Returns (path written, row count).
+
+    With incremental=True, output is a directory and each run adds a part file with only
+    the rows written (inserted, updated or deactivated) since the previous run there - no
+    file is written if there are none. Rows are tracked by row_version, which is assigned
+    in commit order, so a row committed after an export is never skipped. An updated
+    posting appears again in a later part, so readers of the directory keep the row with
+    the highest row_version per id.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    pa = _pyarrow()
+    chunk_size = chunk_size or config.EXPORT_CHUNK_SIZE
+
+    schema = arrow_schema(pa)
+    table = Internship.__table__
+    # Rows written before row_version existed sort first (NULL)
+    query = select(*[table.c[name] for name in schema.names]).order_by(table.c.row_version, table.c.id)
+
+    mark_key = MARK_KEY.format(os.path.abspath(output))
+    if incremental:
+        mark = get_metadata(engine, mark_key)
+        if mark:
+            query = query.where(table.c.row_version > int(mark))
+        os.makedirs(output, exist_ok=True)
+        path = os.path.join(output, f"internships-{datetime.utcnow():%Y%m%dT%H%M%S%f}{FORMATS[fmt]}")
+    else:
+        path = output
+
+    # Written under a temporary name so readers never see a half-written file
+    temp_path = path + '.tmp'
+    dictionaries = {name: _Dictionary() for name in DICTIONARY_COLUMNS}
+    count = 0
+    newest = None
+    try:
+        with engine.connect() as conn, _open_writer(pa, fmt, temp_path, schema) as writer:
+            for rows in stream_rows(conn, query, chunk_size):
+                writer.write_table(pa.Table.from_batches([_record_batch(pa, schema, rows, dictionaries)]))
+                count += len(rows)
+                newest = rows[-1].row_version or newest
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if incremental and count == 0:
+        os.remove(temp_path)
+        logger.info(f"No internships scraped since the last export to {output}")
+        return None, 0
+
+    os.replace(temp_path, path)
+    if incremental and newest is not None:
+        set_metadata(engine, mark_key, str(newest))
+    logger.info(f"Exported {count} internships to {path}")
+    return path, count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from database import open_database
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Export internships to Parquet or Arrow IPC")
+    parser.add_argument("output", nargs="?", help="Output file, or directory with --incremental")
+    parser.add_argument("--format", choices=list(FORMATS), default='parquet')
+    parser.add_argument("--incremental", action="store_true",
+                        help="Write only rows written since the last incremental export to this directory")
+    parser.add_argument("--chunk-size", type=int, default=config.EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    output = args.output or ("exports" if args.incremental else "internships" + FORMATS[args.format])
+    # Only --incremental writes (its export mark); neither mode migrates the schema
+    engine = open_database(config.DATABASE_PATH, readonly=not args.incremental)
+    path, count = export_columnar(engine, output, args.format, args.incremental, args.chunk_size)
+    if path:
+        print(f"Exported {count} internships to {path}")
+    else:
+        print("Nothing new to export")
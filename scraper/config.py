@@ -4,69 +4,302 @@ Configuration settings for the internship scraper
 
 # API settings
 API_URL = "https://jobs.cvrve.me/api/intern"
+FEED_CHUNK_SIZE = 64 * 1024  # Bytes read at a time while streaming the feed
+
+# Feed snapshot settings (compressed local copies of the feed)
+FEED_SNAPSHOT_ENABLED = True
+FEED_SNAPSHOT_DIR = "feed_snapshots"
+FEED_SNAPSHOT_TTL = 15 * 60  # Reuse the last download for this long without asking the API (seconds)
+FEED_SNAPSHOT_KEEP = 5  # Snapshots kept on disk for diffing
 
 # Database settings
 DATABASE_PATH = "internships.db"
+UPSERT_CHUNK_SIZE = 500  # Rows per INSERT ... ON CONFLICT statement
+SQLITE_JOURNAL_MODE = "WAL"  # Readers (stats.py, view_data.py) never block the scraper's writes
+SQLITE_SYNCHRONOUS = "NORMAL"  # Safe with WAL; use "FULL" for maximum durability
+SQLITE_BUSY_TIMEOUT_MS = 30000  # Wait this long for a lock instead of failing
+
+# Export settings
+EXPORT_CHUNK_SIZE = 10000  # Rows read from the database at a time by the exports (also the Parquet row group size)
+EXPORT_COMPRESSION = "zstd"  # Parquet/Arrow compression codec
+
+# Analysis settings
+COOCCURRENCE_CACHE_DIR = "cooccurrence_cache"  # Skill co-occurrence matrices, reused until the table changes
+
+# Database writer thread settings
+WRITER_QUEUE_SIZE = 1000  # Results waiting to be written before workers block
+WRITER_MAX_DELAY = 2.0  # Commit at least this often (seconds) even if the batch isn't full
 
 # Scraping delays (in seconds)
 MIN_DELAY = 0.5  # Minimum delay between requests (reduced for speed)
 MAX_DELAY = 2    # Maximum delay between requests (reduced for speed)
 PAGE_LOAD_TIMEOUT = 5  # Timeout for page loading (reduced for speed)
 
+# HTTP fetch settings (tried before falling back to the browser)
+HTTP_TIMEOUT = 10  # Timeout for plain HTTP requests
+HTTP_POOL_SIZE = 20  # Pooled connections kept per host
+STATIC_MIN_DESCRIPTION_LENGTH = 300  # Use Selenium unless a description selector matches at least this much static text
+
+# Description cache settings (conditional requests + skip unchanged keyword extraction)
+DESCRIPTION_CACHE_ENABLED = True
+DESCRIPTION_CACHE_PATH = "description_cache.db"
+DESCRIPTION_CACHE_TTL = 12 * 3600  # Serve cached descriptions without any request for this long (seconds)
+DESCRIPTION_CACHE_MAX_MB = 200  # Least recently used entries are evicted above this size
+
 # Fast scraping settings
 FAST_MODE = True  # Enable aggressive optimizations
 CONCURRENT_WORKERS = 5  # Number of concurrent browser instances
 
+# Async engine settings (replace the random delays with per-host limits)
+ASYNC_CONCURRENCY = 100  # Global cap on in-flight HTTP fetches
+PER_HOST_CONCURRENCY = 4  # In-flight requests allowed against a single host
+PER_HOST_RATE = 2.0  # Requests per second per host (token bucket refill rate)
+PER_HOST_BURST = 4  # Requests a host can receive back to back before throttling
+SAVE_BATCH_SIZE = 50  # Internships per database commit
+
 # Browser settings
 HEADLESS = True  # Run browser in headless mode
 WINDOW_SIZE = "1920,1080"
 
-# Keywords for extraction
-TECH_KEYWORDS = {
+# Browser pool settings
+BROWSER_POOL_SIZE = None  # Browsers alive at once in the fast scraper (None = CONCURRENT_WORKERS)
+BROWSER_PREWARM = 1  # Browsers started in the background when a scrape begins
+BROWSER_MAX_PAGES = 50  # Restart a browser after this many pages (Chrome leaks memory over long sessions)
+BROWSER_MAX_MEMORY_MB = 1500  # ...or once its process tree uses more than this (Linux only, None = no limit)
+BROWSER_ACQUIRE_TIMEOUT = 300  # Seconds a worker waits for a free browser before giving up
+
+# Browser resource policy (requests blocked through Chrome DevTools Network.setBlockedURLs)
+RESOURCE_BLOCKING = True
+BLOCKED_RESOURCE_EXTENSIONS = [  # Images, fonts and media never carry description text
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mov", "m4v", "mp3", "m4a", "ogg", "wav",
+]
+BLOCKED_RESOURCE_HOSTS = [  # Analytics, tag managers, ads and session recorders
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "connect.facebook.net", "hotjar.com", "segment.io", "segment.com",
+    "mixpanel.com", "amplitude.com", "fullstory.com", "clarity.ms", "snap.licdn.com",
+    "px.ads.linkedin.com", "ads-twitter.com", "bat.bing.com", "nr-data.net", "intercom.io",
+    "optimizely.com", "cookielaw.org", "youtube.com", "vimeo.com",
+]
+RESOURCE_ALLOWED_HOSTS = []  # Pages on these hosts load everything (for sites that break when blocked)
+RESOURCE_HOST_PATTERNS = {}  # Extra URL patterns blocked only on pages of a host, e.g. {"example.com": ["*.css"]}
+RESOURCE_METRICS = True  # Record bytes transferred per page from Chrome's network log
+
+# Page readiness (replaces fixed sleeps after loading a page in a browser)
+READINESS_WAITS = ["selector", "network_idle"]  # Read a page once any holds: "selector", "ready_state", "network_idle"
+READINESS_MIN_TEXT = 50  # A description selector is ready once it holds this many characters
+READINESS_MIN_TIMEOUT = 1.0  # Bounds of the per-host timeout learned from past pages (seconds)
+READINESS_MAX_TIMEOUT = 10.0
+READINESS_POLL_INTERVAL = 0.1  # Seconds between readiness checks
+NETWORK_IDLE_TIME = 0.5  # Network is idle after this long without requests starting or finishing...
+NETWORK_IDLE_MAX_REQUESTS = 2  # ...and with no more than this many still open (long polls, beacons)
+
+# NLP settings
+NLP_MODE = "lightweight"  # "off" (keyword matcher only), "lightweight" (+ named entities), "full" (+ noun chunks)
+SPACY_MODEL = "en_core_web_sm"
+NLP_BATCH_SIZE = 32  # Descriptions per nlp.pipe batch
+NLP_N_PROCESS = 1  # Processes nlp.pipe spreads each batch over
+KEYWORD_TEXT_MAX_CHARS = 3000  # Only the start of each description is searched for keywords, for speed
+KEYWORD_TEXT_MIN_CHARS = 10  # Shorter descriptions get no keywords
+EXTRACT_PROCESSES = None  # Keyword extraction processes in the fast scraper (None = one per CPU, 0 = in-process; always in-process with NLP_MODE "off")
+EXTRACT_QUEUE_SIZE = 500  # Fetched descriptions waiting for extraction before fetch threads block
+
+# Skill taxonomy: (id, canonical name, category, aliases)
+# Ids are stored with every posting, so never renumber or reuse them - append new skills at the end
+SKILL_TAXONOMY = [
     # Programming Languages
-    "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "go", "golang",
-    "rust", "swift", "kotlin", "scala", "r", "matlab", "julia", "php", "perl", "html", "css",
+    (1, "python", "Programming Languages", []),
+    (2, "java", "Programming Languages", []),
+    (3, "javascript", "Programming Languages", []),
+    (4, "typescript", "Programming Languages", []),
+    (5, "c++", "Programming Languages", []),
+    (6, "c#", "Programming Languages", []),
+    (7, "ruby", "Programming Languages", []),
+    (8, "go", "Programming Languages", ["golang"]),
+    (9, "rust", "Programming Languages", []),
+    (10, "swift", "Programming Languages", []),
+    (11, "kotlin", "Programming Languages", []),
+    (12, "scala", "Programming Languages", []),
+    (13, "r", "Programming Languages", []),
+    (14, "matlab", "Programming Languages", []),
+    (15, "julia", "Programming Languages", []),
+    (16, "php", "Programming Languages", []),
+    (17, "perl", "Programming Languages", []),
+    (18, "objective-c", "Programming Languages", []),
+    (19, "bash", "Programming Languages", []),
+    (20, "shell", "Programming Languages", []),
+    (21, "powershell", "Programming Languages", []),
+    (22, "sql", "Programming Languages", []),
+    
+    # Frontend
+    (23, "html", "Frontend", []),
+    (24, "css", "Frontend", []),
+    (25, "react", "Frontend", []),
+    (26, "angular", "Frontend", []),
+    (27, "vue", "Frontend", ["vue.js"]),
+    (28, "jquery", "Frontend", []),
+    (29, "bootstrap", "Frontend", []),
+    (30, "tailwind", "Frontend", ["tailwindcss"]),
+    (31, "next.js", "Frontend", ["nextjs"]),
+    (32, "nuxt.js", "Frontend", []),
+    (33, "gatsby", "Frontend", []),
+    
+    # Backend
+    (34, "node.js", "Backend", ["nodejs"]),
+    (35, "express", "Backend", []),
+    (36, "django", "Backend", []),
+    (37, "flask", "Backend", []),
+    (38, "spring", "Backend", []),
+    (39, "spring boot", "Backend", []),
+    (40, "rails", "Backend", ["ruby on rails"]),
+    (41, "laravel", "Backend", []),
+    (42, "asp.net", "Backend", []),
+    (43, "api", "Backend", []),
+    (44, "rest", "Backend", ["restful"]),
+    (45, "graphql", "Backend", []),
+    (46, "grpc", "Backend", []),
+    (47, "microservices", "Backend", []),
+    (48, "nginx", "Backend", []),
+    (49, "apache", "Backend", []),
+    (50, "rabbitmq", "Backend", []),
+    (51, "celery", "Backend", []),
+    (52, "prisma", "Backend", []),
+    (53, "sequelize", "Backend", []),
+    (54, "mongoose", "Backend", []),
     
-    # Web Technologies
-    "react", "angular", "vue", "vue.js", "node.js", "nodejs", "express", "django", "flask",
-    "spring", "spring boot", "rails", "ruby on rails", "laravel", "asp.net", "jquery", 
-    "bootstrap", "tailwind", "tailwindcss", "next.js", "nextjs", "nuxt.js", "gatsby",
+    # Mobile
+    (55, "ios", "Mobile", []),
+    (56, "android", "Mobile", []),
+    (57, "react native", "Mobile", []),
+    (58, "flutter", "Mobile", []),
+    (59, "xamarin", "Mobile", []),
+    (60, "swiftui", "Mobile", []),
+    (61, "jetpack compose", "Mobile", []),
+    (62, "mobile development", "Mobile", []),
     
     # Data & ML
-    "machine learning", "deep learning", "tensorflow", "pytorch", "scikit-learn", "sklearn",
-    "pandas", "numpy", "data science", "data analysis", "data engineering", "data analytics",
-    "big data", "spark", "apache spark", "hadoop", "kafka", "apache kafka", "etl", 
-    "sql", "nosql", "mongodb", "postgresql", "mysql", "redis", "elasticsearch", "cassandra",
-    "tableau", "power bi", "looker", "airflow", "mlflow", "kubeflow",
+    (63, "machine learning", "Data & ML", []),
+    (64, "deep learning", "Data & ML", []),
+    (65, "tensorflow", "Data & ML", []),
+    (66, "pytorch", "Data & ML", []),
+    (67, "scikit-learn", "Data & ML", ["sklearn"]),
+    (68, "pandas", "Data & ML", []),
+    (69, "numpy", "Data & ML", []),
+    (70, "data science", "Data & ML", []),
+    (71, "data analysis", "Data & ML", []),
+    (72, "data engineering", "Data & ML", []),
+    (73, "data analytics", "Data & ML", []),
+    (74, "big data", "Data & ML", []),
+    (75, "spark", "Data & ML", ["apache spark"]),
+    (76, "hadoop", "Data & ML", []),
+    (77, "kafka", "Data & ML", ["apache kafka"]),
+    (78, "etl", "Data & ML", []),
+    (79, "tableau", "Data & ML", []),
+    (80, "power bi", "Data & ML", []),
+    (81, "looker", "Data & ML", []),
+    (82, "airflow", "Data & ML", []),
+    (83, "mlflow", "Data & ML", []),
+    (84, "kubeflow", "Data & ML", []),
+    (85, "ai", "Data & ML", ["artificial intelligence"]),
+    (86, "nlp", "Data & ML", ["natural language processing"]),
+    (87, "computer vision", "Data & ML", []),
+    (88, "opencv", "Data & ML", []),
+    
+    # Databases
+    (89, "nosql", "Databases", []),
+    (90, "mongodb", "Databases", []),
+    (91, "postgresql", "Databases", []),
+    (92, "mysql", "Databases", []),
+    (93, "redis", "Databases", []),
+    (94, "elasticsearch", "Databases", []),
+    (95, "cassandra", "Databases", []),
+    (96, "oracle", "Databases", []),
+    (97, "sqlite", "Databases", []),
+    (98, "dynamodb", "Databases", []),
+    (99, "firebase", "Databases", []),
+    (100, "supabase", "Databases", []),
+    (101, "memcached", "Databases", []),
     
     # Cloud & DevOps
-    "aws", "amazon web services", "azure", "microsoft azure", "gcp", "google cloud", 
-    "docker", "kubernetes", "k8s", "jenkins", "gitlab", "github actions", "circleci",
-    "ci/cd", "devops", "terraform", "ansible", "puppet", "chef", "linux", "unix", 
-    "bash", "shell", "powershell", "cloudformation", "helm",
+    (102, "aws", "Cloud & DevOps", ["amazon web services"]),
+    (103, "azure", "Cloud & DevOps", ["microsoft azure"]),
+    (104, "gcp", "Cloud & DevOps", ["google cloud"]),
+    (105, "docker", "Cloud & DevOps", []),
+    (106, "kubernetes", "Cloud & DevOps", ["k8s"]),
+    (107, "jenkins", "Cloud & DevOps", []),
+    (108, "github actions", "Cloud & DevOps", []),
+    (109, "circleci", "Cloud & DevOps", []),
+    (110, "ci/cd", "Cloud & DevOps", []),
+    (111, "devops", "Cloud & DevOps", []),
+    (112, "terraform", "Cloud & DevOps", []),
+    (113, "ansible", "Cloud & DevOps", []),
+    (114, "puppet", "Cloud & DevOps", []),
+    (115, "chef", "Cloud & DevOps", []),
+    (116, "linux", "Cloud & DevOps", []),
+    (117, "unix", "Cloud & DevOps", []),
+    (118, "cloudformation", "Cloud & DevOps", []),
+    (119, "helm", "Cloud & DevOps", []),
     
-    # Mobile
-    "ios", "android", "react native", "flutter", "xamarin", "swift", "objective-c",
-    "kotlin", "java", "mobile development", "swiftui", "jetpack compose",
+    # Tools & Practices
+    (120, "git", "Tools & Practices", []),
+    (121, "github", "Tools & Practices", []),
+    (122, "gitlab", "Tools & Practices", []),
+    (123, "bitbucket", "Tools & Practices", []),
+    (124, "svn", "Tools & Practices", []),
+    (125, "agile", "Tools & Practices", []),
+    (126, "scrum", "Tools & Practices", []),
+    (127, "kanban", "Tools & Practices", []),
+    (128, "jira", "Tools & Practices", []),
+    (129, "confluence", "Tools & Practices", []),
+    (130, "blockchain", "Tools & Practices", []),
     
-    # Other Technologies
-    "api", "rest", "restful", "graphql", "grpc", "microservices", "blockchain", 
-    "ai", "artificial intelligence", "nlp", "natural language processing", 
-    "computer vision", "opencv", "git", "github", "gitlab", "bitbucket", "svn",
-    "agile", "scrum", "kanban", "jira", "confluence", "testing", "qa", 
-    "quality assurance", "automation", "selenium", "cypress", "jest", "pytest",
-    "junit", "security", "cybersecurity", "oauth", "jwt", "ssl", "https",
+    # Testing & QA
+    (131, "testing", "Testing & QA", []),
+    (132, "qa", "Testing & QA", ["quality assurance"]),
+    (133, "automation", "Testing & QA", []),
+    (134, "selenium", "Testing & QA", []),
+    (135, "cypress", "Testing & QA", []),
+    (136, "jest", "Testing & QA", []),
+    (137, "pytest", "Testing & QA", []),
+    (138, "junit", "Testing & QA", []),
     
-    # Databases & Tools
-    "oracle", "sqlite", "dynamodb", "firebase", "supabase", "prisma", "sequelize",
-    "mongoose", "redis", "memcached", "rabbitmq", "celery", "nginx", "apache",
+    # Security
+    (139, "security", "Security", []),
+    (140, "cybersecurity", "Security", []),
+    (141, "oauth", "Security", []),
+    (142, "jwt", "Security", []),
+    (143, "ssl", "Security", []),
+    (144, "https", "Security", []),
     
-    # Soft Skills & General
-    "communication", "teamwork", "problem solving", "problem-solving", "analytical", 
-    "leadership", "project management", "presentation", "collaboration", 
-    "critical thinking", "time management", "attention to detail", "creative",
-    "innovative", "self-motivated", "proactive", "organized", "adaptable"
-}
+    # Soft Skills
+    (145, "communication", "Soft Skills", []),
+    (146, "teamwork", "Soft Skills", []),
+    (147, "problem solving", "Soft Skills", ["problem-solving"]),
+    (148, "analytical", "Soft Skills", []),
+    (149, "leadership", "Soft Skills", []),
+    (150, "project management", "Soft Skills", []),
+    (151, "presentation", "Soft Skills", []),
+    (152, "collaboration", "Soft Skills", []),
+    (153, "critical thinking", "Soft Skills", []),
+    (154, "time management", "Soft Skills", []),
+    (155, "attention to detail", "Soft Skills", []),
+    (156, "creative", "Soft Skills", []),
+    (157, "innovative", "Soft Skills", []),
+    (158, "self-motivated", "Soft Skills", []),
+    (159, "proactive", "Soft Skills", []),
+    (160, "organized", "Soft Skills", []),
+    (161, "adaptable", "Soft Skills", []),
+]
+
+# Every name the keyword matcher looks for (canonical names and aliases)
+TECH_KEYWORDS = {name for _, canonical, _, aliases in SKILL_TAXONOMY for name in [canonical, *aliases]}
+
+# Keywords too short to count when hyphenated to another word ("go-to", "R-squared", "C-suite")
+HYPHEN_BOUNDED_KEYWORDS = ["go", "r", "c"]
+
+# Containers that wrap most of the page on many sites, tried last
+PAGE_SHELL_SELECTORS = ["article", "main[role='main']", ".content", "#content", ".main-content"]
 
 # Job description selectors (CSS/XPath patterns)
 JOB_DESCRIPTION_SELECTORS = [
@@ -92,9 +325,13 @@ JOB_DESCRIPTION_SELECTORS = [
     "[aria-label*='job description']", "[aria-label*='description']",
     
     # Common tags
-    "article", "main[role='main']", ".content", "#content", ".main-content"
+    *PAGE_SHELL_SELECTORS,
 ]
 
+# Selectors that can tell a browser page is ready: text in a page shell doesn't mean
+# the description has rendered (a cookie banner or navigation is enough)
+READINESS_SELECTORS = [s for s in JOB_DESCRIPTION_SELECTORS if s not in PAGE_SHELL_SELECTORS]
+
 # Date filtering (Unix timestamp for May 1, 2025)
 MIN_DATE_TIMESTAMP = 1746057600  # May 1, 2025 00:00:00 UTC
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Skill co-occurrence: how often two skills are asked for in the same posting
+
+The full skill-by-skill count matrix is one sparse product XᵀX over the binary
+posting-by-skill matrix X. Results are cached on disk per slice (all postings or one
+season) and reused until the internships table changes.
+
+Usage:
+    python cooccurrence.py                               # Top 20 skill pairs
+    python cooccurrence.py --by lift --min-count 20      # Pairs that occur together more than chance
+    python cooccurrence.py --season Summer --top 10
+    python cooccurrence.py --related python              # Skills most often asked for alongside python
+    python cooccurrence.py --seasons                     # Top pairs for every season
+"""
+
+import hashlib
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+
+import config
+from database import table_version
+from match_scoring import skill_matrix
+from models import Internship
+from skill_index import SkillRef, resolve_skills
+from taxonomy import SKILLS_BY_ID
+
+logger = logging.getLogger(__name__)
+
+SCORES = ('count', 'lift', 'pmi')
+
+
+class Cooccurrence:
+    """Skill-by-skill co-occurrence counts over a set of postings.
+
+    counts[a, b] is the number of postings asking for both skill ids a and b; the
+    diagonal holds the number of postings asking for each skill.
+    """
+
+    def __init__(self, counts: np.ndarray, postings: int, version=None):
+        self.counts = counts
+        self.postings = postings
+        self.version = version
+
+    @classmethod
+    def from_matrix(cls, matrix: sparse.csr_matrix, version=None) -> "Cooccurrence":
+        binary = matrix.astype(np.int32)
+        return cls((binary.T @ binary).toarray(), matrix.shape[0], version)
+
+    def lift(self) -> np.ndarray:
+        """P(a and b) / (P(a) P(b)): above 1 means the skills appear together more than by chance."""
+        frequency = np.diag(self.counts).astype(np.float64)
+        expected = np.outer(frequency, frequency) / max(self.postings, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(expected > 0, self.counts / expected, 0.0)
+
+    def pmi(self) -> np.ndarray:
+        """Pointwise mutual information, log2 of lift (-inf where the pair never occurs)."""
+        with np.errstate(divide='ignore'):
+            return np.log2(self.lift())
+
+    def scores(self, by: str = 'count') -> np.ndarray:
+        if by == 'count':
+            return self.counts.astype(np.float64)
+        if by == 'lift':
+            return self.lift()
+        if by == 'pmi':
+            return self.pmi()
+        raise ValueError(f"Unknown score {by!r} (expected one of {', '.join(SCORES)})")
+
+    def top_pairs(self, k: int = 20, by: str = 'count', min_count: int = 1) -> List[Tuple[int, int, int, float]]:
+        """The k best (skill id, skill id, postings together, score) pairs, best first.
+
+        Use min_count to keep rare pairs from dominating lift and PMI.
+        """
+        scores = self.scores(by)
+        first, second = np.triu_indices(len(scores), k=1)
+        keep = self.counts[first, second] >= max(min_count, 1)
+        first, second = first[keep], second[keep]
+        pair_scores = scores[first, second]
+        order = np.lexsort((second, first, -pair_scores))[:k]
+        return [(int(first[i]), int(second[i]), int(self.counts[first[i], second[i]]), float(pair_scores[i]))
+                for i in order]
+
+    def related(self, skill: SkillRef, k: int = 10, by: str = 'count',
+                min_count: int = 1) -> List[Tuple[int, int, float]]:
+        """The k skills most associated with one skill, as (skill id, postings together, score)."""
+        skill_id = resolve_skills([skill])[0]
+        scores = self.scores(by)[skill_id]
+        together = self.counts[skill_id]
+        candidates = [other for other in np.flatnonzero(together >= max(min_count, 1)) if other != skill_id]
+        candidates.sort(key=lambda other: (-scores[other], other))
+        return [(int(other), int(together[other]), float(scores[other])) for other in candidates[:k]]
+
+
+def _cache_path(engine, season: Optional[str], active_only: bool, cache_dir: str) -> str:
+    # The taxonomy size is part of the key so adding skills invalidates the cache
+    key = hashlib.sha1(repr((str(engine.url), season, active_only, max(SKILLS_BY_ID))).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"cooccurrence-{key}.npz")
+
+
+def _load_cached(path: str, version) -> Optional[Cooccurrence]:
+    try:
+        with np.load(path) as cached:
+            if str(cached['version']) == repr(version):
+                return Cooccurrence(cached['counts'], int(cached['postings']), version)
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _save(path: str, result: Cooccurrence):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp.npz'
+    np.savez(temp_path, counts=result.counts, postings=result.postings, version=repr(result.version))
+    os.replace(temp_path, path)
+
+
+def _season_rows(conn, ids: List[str]) -> Dict[str, np.ndarray]:
+    """Row positions of the postings of every season."""
+    table = Internship.__table__
+    seasons = dict(conn.execute(select(table.c.id, table.c.season)).all())
+    groups: Dict[str, List[int]] = {}
+    for position, internship_id in enumerate(ids):
+        groups.setdefault(seasons.get(internship_id), []).append(position)
+    return {season: np.array(rows, dtype=np.int64) for season, rows in groups.items() if season}
+
+
+def by_season(engine, active_only: bool = False, cache_dir: str = None) -> Dict[str, Cooccurrence]:
+    """Co-occurrence for every season, reading the skill index at most once."""
+    cache_dir = cache_dir or config.COOCCURRENCE_CACHE_DIR
+    with engine.connect() as conn:
+        version = table_version(conn)
+        table = Internship.__table__
+        seasons = [season for season in conn.execute(select(table.c.season).distinct()).scalars() if season]
+        results = {season: _load_cached(_cache_path(engine, season, active_only, cache_dir), version)
+                   for season in seasons}
+        missing = [season for season, result in results.items() if result is None]
+        if missing:
+            ids, matrix = skill_matrix(conn, active_only)
+            rows = _season_rows(conn, ids)
+            for season in missing:
+                result = Cooccurrence.from_matrix(matrix[rows.get(season, np.array([], dtype=np.int64))], version)
+                _save(_cache_path(engine, season, active_only, cache_dir), result)
+                results[season] = result
+    return results
+
+
+def load_cooccurrence(engine, season: Optional[str] = None, active_only: bool = False,
+                      cache_dir: str = None) -> Cooccurrence:
+    """Co-occurrence over all postings (or one season), from cache when the table hasn't changed."""
+    if season:
+        empty = sparse.csr_matrix((0, max(SKILLS_BY_ID) + 1), dtype=np.int32)
+        return by_season(engine, active_only, cache_dir).get(season) or Cooccurrence.from_matrix(empty)
+
+    cache_dir = cache_dir or config.COOCCURRENCE_CACHE_DIR
+    path = _cache_path(engine, None, active_only, cache_dir)
+    with engine.connect() as conn:
+        version = table_version(conn)
+        result = _load_cached(path, version)
+        if result is None:
+            ids, matrix = skill_matrix(conn, active_only)
+            result = Cooccurrence.from_matrix(matrix, version)
+            _save(path, result)
+            logger.info(f"Computed co-occurrence over {len(ids)} postings")
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from database import open_database
+
+    parser = argparse.ArgumentParser(description="Skill co-occurrence analysis")
+    parser.add_argument("--by", choices=SCORES, default='count', help="Rank pairs by this score")
+    parser.add_argument("--min-count", type=int, default=1, help="Ignore pairs seen in fewer postings")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--season", help="Only postings of this season")
+    parser.add_argument("--seasons", action="store_true", help="Top pairs for every season")
+    parser.add_argument("--related", help="Skills most associated with this one")
+    parser.add_argument("--active-only", action="store_true")
+    args = parser.parse_args()
+
+    engine = open_database(config.DATABASE_PATH)
+
+    def show_pairs(result: Cooccurrence):
+        for i, (first, second, together, score) in enumerate(result.top_pairs(args.top, args.by, args.min_count), 1):
+            detail = f"{together} postings" if args.by == 'count' else f"{args.by} {score:.2f}, {together} postings"
+            print(f"  {i}. {SKILLS_BY_ID[first].name} + {SKILLS_BY_ID[second].name}: {detail}")
+
+    start = time.perf_counter()
+    if args.seasons:
+        for season, result in sorted(by_season(engine, args.active_only).items()):
+            print(f"\n{season} ({result.postings} postings):")
+            show_pairs(result)
+    else:
+        result = load_cooccurrence(engine, args.season, args.active_only)
+        if args.related:
+            print(f"Skills asked for alongside {args.related} ({result.postings} postings):")
+            for i, (other, together, score) in enumerate(result.related(args.related, args.top, args.by,
+                                                                        args.min_count), 1):
+                print(f"  {i}. {SKILLS_BY_ID[other].name}: {together} postings"
+                      + ("" if args.by == 'count' else f", {args.by} {score:.2f}"))
+        else:
+            print(f"Top {args.top} skill pairs by {args.by} ({result.postings} postings):")
+            show_pairs(result)
+    print(f"\n({(time.perf_counter() - start) * 1000:.1f} ms)")
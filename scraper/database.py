@@ -0,0 +1,291 @@
+"""
+Database engine setup and set-based writes shared by the scrapers
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import Integer, String, bindparam, cast, create_engine, event, func, inspect, select, text, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+
+import config
+from models import Base, Internship, InternshipSkill, SyncMetadata
+from taxonomy import normalize_keywords
+
+logger = logging.getLogger(__name__)
+
+DIALECT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+# sync_metadata key of a counter bumped by every write to the internships table
+DATA_VERSION_KEY = 'internships_version'
+
+
+def create_db_engine(db_path: str = None, readonly: bool = False, **kwargs):
+    """Create the SQLite engine with WAL journaling so readers never block the scraper.
+
+    With readonly=True the file is opened with mode=ro and the journal mode is left to the writer.
+    """
+    if db_path is None:
+        db_path = config.DATABASE_PATH
+    connect_args = kwargs.pop('connect_args', {})
+    connect_args.setdefault('timeout', config.SQLITE_BUSY_TIMEOUT_MS / 1000)
+    url = f'sqlite:///file:{os.path.abspath(db_path)}?mode=ro&uri=true' if readonly else f'sqlite:///{db_path}'
+    engine = create_engine(url, connect_args=connect_args, **kwargs)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not readonly:
+            cursor.execute(f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    return engine
+
+
+def open_database(db_path: str = None, readonly: bool = True, **kwargs):
+    """Open an existing database for a reporting tool without migrating it.
+
+    Only the scrapers run ensure_schema(); a reader that altered tables or rebuilt the
+    skill index would take the write lock under a running scrape. Raises if the database
+    does not exist yet or predates the current schema.
+    """
+    if db_path is None:
+        db_path = config.DATABASE_PATH
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No database at {db_path}; run the scraper first")
+    engine = create_db_engine(db_path, readonly=readonly, **kwargs)
+    missing = missing_schema(engine)
+    if missing:
+        engine.dispose()
+        raise RuntimeError(f"{db_path} is missing {', '.join(missing)}; run the scraper once to upgrade it")
+    return engine
+
+
+def missing_schema(engine) -> List[str]:
+    """Tables and columns that ensure_schema() would have to add."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            missing.append(table.name)
+            continue
+        existing = {c['name'] for c in inspector.get_columns(table.name)}
+        missing.extend(f'{table.name}.{column.name}' for column in table.columns if column.name not in existing)
+    return missing
+
+
+def ensure_schema(engine):
+    """Create missing tables, add columns introduced since a database was created, and backfill them."""
+    Base.metadata.create_all(engine)
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    logger.info(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    backfilled = backfill_skill_ids(engine)
+    if backfilled or not has_skill_index(engine):
+        rebuild_skill_index(engine)
+
+
+def backfill_skill_ids(engine) -> int:
+    """Canonicalize keywords and fill in skill ids for rows saved before the taxonomy existed."""
+    table = Internship.__table__
+    with engine.begin() as conn:
+        rows = conn.execute(select(table.c.id, table.c.keywords).where(table.c.skill_ids == None)).all()
+        version = bump_data_version(conn) if rows else None
+        params = []
+        for row in rows:
+            keywords, skill_ids = normalize_keywords(row.keywords)
+            params.append({'row_id': row.id, 'new_keywords': keywords, 'new_skill_ids': skill_ids})
+        with_keywords = [p for p, row in zip(params, rows) if row.keywords is not None]
+        without_keywords = [p for p, row in zip(params, rows) if row.keywords is None]
+
+        update = table.update().where(table.c.id == bindparam('row_id')).values(row_version=version)
+        if with_keywords:
+            conn.execute(update.values(keywords=bindparam('new_keywords'), skill_ids=bindparam('new_skill_ids')),
+                         with_keywords)
+        if without_keywords:
+            conn.execute(update.values(skill_ids=bindparam('new_skill_ids')), without_keywords)
+    if rows:
+        logger.info(f"Backfilled skill ids for {len(rows)} internships")
+    return len(rows)
+
+
+def bump_data_version(conn) -> int:
+    """Advance the internships write counter, inside the writer's own transaction.
+
+    Call it before changing any rows: the counter row stays locked until commit, so
+    writers get versions in the order they commit and row_version only ever grows.
+    """
+    insert = DIALECT_INSERTS[conn.dialect.name]
+    table = SyncMetadata.__table__
+    stmt = insert(table).values(key=DATA_VERSION_KEY, value='1', updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.key], set_={
+        'value': cast(cast(table.c.value, Integer) + 1, String),
+        'updated_at': stmt.excluded.updated_at,
+    })
+    conn.execute(stmt)
+    return int(conn.execute(select(table.c.value).where(table.c.key == DATA_VERSION_KEY)).scalar())
+
+
+def data_version(conn) -> int:
+    """Number of writes made to the internships table (0 before the first)."""
+    table = SyncMetadata.__table__
+    value = conn.execute(select(table.c.value).where(table.c.key == DATA_VERSION_KEY)).scalar()
+    return int(value) if value is not None else 0
+
+
+def table_version(conn) -> Tuple[int, int, Any]:
+    """Cheap fingerprint of the internships table that changes whenever rows are written.
+
+    The write counter moves on every upsert, deactivation and backfill, including ones that
+    only flip `active`; row count and newest scraped_at tell apart a recreated database
+    that happens to reach the same counter.
+    """
+    table = Internship.__table__
+    row = conn.execute(select(func.count(), func.max(table.c.scraped_at)).select_from(table)).one()
+    return data_version(conn), row[0], row[1]
+
+
+def stream_rows(conn, query, chunk_size: int = None) -> Iterator[list]:
+    """Rows of a query chunk_size at a time, without loading the whole result."""
+    result = conn.execution_options(yield_per=chunk_size or config.EXPORT_CHUNK_SIZE).execute(query)
+    yield from result.partitions()
+
+
+def json_array_elements(column, dialect_name: str):
+    """Table-valued function over the elements of a JSON array column, as a "value" column.
+
+    SQLite's json_each / PostgreSQL's jsonb_array_elements_text; put it in the FROM clause
+    after the table to get one row per element (NULL arrays give none).
+    """
+    if dialect_name == 'postgresql':
+        return func.jsonb_array_elements_text(cast(column, postgresql.JSONB)).table_valued('value')
+    return func.json_each(column).table_valued('value')
+
+
+def get_metadata(engine, key: str, default: str = None) -> str:
+    """A value from the sync_metadata key/value table."""
+    table = SyncMetadata.__table__
+    with engine.connect() as conn:
+        value = conn.execute(select(table.c.value).where(table.c.key == key)).scalar()
+    return default if value is None else value
+
+
+def set_metadata(engine, key: str, value: str):
+    """Insert or replace a value in the sync_metadata key/value table."""
+    insert = DIALECT_INSERTS[engine.dialect.name]
+    table = SyncMetadata.__table__
+    stmt = insert(table).values(key=key, value=value, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.key],
+                                      set_={'value': stmt.excluded.value, 'updated_at': stmt.excluded.updated_at})
+    with engine.begin() as conn:
+        conn.execute(stmt)
+
+
+def has_skill_index(engine) -> bool:
+    """Whether the skill index has rows (or there is nothing to index)."""
+    skills = InternshipSkill.__table__
+    internships = Internship.__table__
+    with engine.connect() as conn:
+        if conn.execute(select(skills.c.skill_id).limit(1)).first():
+            return True
+        skill_ids = type_coerce(internships.c.skill_ids, String)
+        return conn.execute(select(internships.c.id).where(skill_ids != None)
+                            .where(skill_ids != '[]').limit(1)).first() is None
+
+
+def rebuild_skill_index(engine) -> int:
+    """Rebuild internship_skills from every posting's skill_ids."""
+    table = Internship.__table__
+    with engine.begin() as conn:
+        bump_data_version(conn)
+        conn.execute(InternshipSkill.__table__.delete())
+        pairs = skill_pairs(conn.execute(select(table.c.id, table.c.skill_ids)).mappings())
+        if pairs:
+            conn.execute(InternshipSkill.__table__.insert(), pairs)
+    logger.info(f"Rebuilt skill index ({len(pairs)} entries)")
+    return len(pairs)
+
+
+def skill_pairs(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """(internship_id, skill_id) rows for the skill index."""
+    return [{'internship_id': row['id'], 'skill_id': skill_id}
+            for row in rows for skill_id in row['skill_ids'] or []]
+
+
+def internship_rows(internships: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalize API/scraper dicts to full column rows.
+
+    Keywords are reduced to canonical names with their taxonomy ids, and scraped_at is stamped.
+    """
+    columns = [c.name for c in Internship.__table__.columns]
+    now = datetime.utcnow()
+    rows = []
+    for internship in internships:
+        row = {name: internship.get(name) for name in columns}
+        keywords, row['skill_ids'] = normalize_keywords(row['keywords'])
+        if row['keywords'] is not None:
+            row['keywords'] = keywords
+        row['scraped_at'] = now
+        rows.append(row)
+    return rows
+
+
+def upsert_internships(engine, internships: Iterable[Dict[str, Any]], chunk_size: int = None) -> int:
+    """Insert or update internships by id with INSERT ... ON CONFLICT(id) DO UPDATE, in chunks.
+
+    Postings repeated in the input are written once, with their last values. The internship_skills
+    index rows of every upserted posting are replaced in the same transaction, and every row is
+    stamped with the transaction's write counter value in row_version.
+    """
+    insert = DIALECT_INSERTS.get(engine.dialect.name)
+    if insert is None:
+        raise ValueError(f"Bulk upsert is not supported for {engine.dialect.name}")
+
+    chunk_size = chunk_size or config.UPSERT_CHUNK_SIZE
+    # One statement can't update a row twice (PostgreSQL rejects it), so the last copy of an id wins
+    rows = list({row['id']: row for row in internship_rows(internships)}.values())
+    table = Internship.__table__
+
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={c.name: stmt.excluded[c.name] for c in table.columns if c.name != 'id'},
+    )
+
+    skills = InternshipSkill.__table__
+
+    with engine.begin() as conn:
+        if rows:
+            version = bump_data_version(conn)
+            for row in rows:
+                row['row_version'] = version
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            conn.execute(stmt, chunk)
+
+            # Keep the skill index in step within the same transaction
+            conn.execute(skills.delete().where(skills.c.internship_id.in_([row['id'] for row in chunk])))
+            pairs = skill_pairs(chunk)
+            if pairs:
+                conn.execute(skills.insert(), pairs)
+
+    return len(rows)
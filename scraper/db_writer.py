@@ -0,0 +1,77 @@
+"""
+Single database writer thread with group commits
+"""
+
+import logging
+import threading
+import time
+from queue import Queue, Empty
+from typing import Any, Dict
+
+import config
+from database import upsert_internships
+
+logger = logging.getLogger(__name__)
+
+# Tells the writer thread to flush and stop
+_STOP = object()
+
+
+class DatabaseWriter(threading.Thread):
+    """Drain a bounded queue of results and upsert them in size- or time-based batches."""
+
+    def __init__(self, engine, batch_size: int = None, max_delay: float = None, queue_size: int = None):
+        super().__init__(name="db-writer", daemon=True)
+        self.engine = engine
+        self.batch_size = batch_size or config.SAVE_BATCH_SIZE
+        self.max_delay = max_delay if max_delay is not None else config.WRITER_MAX_DELAY
+        self.queue = Queue(maxsize=queue_size or config.WRITER_QUEUE_SIZE)
+        self.rows_written = 0
+        self.commits = 0
+        self.errors = 0
+
+    def put(self, internship: Dict[str, Any]):
+        """Queue a result for writing, blocking while the queue is full."""
+        self.queue.put(internship)
+
+    def flush(self, batch):
+        if not batch:
+            return
+        try:
+            upsert_internships(self.engine, batch)
+            self.rows_written += len(batch)
+            self.commits += 1
+            logger.debug(f"Writer committed {len(batch)} internships ({self.rows_written} total)")
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error saving batch of {len(batch)} internships: {e}")
+
+    def run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            if item is _STOP:
+                self.flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.max_delay
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self.flush(batch)
+                batch = []
+                deadline = None
+
+    def close(self):
+        """Write everything still queued and stop the thread."""
+        self.queue.put(_STOP)
+        self.join()
+        logger.info(f"Writer saved {self.rows_written} internships in {self.commits} commits"
+                    + (f" ({self.errors} failed batches)" if self.errors else ""))
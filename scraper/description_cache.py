@@ -0,0 +1,145 @@
+"""
+Persistent description cache with HTTP validators and content hashes
+"""
+
+import hashlib
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (create_engine, Column, Float, Integer, JSON, MetaData, String,
+                        Table, Text, select, text)
+
+import config
+from taxonomy import TAXONOMY_VERSION
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+cache_table = Table(
+    'description_cache', metadata,
+    Column('url', String, primary_key=True),
+    Column('tier', String),              # Tier that produced the description (validators belong to it)
+    Column('etag', String),
+    Column('last_modified', String),
+    Column('content_hash', String),      # Hash of the extracted description text
+    Column('description', Text),
+    Column('keywords', JSON),
+    Column('keywords_hash', String),     # keywords_hash of the description and extractor they came from
+    Column('size', Integer),
+    Column('fetched_at', Float),
+    Column('accessed_at', Float, index=True),
+)
+
+# Run eviction once every this many stores
+EVICT_EVERY = 100
+
+
+def content_hash(description: str) -> str:
+    """Stable hash of a description's text."""
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+def keywords_hash(description: str) -> str:
+    """Hash of a description plus the extractor settings (NLP_MODE, spaCy model, taxonomy, text limits) that shape its keywords."""
+    settings = (config.NLP_MODE, config.SPACY_MODEL, TAXONOMY_VERSION,
+                config.KEYWORD_TEXT_MIN_CHARS, config.KEYWORD_TEXT_MAX_CHARS)
+    return content_hash('\0'.join(map(str, settings + (description,))))
+
+
+class DescriptionCache:
+    """On-disk cache of scraped descriptions keyed by URL."""
+
+    def __init__(self, path: str = None, ttl: float = None, max_mb: float = None):
+        path = path or config.DESCRIPTION_CACHE_PATH
+        self.ttl = ttl if ttl is not None else config.DESCRIPTION_CACHE_TTL
+        self.max_bytes = int((max_mb if max_mb is not None else config.DESCRIPTION_CACHE_MAX_MB) * 1024 * 1024)
+
+        self.engine = create_engine(f'sqlite:///{path}', connect_args={'check_same_thread': False,
+                                                                       'timeout': 30})
+        metadata.create_all(self.engine)
+        self.stores = 0
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a URL, marking it as recently used."""
+        with self.engine.begin() as conn:
+            row = conn.execute(select(cache_table).where(cache_table.c.url == url)).mappings().first()
+            if row is None:
+                return None
+            conn.execute(cache_table.update().where(cache_table.c.url == url)
+                         .values(accessed_at=time.time()))
+            return dict(row)
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry can be served without contacting the site."""
+        return time.time() - (entry.get('fetched_at') or 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]], tier: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating an entry from the same tier."""
+        headers = {}
+        if entry and entry.get('tier') == tier:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def touch(self, url: str):
+        """Reset the TTL of an entry after a 304 Not Modified."""
+        now = time.time()
+        with self.engine.begin() as conn:
+            conn.execute(cache_table.update().where(cache_table.c.url == url)
+                         .values(fetched_at=now, accessed_at=now))
+
+    def store(self, url: str, description: str, tier: str, etag: str = None, last_modified: str = None):
+        """Save a freshly fetched description and its validators."""
+        now = time.time()
+        values = {
+            'tier': tier,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': content_hash(description),
+            'description': description,
+            'size': len(description),
+            'fetched_at': now,
+            'accessed_at': now,
+        }
+        with self.engine.begin() as conn:
+            updated = conn.execute(cache_table.update().where(cache_table.c.url == url).values(**values))
+            if updated.rowcount == 0:
+                conn.execute(cache_table.insert().values(url=url, **values))
+
+        self.stores += 1
+        if self.stores % EVICT_EVERY == 0:
+            self.evict()
+
+    def keywords_for(self, url: str, description: str) -> Optional[List[str]]:
+        """Cached keywords if they were extracted from this exact description by the current extractor."""
+        with self.engine.connect() as conn:
+            row = conn.execute(select(cache_table.c.keywords, cache_table.c.keywords_hash)
+                               .where(cache_table.c.url == url)).first()
+        if row is None or row.keywords is None or row.keywords_hash != keywords_hash(description):
+            return None
+        return row.keywords
+
+    def store_keywords(self, url: str, description: str, keywords: List[str]):
+        """Remember the keywords extracted from a description."""
+        with self.engine.begin() as conn:
+            conn.execute(cache_table.update().where(cache_table.c.url == url)
+                         .values(keywords=keywords, keywords_hash=keywords_hash(description)))
+
+    def evict(self):
+        """Drop least recently used entries once the cache exceeds its size budget."""
+        with self.engine.begin() as conn:
+            result = conn.execute(text("""
+                DELETE FROM description_cache WHERE url IN (
+                    SELECT url FROM (
+                        SELECT url, SUM(size) OVER (ORDER BY accessed_at DESC) AS running_size
+                        FROM description_cache
+                    ) WHERE running_size > :max_bytes
+                )
+            """), {'max_bytes': self.max_bytes})
+        if result.rowcount:
+            logger.info(f"Evicted {result.rowcount} entries from the description cache")
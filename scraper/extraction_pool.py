@@ -0,0 +1,193 @@
+"""
+CPU stage of the fast scraper: keyword extraction in worker processes
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue, Empty
+from typing import Any, Dict, List, Optional
+
+import config
+from keyword_extractor import KeywordExtractor
+
+logger = logging.getLogger(__name__)
+
+# Tells the dispatcher thread to flush and stop
+_STOP = object()
+
+# One extractor (and spaCy model) per worker process, created by the pool initializer
+_extractor = None
+
+
+def _init_worker(mode: str):
+    global _extractor
+    _extractor = KeywordExtractor(mode=mode, n_process=1)
+
+
+def _extract_batch(texts: List[str]) -> List[List[str]]:
+    return _extractor.extract_many(texts)
+
+
+class ExtractionPool(threading.Thread):
+    """Batch fetched descriptions off a bounded queue and extract keywords in a process pool.
+
+    Finished internships are handed to the database writer. With processes=0 extraction
+    runs on this thread instead, which is handy for debugging and the default when
+    NLP_MODE is "off" (the keyword matcher alone isn't worth a process per CPU). If the
+    pool breaks, e.g. a worker is killed for memory, extraction falls back to this thread.
+    """
+
+    def __init__(self, fetcher, writer, processes: int = None, batch_size: int = None,
+                 max_delay: float = None, queue_size: int = None):
+        super().__init__(name="keyword-extraction", daemon=True)
+        self.fetcher = fetcher
+        self.writer = writer
+        if processes is None:
+            if config.NLP_MODE == 'off':
+                processes = 0
+            elif config.EXTRACT_PROCESSES is not None:
+                processes = config.EXTRACT_PROCESSES
+            else:
+                processes = os.cpu_count() or 1
+        self.processes = processes
+        self.batch_size = batch_size or config.NLP_BATCH_SIZE
+        self.max_delay = max_delay if max_delay is not None else config.WRITER_MAX_DELAY
+        self.queue = Queue(maxsize=queue_size or config.EXTRACT_QUEUE_SIZE)
+        self.extracted = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+        self.executor = None
+        self.in_flight = None
+        self.extractor = None
+        if self.processes:
+            # Spawn rather than fork: the parent has browser, writer and fetch threads running
+            self.executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=_init_worker, initargs=(config.NLP_MODE,))
+            # Bound the batches waiting in the pool so memory stays flat
+            self.in_flight = threading.BoundedSemaphore(self.processes * 2)
+        else:
+            self.extractor = KeywordExtractor()
+
+    def run_inline(self):
+        """Stop using a broken process pool and extract on this thread from now on."""
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if self.extractor is None:
+            self.extractor = KeywordExtractor()
+
+    def put(self, internship: Dict[str, Any], description: Optional[str]):
+        """Queue a fetched internship for extraction, blocking while the queue is full."""
+        self.queue.put((internship, description))
+
+    def finish(self, batch, known: Dict[int, List[str]], extracted: Dict[int, List[str]]):
+        """Set keywords on a batch, cache the newly extracted ones and pass it on to the writer."""
+        for i, (internship, description) in enumerate(batch):
+            if i in extracted:
+                internship['keywords'] = extracted[i]
+                if self.fetcher.cache is not None:
+                    self.fetcher.cache.store_keywords(internship['url'], description, extracted[i])
+            else:
+                internship['keywords'] = known.get(i, [])
+            self.writer.put(internship)
+        with self.lock:
+            self.extracted += len(batch)
+
+    def dispatch(self, batch):
+        if not batch:
+            return
+        try:
+            self.submit(batch)
+        except Exception as e:
+            with self.lock:
+                self.errors += 1
+            logger.error(f"Error extracting keywords for {len(batch)} internships: {e}")
+
+    def submit(self, batch):
+
+        # Descriptions whose keywords are already cached skip extraction
+        known = {}
+        misses = []
+        for i, (internship, description) in enumerate(batch):
+            if not description:
+                continue
+            keywords = None
+            if self.fetcher.cache is not None:
+                keywords = self.fetcher.cache.keywords_for(internship['url'], description)
+            if keywords is None:
+                misses.append(i)
+            else:
+                known[i] = keywords
+
+        texts = [batch[i][1] for i in misses]
+        if not misses:
+            self.finish(batch, known, {})
+        elif self.executor is None:
+            self.finish(batch, known, dict(zip(misses, self.extractor.extract_many(texts))))
+        else:
+            self.in_flight.acquire()
+            try:
+                future = self.executor.submit(_extract_batch, texts)
+            except Exception as e:
+                # Typically BrokenProcessPool after a worker died; the permit would otherwise leak
+                # and eventually block this thread (and close()) forever
+                self.in_flight.release()
+                with self.lock:
+                    self.errors += 1
+                logger.error(f"Keyword extraction pool failed ({e}), extracting in-process from now on")
+                self.run_inline()
+                self.finish(batch, known, dict(zip(misses, self.extractor.extract_many(texts))))
+                return
+            future.add_done_callback(lambda f: self.done(f, batch, known, misses))
+
+    def done(self, future, batch, known, misses):
+        self.in_flight.release()
+        extracted = {}
+        try:
+            extracted = dict(zip(misses, future.result()))
+        except Exception as e:
+            with self.lock:
+                self.errors += 1
+            logger.error(f"Error extracting keywords for {len(misses)} descriptions: {e}")
+        try:
+            self.finish(batch, known, extracted)
+        except Exception as e:
+            logger.error(f"Error handing {len(batch)} internships to the writer: {e}")
+
+    def run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            if item is _STOP:
+                self.dispatch(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.max_delay
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self.dispatch(batch)
+                batch = []
+                deadline = None
+
+    def close(self):
+        """Extract everything still queued, wait for the pool and stop."""
+        self.queue.put(_STOP)
+        self.join()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        logger.info(f"Extracted keywords for {self.extracted} internships using {self.processes} processes"
+                    + (f" ({self.errors} failed batches)" if self.errors else ""))
@@ -3,93 +3,74 @@
 Fast concurrent scraper for internships
 """
 
-import json
+import asyncio
 import time
 import random
-import requests
-import spacy
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from sqlalchemy import create_engine, Column, String, Boolean, Integer, JSON, DateTime
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
-from fake_useragent import UserAgent
 import logging
-import re
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 import config
+from database import create_db_engine, ensure_schema, upsert_internships
+from db_writer import DatabaseWriter
+from browser_pool import BrowserPool
+from extraction_pool import ExtractionPool
+from fetcher import TieredFetcher
+from sync import IncrementalSync
+from feed import FeedStats, iter_recent_internships, stream_feed
+from keyword_extractor import KeywordExtractor
+from resource_policy import ResourcePolicy
+from page_readiness import PageReadiness
+from page_extraction import extract_in_page
+from resources import LazyUserAgent, get_chromedriver_path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
-from queue import Queue
+
+# Selenium is only imported once a browser is actually needed
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 # Set up logging
 logging.basicConfig(level=getattr(logging, config.LOG_LEVEL), 
                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Database setup
-Base = declarative_base()
-
-class Internship(Base):
-    __tablename__ = 'internships'
-    
-    id = Column(String, primary_key=True)
-    active = Column(Boolean)
-    company_name = Column(String)
-    date_posted = Column(Integer)
-    date_updated = Column(Integer)
-    is_visible = Column(Boolean)
-    locations = Column(JSON)
-    season = Column(String)
-    sponsorship = Column(String)
-    title = Column(String)
-    url = Column(String)
-    keywords = Column(JSON)
-    xata = Column(JSON)
-    scraped_at = Column(DateTime, default=datetime.utcnow)
-
 class FastInternshipScraper:
     def __init__(self, db_path: str = None, max_workers: int = None):
         """Initialize the fast scraper with concurrent processing."""
         # Database setup
         if db_path is None:
             db_path = config.DATABASE_PATH
-        self.engine = create_engine(f'sqlite:///{db_path}', 
-                                   pool_pre_ping=True, 
-                                   connect_args={'check_same_thread': False})
-        Base.metadata.create_all(self.engine)
+        self.engine = create_db_engine(db_path, 
+                                       pool_pre_ping=True, 
+                                       connect_args={'check_same_thread': False})
+        ensure_schema(self.engine)
         Session = sessionmaker(bind=self.engine)
         self.session_factory = Session
+        self.sync = IncrementalSync(self.engine)
         
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            logger.info("Downloading spaCy model...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+        # Keyword matcher plus the spaCy components NLP_MODE asks for
+        self.keyword_extractor = KeywordExtractor()
         
-        # User agent for requests
-        self.ua = UserAgent()
+        # User agent for requests (loaded on first use)
+        self.ua = LazyUserAgent()
+        
+        # HTTP-first fetcher shared by all workers
+        self.fetcher = TieredFetcher(ua=self.ua)
         
         # Concurrent settings
         self.max_workers = max_workers or config.CONCURRENT_WORKERS
-        self.driver_pool = Queue()
-        self.lock = threading.Lock()
         
-        # Results queue for batch database saves
-        self.results_queue = Queue()
+        # Bounded browser pool, only used for pages plain HTTP can't handle, and
+        # the requests those browsers may make
+        self.resource_policy = ResourcePolicy()
+        self.readiness = PageReadiness(self.resource_policy)
+        self.browser_pool = BrowserPool(self.setup_selenium, size=config.BROWSER_POOL_SIZE or self.max_workers)
         
-    def setup_selenium(self) -> webdriver.Chrome:
+    def setup_selenium(self) -> "webdriver.Chrome":
         """Set up optimized Selenium WebDriver for speed."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         options = Options()
         if config.HEADLESS:
             options.add_argument('--headless')
@@ -103,9 +84,6 @@ class FastInternshipScraper:
         options.add_argument('--disable-features=VizDisplayCompositor')
         options.add_argument('--disable-extensions')
         options.add_argument('--disable-plugins')
-        options.add_argument('--disable-images')  # Don't load images for speed
-        options.add_argument('--disable-javascript')  # Disable JS if not needed
-        options.add_argument('--disable-css')  # Disable CSS loading
         options.add_argument(f'--window-size={config.WINDOW_SIZE}')
         options.add_argument(f'user-agent={self.ua.random}')
         
@@ -116,50 +94,51 @@ class FastInternshipScraper:
             "profile.managed_default_content_settings.images": 2,  # Block images
             "profile.default_content_setting_values.notifications": 2,  # Block notifications
         })
+        self.resource_policy.configure(options)
+        self.readiness.configure(options)
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(get_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=options)
         
+        # Block images, fonts, media and trackers at the network level
+        self.resource_policy.attach(driver)
+        
         # Set aggressive timeouts
         driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
-        driver.implicitly_wait(1)
+        # No implicit wait: readiness is checked once per page, not per selector lookup
+        driver.implicitly_wait(0)
         
         # Execute script to remove webdriver property
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
         return driver
     
-    def get_driver(self) -> webdriver.Chrome:
-        """Get a driver from the pool or create a new one."""
-        try:
-            return self.driver_pool.get_nowait()
-        except:
-            return self.setup_selenium()
+    def get_driver(self) -> "webdriver.Chrome":
+        """Borrow a live driver from the pool, waiting if every browser is busy."""
+        return self.browser_pool.acquire()
     
-    def return_driver(self, driver: webdriver.Chrome):
-        """Return a driver to the pool."""
-        try:
-            self.driver_pool.put_nowait(driver)
-        except:
-            driver.quit()
+    def return_driver(self, driver: "webdriver.Chrome"):
+        """Return a driver to the pool after one page."""
+        self.browser_pool.release(driver)
     
     def fetch_internships(self, api_url: str = None) -> List[Dict[str, Any]]:
-        """Fetch internship data from the API."""
-        if api_url is None:
-            api_url = config.API_URL
+        """Fetch all internship data from the API."""
         try:
-            headers = {'User-Agent': self.ua.random}
-            response = requests.get(api_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            internships = response.json()
+            internships = list(stream_feed(api_url, ua=self.ua, session=self.fetcher.session))
             logger.info(f"Fetched {len(internships)} internships from API")
             return internships
         except Exception as e:
             logger.error(f"Error fetching internships: {e}")
             return []
     
-    def scrape_job_description(self, url: str, driver: webdriver.Chrome) -> Optional[str]:
+    def scrape_job_description(self, url: str, browser_fallback=None) -> Optional[str]:
+        """Scrape job description over HTTP, calling browser_fallback(url) only if that falls short."""
+        return self.fetcher.fetch(url, browser_fallback)
+    
+    def scrape_with_driver(self, url: str, driver: "webdriver.Chrome") -> Optional[str]:
         """Scrape job description from a given URL using provided driver."""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        
         try:
             # Minimal delay for aggressive scraping
             if config.FAST_MODE:
@@ -167,40 +146,17 @@ class FastInternshipScraper:
             else:
                 time.sleep(random.uniform(config.MIN_DELAY, config.MAX_DELAY))
             
+            self.resource_policy.before_page(driver, url)
             driver.get(url)
             
-            # Quick wait for basic content
-            time.sleep(0.5)
-            
-            job_description = ""
-            
-            # Try CSS selectors from config (with timeout)
-            for selector in config.JOB_DESCRIPTION_SELECTORS[:5]:  # Only try first 5 for speed
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.text.strip()
-                        if len(text) > len(job_description) and len(text) > 50:
-                            job_description = text
-                            break
-                except:
-                    continue
-                
-                if job_description and len(job_description) > 200:
-                    break
+            # Wait for the description (or the page to settle), not a fixed time
+            self.readiness.wait(driver, url)
             
-            # Fallback to body text if nothing found
-            if not job_description:
-                try:
-                    body = driver.find_element(By.TAG_NAME, "body")
-                    job_description = body.text[:2000]  # Limit to first 2000 chars
-                except:
-                    pass
+            # Every selector is tried inside the page in one round trip, so all of them
+            # are affordable; the body text (first 2000 chars) is the fallback
+            job_description = extract_in_page(driver, min_length=50, enough=200, body_limit=2000).text
             
-            # Clean up the description
-            if job_description:
-                job_description = re.sub(r'\s+', ' ', job_description)
-                job_description = job_description.strip()
+            self.resource_policy.after_page(driver, url)
             
             return job_description if job_description else None
             
@@ -215,121 +171,128 @@ class FastInternshipScraper:
             return None
     
     def extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text using spaCy (optimized)."""
-        if not text or len(text) < 10:
-            return []
-        
-        # Limit text length for speed
-        text = text[:3000]  # Only process first 3000 characters
-        
-        # Process text with spaCy
-        doc = self.nlp(text.lower())
-        
-        # Keywords from config
-        tech_keywords = config.TECH_KEYWORDS
-        
-        found_keywords = set()
-        
-        # Quick keyword matching
-        text_lower = text.lower()
-        for keyword in tech_keywords:
-            if keyword in text_lower:
-                found_keywords.add(keyword)
-        
-        return list(found_keywords)
+        """Extract keywords from text (optimized)."""
+        return self.extract_keywords_batch([text])[0]
+    
+    def extract_keywords_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract keywords from many texts, running spaCy over them as one batch."""
+        return self.keyword_extractor.extract_many(texts)
+    
+    def add_keywords(self, internships: List[Dict[str, Any]], descriptions: List[Optional[str]]):
+        """Set keywords on a batch of internships, extracting every new description in one NLP pass."""
+        described = [(internship['url'], description)
+                     for internship, description in zip(internships, descriptions) if description]
+        keywords = iter(self.fetcher.keywords_for_many(described, self.extract_keywords_batch))
+        for internship, description in zip(internships, descriptions):
+            internship['keywords'] = next(keywords) if description else []
     
-    def process_internship_batch(self, internships: List[Dict[str, Any]], worker_id: int) -> List[Dict[str, Any]]:
-        """Process a batch of internships with a single driver."""
-        driver = self.get_driver()
+    def process_internship_batch(self, internships: List[Dict[str, Any]], worker_id: int,
+                                 writer: DatabaseWriter = None,
+                                 extraction: ExtractionPool = None) -> List[Dict[str, Any]]:
+        """Process a batch of internships, borrowing a pooled driver only for pages that need one.
+        
+        If an extraction pool is given, this thread only fetches and each description is
+        handed to the pool, which extracts keywords and passes results on to its writer.
+        Otherwise keywords are extracted here every NLP_BATCH_SIZE descriptions; if a
+        writer is given, each batch is queued for saving as soon as it is ready.
+        """
         results = []
         
-        try:
-            for i, internship in enumerate(internships):
-                try:
-                    logger.info(f"Worker {worker_id}: Processing {i+1}/{len(internships)} - {internship['company_name']}")
-                    
-                    # Scrape job description
-                    job_description = self.scrape_job_description(internship['url'], driver)
-                    
-                    if job_description:
-                        # Extract keywords
-                        keywords = self.extract_keywords(job_description)
-                        internship['keywords'] = keywords
-                        logger.debug(f"Found {len(keywords)} keywords")
-                    else:
-                        internship['keywords'] = []
-                        logger.debug(f"Could not scrape description for {internship['url']}")
-                    
-                    results.append(internship)
-                    
-                except Exception as e:
-                    logger.error(f"Worker {worker_id}: Error processing {internship.get('id', 'unknown')}: {e}")
+        def browser_fallback(url: str) -> Optional[str]:
+            with self.browser_pool.driver() as driver:
+                return self.scrape_with_driver(url, driver)
+        
+        def flush():
+            # Keywords for the fetched descriptions are extracted as one NLP batch
+            try:
+                self.add_keywords(pending, descriptions)
+            except Exception as e:
+                logger.error(f"Worker {worker_id}: Error extracting keywords: {e}")
+                for internship in pending:
                     internship['keywords'] = []
-                    results.append(internship)
-                    continue
+            results.extend(pending)
+            if writer is not None:
+                for internship in pending:
+                    writer.put(internship)
+            pending.clear()
+            descriptions.clear()
         
-        finally:
-            self.return_driver(driver)
+        pending = []
+        descriptions = []
+        for i, internship in enumerate(internships):
+            try:
+                logger.info(f"Worker {worker_id}: Processing {i+1}/{len(internships)} - {internship['company_name']}")
+                
+                # Scrape job description
+                job_description = self.scrape_job_description(internship['url'], browser_fallback)
+                if not job_description:
+                    logger.debug(f"Could not scrape description for {internship['url']}")
+                
+            except Exception as e:
+                logger.error(f"Worker {worker_id}: Error processing {internship.get('id', 'unknown')}: {e}")
+                job_description = None
+            
+            if extraction is not None:
+                extraction.put(internship, job_description)
+                results.append(internship)
+                continue
+            
+            pending.append(internship)
+            descriptions.append(job_description)
+            if len(pending) >= config.NLP_BATCH_SIZE:
+                flush()
+        
+        flush()
         
         return results
     
     def save_internships_batch(self, internships: List[Dict[str, Any]]):
-        """Save multiple internships to database in a batch."""
-        session = self.session_factory()
+        """Save multiple internships to database with one set-based upsert."""
+        if not internships:
+            return
         try:
-            for internship_data in internships:
-                try:
-                    existing = session.query(Internship).filter_by(id=internship_data['id']).first()
-                    
-                    if existing:
-                        # Update existing record
-                        for key, value in internship_data.items():
-                            setattr(existing, key, value)
-                        existing.scraped_at = datetime.utcnow()
-                    else:
-                        # Create new record
-                        internship = Internship(**internship_data)
-                        session.add(internship)
-                
-                except Exception as e:
-                    logger.error(f"Error preparing internship for save: {e}")
-                    continue
-            
-            session.commit()
+            upsert_internships(self.engine, internships)
             logger.info(f"Saved batch of {len(internships)} internships")
-            
         except Exception as e:
             logger.error(f"Error saving batch: {e}")
-            session.rollback()
-        finally:
-            session.close()
     
-    def scrape_all_fast(self):
-        """Main method to scrape all internships using concurrent processing."""
-        logger.info("Starting FAST internship scraper...")
+    def fetch_filtered_internships(self, incremental: bool = False) -> List[Dict[str, Any]]:
+        """Fetch internships from the API and keep those that meet the date criteria.
         
-        # Fetch internships from API
-        internships = self.fetch_internships()
+        In incremental mode only new or changed postings are returned, and postings
+        that dropped out of the feed are marked inactive.
+        """
+        # Stream the feed so only postings that pass the date filter are kept in memory
+        stats = FeedStats(collect_ids=incremental)
+        try:
+            filtered_internships = list(iter_recent_internships(stats=stats, ua=self.ua, session=self.fetcher.session))
+        except Exception as e:
+            logger.error(f"Error fetching internships: {e}")
+            return []
         
-        if not internships:
+        if not stats.total:
             logger.error("No internships fetched from API")
-            return
-        
-        # Filter internships by date (only May 2025 and newer)
-        filtered_internships = []
-        for internship in internships:
-            date_posted = internship.get('date_posted', 0)
-            date_updated = internship.get('date_updated', 0)
-            latest_date = max(date_posted, date_updated)
-            
-            if latest_date >= config.MIN_DATE_TIMESTAMP:
-                filtered_internships.append(internship)
+            return []
         
-        logger.info(f"Total internships from API: {len(internships)}")
+        logger.info(f"Total internships from API: {stats.total}")
         logger.info(f"Internships from May 2025 or newer: {len(filtered_internships)}")
         
+        if incremental:
+            self.sync.deactivate_missing(stats.ids)
+            filtered_internships = self.sync.plan(filtered_internships)
+            self.feed_high_water_mark = stats.newest
+        
         if not filtered_internships:
             logger.warning("No internships found that meet the date criteria")
+        
+        return filtered_internships
+    
+    def scrape_all_fast(self, incremental: bool = False):
+        """Main method to scrape all internships (or only new/changed ones) using concurrent processing."""
+        logger.info("Starting FAST internship scraper...")
+        
+        filtered_internships = self.fetch_filtered_internships(incremental)
+        if not filtered_internships:
             return
         
         # Split internships into batches for concurrent processing
@@ -339,39 +302,74 @@ class FastInternshipScraper:
         
         logger.info(f"Processing {len(filtered_internships)} internships in {len(batches)} batches using {self.max_workers} workers")
         
+        self.browser_pool.prewarm()
+        
+        # Fetch threads feed a keyword extraction process pool, whose results are
+        # persisted continuously by a single writer thread
+        writer = DatabaseWriter(self.engine)
+        writer.start()
+        extraction = ExtractionPool(self.fetcher, writer)
+        extraction.start()
+        
         # Process batches concurrently
         all_results = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_batch = {
-                executor.submit(self.process_internship_batch, batch, i): i 
-                for i, batch in enumerate(batches)
-            }
-            
-            for future in as_completed(future_to_batch):
-                worker_id = future_to_batch[future]
-                try:
-                    results = future.result()
-                    all_results.extend(results)
-                    logger.info(f"Worker {worker_id} completed batch ({len(results)} internships)")
-                    
-                    # Save results in batches as they complete
-                    if results:
-                        self.save_internships_batch(results)
-                        
-                except Exception as e:
-                    logger.error(f"Worker {worker_id} generated an exception: {e}")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_batch = {
+                    executor.submit(self.process_internship_batch, batch, i, writer, extraction): i 
+                    for i, batch in enumerate(batches)
+                }
+                
+                for future in as_completed(future_to_batch):
+                    worker_id = future_to_batch[future]
+                    try:
+                        results = future.result()
+                        all_results.extend(results)
+                        logger.info(f"Worker {worker_id} completed batch ({len(results)} internships)")
+                    except Exception as e:
+                        logger.error(f"Worker {worker_id} generated an exception: {e}")
+        finally:
+            extraction.close()
+            writer.close()
         
+        if incremental:
+            self.sync.finish(self.feed_high_water_mark)
+        
+        self.fetcher.log_stats()
+        self.browser_pool.log_stats()
+        self.resource_policy.log_stats()
+        self.readiness.log_stats()
         logger.info(f"Fast scraping completed! Processed {len(all_results)} internships")
     
+    def scrape_all_async(self, incremental: bool = False):
+        """Scrape all internships (or only new/changed ones) with the asyncio engine and per-host rate limits."""
+        from async_scraper import AsyncScrapeEngine
+        
+        logger.info("Starting ASYNC internship scraper...")
+        
+        filtered_internships = self.fetch_filtered_internships(incremental)
+        if not filtered_internships:
+            return
+        
+        engine = AsyncScrapeEngine(self)
+        self.browser_pool.prewarm()
+        logger.info(f"Processing {len(filtered_internships)} internships with up to {engine.concurrency} concurrent fetches")
+        
+        processed = asyncio.run(engine.run(filtered_internships))
+        
+        if incremental:
+            self.sync.finish(self.feed_high_water_mark)
+        
+        self.fetcher.log_stats()
+        self.browser_pool.log_stats()
+        self.resource_policy.log_stats()
+        self.readiness.log_stats()
+        logger.info(f"Async scraping completed! Processed {processed} internships")
+    
     def close(self):
         """Clean up resources."""
-        # Close all drivers in pool
-        while not self.driver_pool.empty():
-            try:
-                driver = self.driver_pool.get_nowait()
-                driver.quit()
-            except:
-                break
+        self.browser_pool.close()
+        self.fetcher.close()
 
 if __name__ == "__main__":
     scraper = FastInternshipScraper()
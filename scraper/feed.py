@@ -0,0 +1,142 @@
+"""
+Streaming reader for the internship feed
+"""
+
+import codecs
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator
+
+import requests
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def latest_timestamp(internship: Dict[str, Any]) -> int:
+    """The more recent of a posting's date_posted and date_updated."""
+    return max(internship.get('date_posted') or 0, internship.get('date_updated') or 0)
+
+
+def is_recent(internship: Dict[str, Any], min_timestamp: int = None) -> bool:
+    """Whether a posting passes the date filter (MIN_DATE_TIMESTAMP by default)."""
+    if min_timestamp is None:
+        min_timestamp = config.MIN_DATE_TIMESTAMP
+    return latest_timestamp(internship) >= min_timestamp
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Only the element currently being parsed is buffered, so memory stays flat
+    no matter how long the array is.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    started = finished = False
+
+    def parse(buffer: str, final: bool):
+        nonlocal started, finished
+        pos = 0
+        while not finished:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if not started:
+                if char != '[':
+                    raise ValueError("Feed is not a JSON array")
+                started = True
+                pos += 1
+            elif char == ',':
+                pos += 1
+            elif char == ']':
+                finished = True
+                pos += 1
+            else:
+                try:
+                    item, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # Element continues in the next chunk
+                # A number split across chunks ("[3." + "25]") decodes early, so an
+                # element only counts once the delimiter after it has arrived
+                after = end
+                while after < len(buffer) and buffer[after] in _WHITESPACE:
+                    after += 1
+                if after == len(buffer) and not final:
+                    break
+                if after < len(buffer) and buffer[after] not in ',]':
+                    if not final and ',' not in buffer[after:] and ']' not in buffer[after:]:
+                        break
+                    raise ValueError(f"Unexpected {buffer[after]!r} after an element of the feed")
+                yield item
+                pos = end
+        return buffer[pos:]
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        buffer = yield from parse(buffer, final=False)
+
+    buffer += text_decoder.decode(b'', final=True)
+    yield from parse(buffer, final=True)
+    if not finished:
+        raise ValueError("Feed ended before the JSON array was closed")
+
+
+def stream_feed(api_url: str = None, ua=None, session=None, use_snapshot: bool = None) -> Iterator[Dict[str, Any]]:
+    """Stream every posting in the feed without loading the whole response.
+
+    By default the feed is read from the local snapshot store, which only downloads
+    again once the last snapshot is older than FEED_SNAPSHOT_TTL (or has changed).
+    """
+    if api_url is None:
+        api_url = config.API_URL
+    if use_snapshot is None:
+        use_snapshot = config.FEED_SNAPSHOT_ENABLED
+
+    if use_snapshot:
+        from feed_snapshot import FeedSnapshotStore
+        store = FeedSnapshotStore()
+        yield from store.iter_items(store.refresh(api_url, ua=ua, session=session))
+        return
+
+    headers = {'User-Agent': ua.random} if ua is not None else {}
+    http = session or requests
+    with http.get(api_url, headers=headers, stream=True, timeout=config.HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        yield from iter_json_array(response.iter_content(chunk_size=config.FEED_CHUNK_SIZE))
+
+
+class FeedStats:
+    """Counters filled in while the feed is streamed."""
+
+    def __init__(self, collect_ids: bool = False):
+        self.total = 0
+        self.kept = 0
+        self.newest = 0
+        self.ids = set() if collect_ids else None
+
+
+def iter_recent_internships(items: Iterable[Dict[str, Any]] = None, min_timestamp: int = None,
+                            stats: FeedStats = None, **feed_kwargs) -> Iterator[Dict[str, Any]]:
+    """Yield only postings that pass the date filter, streaming the feed if no items are given."""
+    if items is None:
+        items = stream_feed(**feed_kwargs)
+    for internship in items:
+        if stats is not None:
+            stats.total += 1
+            stats.newest = max(stats.newest, latest_timestamp(internship))
+            if stats.ids is not None:
+                stats.ids.add(internship['id'])
+        if is_recent(internship, min_timestamp):
+            if stats is not None:
+                stats.kept += 1
+            yield internship
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Local, compressed snapshots of the upstream feed with delta computation
+
+Usage:
+    python feed_snapshot.py           # Refresh the snapshot (if stale) and show what changed
+    python feed_snapshot.py refresh   # Force a new download
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+import config
+from feed import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+
+
+def posting_hash(internship: Dict[str, Any]) -> str:
+    """Hash of a posting's full content, independent of key order."""
+    return hashlib.sha1(json.dumps(internship, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def diff(previous: Iterable[Dict[str, Any]], current: Iterable[Dict[str, Any]]) -> Dict[str, List]:
+    """Compare two feeds by posting id.
+
+    Returns {'added': [postings], 'changed': [postings], 'removed': [ids]}, where
+    added/changed hold the current version of each posting. Only ids and hashes of
+    the previous feed are kept in memory.
+    """
+    previous_hashes = {item['id']: posting_hash(item) for item in previous}
+
+    added, changed = [], []
+    seen = set()
+    for item in current:
+        seen.add(item['id'])
+        old_hash = previous_hashes.get(item['id'])
+        if old_hash is None:
+            added.append(item)
+        elif old_hash != posting_hash(item):
+            changed.append(item)
+
+    removed = [posting_id for posting_id in previous_hashes if posting_id not in seen]
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+
+class FeedSnapshotStore:
+    """Gzip-compressed feed downloads with their ETag, reused from disk within a TTL."""
+
+    def __init__(self, directory: str = None, ttl: float = None, keep: int = None):
+        self.directory = directory or config.FEED_SNAPSHOT_DIR
+        self.ttl = ttl if ttl is not None else config.FEED_SNAPSHOT_TTL
+        self.keep = keep or config.FEED_SNAPSHOT_KEEP
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, META_FILE)
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Snapshot metadata, oldest first."""
+        if not os.path.exists(self._meta_path()):
+            return []
+        with open(self._meta_path()) as f:
+            return json.load(f)
+
+    def _save_meta(self, snapshots: List[Dict[str, Any]]):
+        tmp_path = self._meta_path() + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshots, f, indent=2)
+        os.replace(tmp_path, self._meta_path())
+
+    def latest(self, api_url: str = None) -> Optional[Dict[str, Any]]:
+        api_url = api_url or config.API_URL
+        matching = [s for s in self.snapshots() if s['url'] == api_url]
+        return matching[-1] if matching else None
+
+    def is_fresh(self, snapshot: Optional[Dict[str, Any]]) -> bool:
+        return snapshot is not None and time.time() - snapshot['checked_at'] < self.ttl
+
+    def refresh(self, api_url: str = None, ua=None, session=None, force: bool = False) -> Dict[str, Any]:
+        """Return an up-to-date snapshot, downloading only if the cached one is stale or changed."""
+        api_url = api_url or config.API_URL
+        latest = self.latest(api_url)
+        if not force and self.is_fresh(latest):
+            return latest
+
+        headers = {'User-Agent': ua.random} if ua is not None else {}
+        if latest and not force:
+            if latest.get('etag'):
+                headers['If-None-Match'] = latest['etag']
+            if latest.get('last_modified'):
+                headers['If-Modified-Since'] = latest['last_modified']
+
+        http = session or requests
+        try:
+            with http.get(api_url, headers=headers, stream=True, timeout=config.HTTP_TIMEOUT) as response:
+                if response.status_code == 304:
+                    return self._touch(latest)
+                response.raise_for_status()
+                return self._write(api_url, response)
+        except requests.RequestException as e:
+            if latest is None:
+                raise
+            # Offline or upstream down: serve the last snapshot rather than nothing
+            logger.warning(f"Feed download failed ({e}), using snapshot from "
+                           f"{time.ctime(latest['fetched_at'])}")
+            return latest
+
+    def _touch(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        snapshots = self.snapshots()
+        for entry in snapshots:
+            if entry['file'] == snapshot['file']:
+                entry['checked_at'] = time.time()
+                snapshot = entry
+        self._save_meta(snapshots)
+        logger.info("Feed not modified since last snapshot")
+        return snapshot
+
+    def _write(self, api_url: str, response) -> Dict[str, Any]:
+        now = time.time()
+        name = f"feed-{int(now * 1000)}.json.gz"
+        path = os.path.join(self.directory, name)
+
+        size = 0
+        with gzip.open(path + ".tmp", 'wb') as f:
+            for chunk in response.iter_content(chunk_size=config.FEED_CHUNK_SIZE):
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(path + ".tmp", path)
+
+        snapshot = {
+            'file': name,
+            'url': api_url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now,
+            'checked_at': now,
+            'bytes': size,
+        }
+        snapshots = self.snapshots() + [snapshot]
+        for old in snapshots[:-self.keep]:
+            old_path = os.path.join(self.directory, old['file'])
+            if os.path.exists(old_path):
+                os.remove(old_path)
+        self._save_meta(snapshots[-self.keep:])
+
+        logger.info(f"Saved feed snapshot {name} ({size / 1024:.0f} KB uncompressed)")
+        return snapshot
+
+    def iter_items(self, snapshot: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream the postings stored in a snapshot."""
+        with gzip.open(os.path.join(self.directory, snapshot['file']), 'rb') as f:
+            yield from iter_json_array(iter(lambda: f.read(config.FEED_CHUNK_SIZE), b''))
+
+    def diff_latest(self, api_url: str = None) -> Optional[Dict[str, List]]:
+        """Diff the two most recent snapshots of a feed, or None if there is only one."""
+        api_url = api_url or config.API_URL
+        matching = [s for s in self.snapshots() if s['url'] == api_url]
+        if len(matching) < 2:
+            return None
+        return diff(self.iter_items(matching[-2]), self.iter_items(matching[-1]))
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL),
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    store = FeedSnapshotStore()
+    snapshot = store.refresh(force=len(sys.argv) > 1 and sys.argv[1] == "refresh")
+    print(f"Latest snapshot: {snapshot['file']} (fetched {time.ctime(snapshot['fetched_at'])})")
+
+    changes = store.diff_latest()
+    if changes is None:
+        print("Only one snapshot so far, nothing to compare")
+    else:
+        print(f"Added: {len(changes['added'])}, changed: {len(changes['changed'])}, removed: {len(changes['removed'])}")
+        for internship in changes['added'][:10]:
+            print(f"  + {internship.get('company_name')} - {internship.get('title')}")
@@ -0,0 +1,285 @@
+"""
+Tiered job description fetcher: local cache, ATS JSON APIs, then plain HTTP, Selenium only as a fallback
+"""
+
+import logging
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Generator, List, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from ats_extractors import find_extractor
+from description_cache import DescriptionCache
+from html_extraction import Block, extract_block
+
+logger = logging.getLogger(__name__)
+
+TIER_CACHE = "cache"
+TIER_NOT_MODIFIED = "not_modified"
+TIER_API = "api"
+TIER_STATIC = "static"
+TIER_BROWSER = "browser"
+TIER_FAILED = "failed"
+
+
+def request_headers(ua=None) -> Dict[str, str]:
+    """Browser-like headers for plain HTTP page fetches."""
+    headers = {
+        'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+    }
+    if ua is not None:
+        headers['User-Agent'] = ua.random
+    return headers
+
+
+def is_html(content_type: str) -> bool:
+    """Whether a response can go through static HTML extraction."""
+    return not content_type or 'html' in content_type
+
+
+class HttpRequest(NamedTuple):
+    """A GET the tier plan needs; answered with the response, or None if it failed."""
+    url: str
+    headers: Dict[str, str]
+    tier: str
+    shared: bool = False  # Many postings ask for the same URL, concurrent identical requests can share one
+
+
+class BrowserRequest(NamedTuple):
+    """A page the tier plan needs rendered; answered with the browser's description, or None."""
+    url: str
+
+
+def advance(steps: Generator, answer: Any = None) -> Tuple[bool, Any]:
+    """Send an answer into a tier plan: (True, description) once it is done, else (False, next request).
+
+    StopIteration can't cross asyncio.to_thread(), so the async engine needs this too.
+    """
+    try:
+        return False, steps.send(answer)
+    except StopIteration as done:
+        return True, done.value
+
+
+class TieredFetcher:
+    """Fetch job descriptions over pooled HTTP, escalating to a browser when needed."""
+
+    def __init__(self, ua=None, min_length: int = None, pool_size: int = None):
+        self.ua = ua
+        self.min_length = min_length if min_length is not None else config.STATIC_MIN_DESCRIPTION_LENGTH
+        pool_size = pool_size or config.HTTP_POOL_SIZE
+
+        # One session for the whole run so connections are reused per host
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cache = DescriptionCache() if config.DESCRIPTION_CACHE_ENABLED else None
+
+        # ATS boards shared by many postings (Ashby), decoded once per run: api_url -> (response, payload)
+        self.boards: Dict[str, Tuple[Any, Any]] = {}
+
+        self.stats = Counter()
+        self.lock = threading.Lock()
+
+    def record(self, tier: str):
+        """Count one URL as served by the given tier."""
+        with self.lock:
+            self.stats[tier] += 1
+
+    def request(self, url: str, headers: Dict[str, str], entry: Optional[Dict[str, Any]], tier: str,
+                shared: bool = False) -> HttpRequest:
+        """A GET for one tier, revalidating the cached entry if it came from the same tier."""
+        return HttpRequest(url, dict(headers, **DescriptionCache.conditional_headers(entry, tier)), tier, shared)
+
+    def _get(self, request: HttpRequest) -> Optional[requests.Response]:
+        """Make a tier's GET over the pooled session."""
+        try:
+            response = self.session.get(request.url, headers=request.headers, timeout=config.HTTP_TIMEOUT)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            logger.debug(f"{request.tier} fetch failed for {request.url}: {e}")
+            return None
+
+    @staticmethod
+    def decode_api(extractor, url: str, response) -> Optional[Any]:
+        """The JSON payload of an ATS API response."""
+        if response is None or response.status_code == 304:
+            return None
+        try:
+            return response.json()
+        except ValueError as e:
+            logger.debug(f"{extractor.name} API returned invalid JSON for {url}: {e}")
+            return None
+
+    @staticmethod
+    def parse_static(url: str, response) -> Optional[Block]:
+        """The description block of a page fetched without a browser."""
+        if response is None or response.status_code == 304:
+            return None
+
+        content_type = response.headers.get('Content-Type', '')
+        if not is_html(content_type):
+            logger.debug(f"Skipping static extraction for {url} ({content_type})")
+            return None
+
+        return extract_block(response.text)
+
+    def is_complete(self, block: Optional[Block]) -> bool:
+        """Whether static extraction found the description itself.
+
+        Text from the readability fallback or the whole body means no description
+        selector matched - often a page the browser still has to render - so it
+        only counts once the browser has had its turn.
+        """
+        return block is not None and block.selector is not None and len(block.text) >= self.min_length
+
+    def remember(self, url: str, description: str, tier: str, response=None):
+        """Count a fetched description and cache it with the response's validators."""
+        self.record(tier)
+        if self.cache is not None:
+            headers = response.headers if response is not None else {}
+            self.cache.store(url, description, tier, headers.get('ETag'), headers.get('Last-Modified'))
+
+    def not_modified(self, url: str, entry: Optional[Dict[str, Any]], response) -> bool:
+        """Whether a response was a 304 for the cached entry, refreshing its TTL if so."""
+        if entry is None or response is None or response.status_code != 304:
+            return False
+        self.cache.touch(url)
+        self.record(TIER_NOT_MODIFIED)
+        return True
+
+    def tiers(self, url: str) -> Generator[Union[HttpRequest, BrowserRequest], Any, Optional[str]]:
+        """The tier decision for one URL, independent of how its requests are made.
+
+        Yields an HttpRequest per tier that needs the network and a BrowserRequest
+        when the page has to be rendered, expecting each answer back through send()
+        (see advance()); returns the description. fetch() answers with the pooled
+        requests session, the async engine with httpx.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry and self.cache.is_fresh(entry):
+            self.record(TIER_CACHE)
+            return entry['description']
+
+        # Known ATS hosts serve the description directly as JSON
+        found = find_extractor(url)
+        if found:
+            extractor, match = found
+            api_url = extractor.api_url(match)
+            board = self.boards.get(api_url) if extractor.shared_board else None
+            if board is not None:
+                response, payload = board
+            else:
+                response = yield self.request(api_url, {'Accept': 'application/json'}, entry, TIER_API,
+                                              shared=extractor.shared_board)
+                if self.not_modified(url, entry, response):
+                    return entry['description']
+                payload = self.decode_api(extractor, url, response)
+                if payload is not None and extractor.shared_board:
+                    self.boards[api_url] = (response, payload)
+            description = extractor.parse(payload, match) if payload is not None else None
+            if description:
+                self.remember(url, description, TIER_API, response)
+                return description
+
+        response = yield self.request(url, request_headers(self.ua), entry, TIER_STATIC)
+        if self.not_modified(url, entry, response):
+            return entry['description']
+        block = self.parse_static(url, response)
+        description = block.text if block else None
+        if self.is_complete(block):
+            self.remember(url, description, TIER_STATIC, response)
+            return description
+
+        browser_description = yield BrowserRequest(url)
+        if browser_description:
+            self.remember(url, browser_description, TIER_BROWSER)
+            return browser_description
+
+        # Keep whatever the static tier found rather than nothing
+        if description:
+            self.remember(url, description, TIER_STATIC, response)
+            return description
+
+        self.record(TIER_FAILED)
+        return None
+
+    def fetch(self, url: str, browser_fallback: Callable[[str], Optional[str]] = None) -> Optional[str]:
+        """Return the job description for a URL, using the browser only if static HTML falls short."""
+        steps = self.tiers(url)
+        answer = None
+        while True:
+            done, step = advance(steps, answer)
+            if done:
+                return step
+            if isinstance(step, HttpRequest):
+                answer = self._get(step)
+            elif browser_fallback is not None:
+                logger.debug(f"No description selector matched enough static text for {url}, escalating to browser")
+                answer = browser_fallback(url)
+            else:
+                answer = None
+
+    def keywords_for(self, url: str, description: str, extract: Callable[[str], List[str]]) -> List[str]:
+        """Keywords for a description, skipping extraction if the cached text is unchanged."""
+        if self.cache is not None:
+            keywords = self.cache.keywords_for(url, description)
+            if keywords is not None:
+                return keywords
+
+        keywords = extract(description)
+        if self.cache is not None:
+            self.cache.store_keywords(url, description, keywords)
+        return keywords
+
+    def keywords_for_many(self, items: List[Tuple[str, str]],
+                          extract_many: Callable[[List[str]], List[List[str]]]) -> List[List[str]]:
+        """Keywords for many (url, description) pairs, extracting all cache misses in one batch."""
+        results = [None] * len(items)
+        if self.cache is not None:
+            for i, (url, description) in enumerate(items):
+                results[i] = self.cache.keywords_for(url, description)
+
+        misses = [i for i, keywords in enumerate(results) if keywords is None]
+        if misses:
+            extracted = extract_many([items[i][1] for i in misses])
+            for i, keywords in zip(misses, extracted):
+                results[i] = keywords
+                if self.cache is not None:
+                    self.cache.store_keywords(items[i][0], items[i][1], keywords)
+        return results
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Fraction of fetches served by each tier."""
+        with self.lock:
+            total = sum(self.stats.values())
+            if not total:
+                return {}
+            return {tier: count / total for tier, count in self.stats.items()}
+
+    def log_stats(self):
+        """Log per-tier hit rates for the run."""
+        with self.lock:
+            total = sum(self.stats.values())
+            counts = dict(self.stats)
+        if not total:
+            return
+        summary = ", ".join(
+            f"{tier}: {counts.get(tier, 0)} ({counts.get(tier, 0) / total * 100:.1f}%)"
+            for tier in (TIER_CACHE, TIER_NOT_MODIFIED, TIER_API, TIER_STATIC, TIER_BROWSER, TIER_FAILED)
+        )
+        logger.info(f"Description fetch tiers over {total} URLs - {summary}")
+
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.engine.dispose()
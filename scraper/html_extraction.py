@@ -0,0 +1,266 @@
+"""
+Job description extraction from static HTML
+
+Pages are parsed with lxml and JOB_DESCRIPTION_SELECTORS are compiled to XPath once
+per process, so extracting a page costs one parse plus one XPath evaluation per
+selector. Candidate blocks are scored like the in-page browser script: text length
+weighted by text density (the share of text that isn't link text). When no selector
+matches, a readability-style pass picks the container holding the most paragraph
+text instead of returning the whole body.
+"""
+
+import logging
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Tags whose text is never part of a job description
+NON_CONTENT_TAGS = ['script', 'style', 'noscript', 'template', 'svg']
+
+# For pages whose text carries an XML encoding declaration, after re-encoding
+_UTF8_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Elements whose text counts towards their container in the readability fallback
+PARAGRAPH_TAGS = ('p', 'li', 'pre', 'td', 'dd', 'blockquote')
+
+# The subset of CSS the selectors use: type, #id, .class and attribute selectors,
+# joined by descendant/child combinators and commas
+_SELECTOR_TOKEN = re.compile(r"""
+    \s*(?P<comma>,)\s*
+  | \s*(?P<child>>)\s*
+  | (?P<descendant>\s+)
+  | (?P<type>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~|]?=)\s*
+        (?:'(?P<single>[^']*)'|"(?P<double>[^"]*)"|(?P<bare>[\w-]+))\s*)?\]
+""", re.VERBOSE)
+
+
+class Block(NamedTuple):
+    text: str
+    selector: Optional[str]  # None for the readability fallback or the whole body
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse every whitespace run to one space and strip the ends, in one pass."""
+    return ' '.join(text.split())
+
+
+def _literal(value: str) -> str:
+    """An XPath string literal for any value."""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+def _has_word(attribute: str, word: str) -> str:
+    return f"contains(concat(' ', normalize-space(@{attribute}), ' '), {_literal(' ' + word + ' ')})"
+
+
+def _attribute_condition(name: str, op: Optional[str], value: Optional[str]) -> str:
+    attribute = f"@{name.lower()}"
+    if op is None:
+        return attribute
+    if op == '=':
+        return f"{attribute}={_literal(value)}"
+    if op == '*=':
+        return f"contains({attribute}, {_literal(value)})" if value else "false()"
+    if op == '^=':
+        return f"starts-with({attribute}, {_literal(value)})" if value else "false()"
+    if op == '$=':
+        if not value:
+            return "false()"
+        return (f"substring({attribute}, string-length({attribute}) - {len(value) - 1})"
+                f"={_literal(value)}")
+    if op == '~=':
+        return _has_word(name.lower(), value) if value and not value.isspace() else "false()"
+    # |=
+    return f"({attribute}={_literal(value)} or starts-with({attribute}, {_literal(value + '-')}))"
+
+
+def css_to_xpath(selector: str) -> str:
+    """Translate a CSS selector to an XPath expression relative to the document.
+
+    Raises ValueError for syntax outside the supported subset (pseudo-classes,
+    sibling combinators, ...).
+    """
+    paths: List[str] = []
+    steps: List[str] = []
+    axis = 'descendant-or-self::'
+    element, conditions = None, []
+
+    def close_step():
+        nonlocal element, conditions
+        if element is None and not conditions:
+            raise ValueError(f"Unsupported CSS selector {selector!r}")
+        steps.append(axis + (element or '*') + ''.join(f"[{condition}]" for condition in conditions))
+        element, conditions = None, []
+
+    position = 0
+    text = selector.strip()
+    while position < len(text):
+        match = _SELECTOR_TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported CSS selector {selector!r}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind in ('comma', 'child', 'descendant'):
+            close_step()
+            if kind == 'comma':
+                paths.append('/'.join(steps))
+                steps, axis = [], 'descendant-or-self::'
+            else:
+                axis = 'child::' if kind == 'child' else 'descendant::'
+        elif kind == 'type':
+            if element is not None or conditions:
+                raise ValueError(f"Unsupported CSS selector {selector!r}")
+            element = match.group('type').lower()
+        elif kind == 'id':
+            conditions.append(f"@id={_literal(match.group('id'))}")
+        elif kind == 'cls':
+            conditions.append(_has_word('class', match.group('cls')))
+        else:
+            value = next((v for v in match.group('single', 'double', 'bare') if v is not None), None)
+            conditions.append(_attribute_condition(match.group('attr'), match.group('op'), value))
+    close_step()
+    paths.append('/'.join(steps))
+    return ' | '.join(paths)
+
+
+def parse_html(markup: str) -> Optional[etree._Element]:
+    """Parse a page and drop scripts, styles and comments; None if it isn't HTML."""
+    try:
+        if markup.lstrip().startswith('<?xml'):
+            # lxml refuses str input that carries its own encoding declaration
+            root = lxml_html.document_fromstring(markup.encode('utf-8'), parser=_UTF8_PARSER)
+        else:
+            root = lxml_html.document_fromstring(markup)
+    except (etree.ParserError, ValueError):
+        return None
+    etree.strip_elements(root, etree.Comment, *NON_CONTENT_TAGS, with_tail=False)
+    return root
+
+
+def element_text(element: etree._Element) -> str:
+    return normalize_whitespace(' '.join(element.itertext()))
+
+
+def link_text_length(element: etree._Element) -> int:
+    return sum(len(element_text(link)) for link in element.iter('a'))
+
+
+def density_score(element: etree._Element, text: str) -> float:
+    """Text length weighted by the share of it that isn't link text."""
+    return len(text) * max(0.0, 1 - link_text_length(element) / len(text)) if text else 0.0
+
+
+class SelectorEngine:
+    """Picks the job description block out of static HTML.
+
+    The longest-scoring block matched by the selectors wins; selectors are tried in
+    order (most specific first) until a block longer than `enough` characters is found.
+    Blocks of `min_length` characters or fewer are ignored.
+    """
+
+    def __init__(self, selectors: List[str] = None, min_length: int = 100, enough: int = 500):
+        self.selectors = list(config.JOB_DESCRIPTION_SELECTORS if selectors is None else selectors)
+        self.min_length = min_length
+        self.enough = enough
+        self.compiled: List[Tuple[str, etree.XPath]] = []
+        for selector in self.selectors:
+            try:
+                self.compiled.append((selector, etree.XPath(css_to_xpath(selector))))
+            except (ValueError, etree.XPathSyntaxError) as e:
+                logger.warning(f"Skipping description selector {selector!r}: {e}")
+
+    def extract(self, markup: str) -> str:
+        """The description text of a page, or "" if there is none."""
+        block = self.best_block(markup)
+        return block.text if block else ""
+
+    def best_block(self, markup: str) -> Optional[Block]:
+        root = parse_html(markup)
+        if root is None:
+            return None
+        return self.select(root) or self.densest(root) or self.body(root)
+
+    def select(self, root: etree._Element) -> Optional[Block]:
+        """Best block matched by the selectors."""
+        seen = set()
+        best, best_score = None, 0.0
+        for selector, xpath in self.compiled:
+            for element in xpath(root):
+                if element in seen:
+                    continue
+                seen.add(element)
+                text = element_text(element)
+                if len(text) <= self.min_length:
+                    continue
+                score = density_score(element, text)
+                if best is None or score > best_score:
+                    best, best_score = Block(text, selector), score
+            if best and len(best.text) > self.enough:
+                break
+        return best
+
+    def densest(self, root: etree._Element) -> Optional[Block]:
+        """Readability-style fallback: the container with the most paragraph text.
+
+        Each paragraph of 25+ characters scores its parent (and half as much its
+        grandparent) by length and commas; containers are then discounted by link density.
+        """
+        scores: Dict[etree._Element, float] = {}
+        for paragraph in root.iter(*PARAGRAPH_TAGS):
+            text = element_text(paragraph)
+            if len(text) < 25:
+                continue
+            score = 1 + text.count(',') + min(len(text) // 100, 3)
+            parent = paragraph.getparent()
+            if parent is None:
+                continue
+            scores[parent] = scores.get(parent, 0.0) + score
+            grandparent = parent.getparent()
+            if grandparent is not None:
+                scores[grandparent] = scores.get(grandparent, 0.0) + score / 2
+
+        best, best_score = None, 0.0
+        for container, score in scores.items():
+            text = element_text(container)
+            if len(text) <= self.min_length:
+                continue
+            score *= max(0.0, 1 - link_text_length(container) / len(text))
+            if score > best_score:
+                best, best_score = Block(text, None), score
+        return best
+
+    def body(self, root: etree._Element) -> Optional[Block]:
+        body = root.find('body')
+        text = element_text(body if body is not None else root)
+        return Block(text, None) if text else None
+
+
+_default_engine: Optional[SelectorEngine] = None
+
+
+def extract_block(markup: str, selectors: List[str] = None) -> Optional[Block]:
+    """The best job description block in static HTML and the selector that matched it."""
+    global _default_engine
+    if selectors is not None:
+        return SelectorEngine(selectors).best_block(markup)
+    if _default_engine is None:
+        _default_engine = SelectorEngine()
+    return _default_engine.best_block(markup)
+
+
+def extract_description(markup: str, selectors: List[str] = None) -> str:
+    """Extract the best job description block from static HTML."""
+    block = extract_block(markup, selectors)
+    return block.text if block else ""
@@ -0,0 +1,122 @@
+"""
+Keyword extraction: the compiled keyword matcher plus optional, batched spaCy passes
+"""
+
+import logging
+import subprocess
+import sys
+import threading
+from typing import List, Optional
+
+import config
+from keyword_matcher import find_keywords
+from taxonomy import lookup
+
+logger = logging.getLogger(__name__)
+
+NLP_MODES = ("off", "lightweight", "full")
+
+# Pipeline components each mode can skip loading. "lightweight" only needs NER;
+# "full" also needs the parser (plus tagger/attribute_ruler for POS) for noun chunks.
+EXCLUDED_COMPONENTS = {
+    "lightweight": ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"],
+    "full": ["lemmatizer", "senter"],
+}
+
+# Entity types and words that mark a named entity as a technology
+ENTITY_LABELS = {"ORG", "PRODUCT", "GPE"}
+ENTITY_HINTS = ["software", "framework", "platform", "system"]
+
+
+# spaCy models already loaded in this process, by mode
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_nlp(mode: str):
+    """The spaCy model with only the components the mode uses (None when mode is "off").
+
+    Each mode's model is loaded once per process and shared by every extractor.
+    """
+    if mode not in NLP_MODES:
+        raise ValueError(f"NLP_MODE must be one of {NLP_MODES}, got {mode!r}")
+    if mode == "off":
+        return None
+
+    with _models_lock:
+        if mode not in _models:
+            _models[mode] = _load_model(mode)
+    return _models[mode]
+
+
+def _load_model(mode: str):
+    import spacy
+
+    exclude = EXCLUDED_COMPONENTS[mode]
+    try:
+        return spacy.load(config.SPACY_MODEL, exclude=exclude)
+    except OSError:
+        logger.info("Downloading spaCy model...")
+        subprocess.run([sys.executable, "-m", "spacy", "download", config.SPACY_MODEL])
+        return spacy.load(config.SPACY_MODEL, exclude=exclude)
+
+
+class KeywordExtractor:
+    """Extracts keywords from descriptions, running spaCy over whole batches with nlp.pipe."""
+
+    def __init__(self, mode: str = None, batch_size: int = None, n_process: int = None):
+        self.mode = mode or config.NLP_MODE
+        self.batch_size = batch_size or config.NLP_BATCH_SIZE
+        self.n_process = n_process or config.NLP_N_PROCESS
+        if self.mode not in NLP_MODES:
+            raise ValueError(f"NLP_MODE must be one of {NLP_MODES}, got {self.mode!r}")
+
+    @property
+    def nlp(self):
+        """The spaCy model, loaded the first time a description needs it."""
+        return load_nlp(self.mode)
+
+    def extract(self, text: str) -> List[str]:
+        return self.extract_many([text])[0]
+
+    @staticmethod
+    def prepare(text: Optional[str]) -> Optional[str]:
+        """The part of a description keywords are extracted from (None if it is too short).
+
+        Every path (threads, process pool, async engine) goes through here, so the keywords
+        cached for a description don't depend on which one extracted them.
+        """
+        if not text or len(text) < config.KEYWORD_TEXT_MIN_CHARS:
+            return None
+        return text[:config.KEYWORD_TEXT_MAX_CHARS]
+
+    def extract_many(self, texts: List[Optional[str]]) -> List[List[str]]:
+        """Keywords for each text, in order. Empty or very short texts get no keywords."""
+        texts = [self.prepare(text) for text in texts]
+        results = [set(find_keywords(text)) if text else set() for text in texts]
+        nlp = self.nlp
+        if nlp is None:
+            return [sorted(found) for found in results]
+
+        indexes = [i for i, text in enumerate(texts) if text]
+        docs = nlp.pipe((texts[i] for i in indexes),
+                             batch_size=self.batch_size, n_process=self.n_process)
+        for i, doc in zip(indexes, docs):
+            found = results[i]
+
+            # Noun phrases that are exactly a known keyword
+            if self.mode == "full":
+                for chunk in doc.noun_chunks:
+                    chunk_text = chunk.text.strip().lower()
+                    skill = lookup(chunk_text)
+                    if len(chunk_text) > 2 and skill:
+                        found.add(skill.name)
+
+            # Named entities that look like technologies
+            for ent in doc.ents:
+                if ent.label_ in ENTITY_LABELS and len(ent.text) > 2:
+                    ent_lower = ent.text.lower()
+                    if any(hint in ent_lower for hint in ENTITY_HINTS):
+                        found.add(ent_lower)
+
+        return [sorted(found) for found in results]
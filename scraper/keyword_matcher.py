@@ -0,0 +1,100 @@
+"""
+Single-pass keyword matching against the skill taxonomy
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+import config
+from taxonomy import SKILLS_BY_NAME
+
+# A keyword only counts as a whole token: not glued to letters/digits or to
+# symbols that are part of tech names ("c++", "c#", "node.js", "r&d"). A trailing
+# ".js" is allowed, so "React.js" and "Express.js" still count as react and express.
+_BEFORE = r'(?<![\w.+#&])'
+_AFTER = r'(?![\w+#&]|\.(?!js\b)\w)'
+
+_END = ''
+
+
+def _build_trie(keywords: Iterable[str]) -> Dict:
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    return trie
+
+
+def _trie_to_regex(node: Dict) -> str:
+    """Turn a trie into an alternation that shares prefixes and prefers the longest keyword."""
+    branches = []
+    for char, child in sorted(node.items()):
+        if char == _END:
+            continue
+        piece = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(piece + _trie_to_regex(child))
+
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if _END in node:
+        # Greedy optional: "spring boot" wins over "spring" when both fit
+        return f'(?:{body})?' if len(branches) == 1 else body + '?'
+    return body
+
+
+class KeywordMatcher:
+    """Finds every keyword in a text with one compiled regex scan.
+
+    Hits are reported under their canonical name when a mapping is given
+    ("k8s" -> "kubernetes").
+    """
+
+    def __init__(self, keywords: Iterable[str], canonical: Dict[str, str] = None,
+                 hyphen_bounded: Iterable[str] = None):
+        self.keywords = sorted({k.lower().strip() for k in keywords if k.strip()})
+        self.canonical = canonical or {}
+        # Keywords for which a hyphen is part of the word, so "go-to" isn't go
+        self.hyphen_bounded = set(config.HYPHEN_BOUNDED_KEYWORDS if hyphen_bounded is None else hyphen_bounded)
+        self.pattern = re.compile(_BEFORE + _trie_to_regex(_build_trie(self.keywords)) + _AFTER)
+
+        # The scan reports the longest keyword at each position, so also credit the
+        # keywords a canonical multi-word name contains ("spring boot" -> "spring").
+        # Aliases don't: "apache spark" is just spark, not the Apache web server too.
+        self.contains = {}
+        for keyword in self.keywords:
+            if (' ' in keyword or '-' in keyword) and self.canonical.get(keyword, keyword) == keyword:
+                self.contains[keyword] = {
+                    self.canonical.get(other, other) for other in self.keywords
+                    if other != keyword and re.search(_BEFORE + re.escape(other) + _AFTER, keyword)
+                }
+
+    def find(self, text: str) -> Set[str]:
+        if not text:
+            return set()
+        found = set()
+        text = text.lower()
+        for match in self.pattern.finditer(text):
+            keyword = ' '.join(match.group().split())
+            if keyword in self.hyphen_bounded and '-' in (text[match.start() - 1:match.start()]
+                                                          + text[match.end():match.end() + 1]):
+                continue
+            found.add(self.canonical.get(keyword, keyword))
+            found.update(self.contains.get(keyword, ()))
+        return found
+
+
+# Built once at import so every scraper shares the same compiled pattern
+MATCHER = KeywordMatcher(SKILLS_BY_NAME, {name: skill.name for name, skill in SKILLS_BY_NAME.items()})
+
+
+def find_keywords(text: str) -> List[str]:
+    """Canonical names of the taxonomy skills that appear in the text as whole tokens."""
+    return sorted(MATCHER.find(text))
+
+
+def find_skill_ids(text: str) -> List[int]:
+    """Ids of the taxonomy skills that appear in the text as whole tokens."""
+    return sorted(SKILLS_BY_NAME[name].id for name in MATCHER.find(text))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Vectorized resume-to-posting match scoring
+
+A posting's score is the share of its skills the resume covers (0-100), the same
+measure the web app computes per job, optionally weighting rare skills higher (IDF).
+Every posting is a row of a sparse skill matrix, so all of them are scored with one
+sparse matrix-vector product.
+
+Usage:
+    python match_scoring.py python react aws            # Top matches for these skills
+    python match_scoring.py --text resume.txt --idf     # Skills extracted from a resume
+    python match_scoring.py python sql --top 50 --json  # Machine-readable output
+"""
+
+import json
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import String, select, type_coerce
+
+from database import table_version
+from models import Internship
+from skill_index import SkillRef, resolve_skills
+from taxonomy import SKILLS_BY_ID
+
+
+def skill_matrix(conn, active_only: bool = True) -> Tuple[List[str], sparse.csr_matrix]:
+    """Binary posting-by-skill matrix built from every posting's skill_ids.
+
+    Returns (internship ids in id order, matrix); column j is taxonomy skill id j. Reading
+    the per-posting id lists is several times faster than one index row per skill.
+    """
+    internships = Internship.__table__
+    # Raw JSON text, decoded here in one pass rather than per row by the JSON type
+    skill_ids = type_coerce(internships.c.skill_ids, String)
+    query = select(internships.c.id, skill_ids).order_by(internships.c.id)
+    if active_only:
+        query = query.where(internships.c.active == True)
+    rows = conn.execute(query).all()
+
+    ids = [row[0] for row in rows]
+    lists = [json.loads(row[1]) if row[1] else () for row in rows]
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, lists), dtype=np.int64, count=len(lists)), out=indptr[1:])
+    indices = np.fromiter(chain.from_iterable(lists), dtype=np.int32, count=int(indptr[-1]))
+    matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                               shape=(len(ids), max(SKILLS_BY_ID) + 1))
+    return ids, matrix
+
+
+class MatchScorer:
+    """Scores a set of skills against every posting at once."""
+
+    def __init__(self, ids: List[str], matrix: sparse.csr_matrix, version=None, active_only: bool = True):
+        self.ids = np.array(ids, dtype=object)
+        self.matrix = matrix.tocsr().astype(np.float32)
+        self.version = version
+        self.active_only = active_only
+
+        # Smoothed inverse document frequency of every skill column
+        postings = max(len(ids), 1)
+        document_frequency = np.bincount(self.matrix.indices, minlength=self.matrix.shape[1])
+        self.idf = (np.log((1 + postings) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        # Denominators: how many (or how much IDF weight of) skills each posting asks for
+        self.skill_counts = np.asarray(self.matrix.sum(axis=1)).ravel()
+        self.idf_totals = self.matrix @ self.idf
+
+    @classmethod
+    def from_database(cls, engine, active_only: bool = True) -> "MatchScorer":
+        """Build the posting-by-skill matrix from the database."""
+        with engine.connect() as conn:
+            version = table_version(conn)
+            ids, matrix = skill_matrix(conn, active_only)
+        return cls(ids, matrix, version, active_only)
+
+    def is_stale(self, engine) -> bool:
+        """Whether the internships table changed (including deactivations) since this scorer was built."""
+        with engine.connect() as conn:
+            return table_version(conn) != self.version
+
+    def refresh(self, engine) -> bool:
+        """Rebuild from the database if the internships table changed since the last build."""
+        if not self.is_stale(engine):
+            return False
+        self.__dict__.update(MatchScorer.from_database(engine, self.active_only).__dict__)
+        return True
+
+    def query_vector(self, skills: Iterable[SkillRef]) -> np.ndarray:
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        vector[[i for i in resolve_skills(skills) if i < len(vector)]] = 1
+        return vector
+
+    def scores(self, skills: Iterable[SkillRef], idf: bool = False) -> np.ndarray:
+        """Match score (0-100) of every posting, in the order of self.ids."""
+        query = self.query_vector(skills)
+        if idf:
+            covered, total = self.matrix @ (query * self.idf), self.idf_totals
+        else:
+            covered, total = self.matrix @ query, self.skill_counts
+        return 100 * covered / np.maximum(total, 1e-9)
+
+    def top_matches(self, skills: Iterable[SkillRef], k: int = 20, idf: bool = False,
+                    min_score: float = 0) -> List[Tuple[str, float]]:
+        """The k best (internship id, score) pairs scoring above min_score, best first.
+
+        argpartition finds the top k in linear time; only those k are then sorted.
+        """
+        scores = self.scores(skills, idf)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.ids[i], float(scores[i])) for i in top if scores[i] > min_score]
+
+
+def rank_internships(engine, skills: Iterable[SkillRef], k: int = 20, idf: bool = False,
+                     min_score: float = 0, scorer: Optional[MatchScorer] = None) -> List[Tuple[str, float]]:
+    """Top-k internships for a set of skills. Pass a scorer to reuse its matrix across calls;
+    it is rebuilt first if the table changed since."""
+    if scorer is None:
+        scorer = MatchScorer.from_database(engine)
+    else:
+        scorer.refresh(engine)
+    return scorer.top_matches(skills, k, idf, min_score)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import config
+    from database import open_database
+    from keyword_matcher import find_skill_ids
+
+    parser = argparse.ArgumentParser(description="Rank internships against a set of skills")
+    parser.add_argument("skills", nargs="*", help="Skill names or aliases")
+    parser.add_argument("--text", help="File (e.g. a plain-text resume) to extract skills from")
+    parser.add_argument("--idf", action="store_true", help="Weight rare skills higher")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--min-score", type=float, default=0, help="Only show scores above this")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    skills = list(args.skills)
+    if args.text:
+        with open(args.text) as f:
+            skills.extend(find_skill_ids(f.read()))
+    if not skills:
+        parser.error("give some skills or --text")
+
+    engine = open_database(config.DATABASE_PATH)
+    scorer = MatchScorer.from_database(engine)
+
+    start = time.perf_counter()
+    matches = scorer.top_matches(skills, args.top, args.idf, args.min_score)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    table = Internship.__table__
+    with engine.connect() as conn:
+        details = {row.id: row for row in conn.execute(
+            select(table.c.id, table.c.company_name, table.c.title, table.c.url)
+            .where(table.c.id.in_([internship_id for internship_id, _ in matches])))}
+
+    if args.json:
+        print(json.dumps([{'id': internship_id, 'matchScore': round(score),
+                           'company_name': details[internship_id].company_name,
+                           'title': details[internship_id].title, 'url': details[internship_id].url}
+                          for internship_id, score in matches], indent=2))
+    else:
+        print(f"Scored {len(scorer.ids)} postings in {elapsed:.2f} ms")
+        for internship_id, score in matches:
+            row = details[internship_id]
+            print(f"  {score:5.1f}%  {row.company_name} - {row.title}")
@@ -0,0 +1,49 @@
+"""
+Database models shared by the scrapers and the reporting tools
+"""
+
+from sqlalchemy import Column, String, Boolean, Integer, JSON, DateTime, Index
+from sqlalchemy.ext.declarative import declarative_base
+from datetime import datetime
+
+Base = declarative_base()
+
+class Internship(Base):
+    __tablename__ = 'internships'
+    
+    id = Column(String, primary_key=True)
+    active = Column(Boolean)
+    company_name = Column(String)
+    date_posted = Column(Integer)
+    date_updated = Column(Integer)
+    is_visible = Column(Boolean)
+    locations = Column(JSON)
+    season = Column(String, index=True)
+    sponsorship = Column(String, index=True)
+    title = Column(String)
+    url = Column(String)
+    keywords = Column(JSON)
+    skill_ids = Column(JSON)  # Taxonomy ids of the keywords, sorted
+    xata = Column(JSON)
+    scraped_at = Column(DateTime, default=datetime.utcnow, index=True)
+    row_version = Column(Integer, index=True)  # Write counter value of the transaction that last changed the row
+
+
+class InternshipSkill(Base):
+    """Inverted index: one row per (posting, taxonomy skill), kept in step with skill_ids on every upsert."""
+    __tablename__ = 'internship_skills'
+    __table_args__ = (
+        Index('ix_internship_skills_skill', 'skill_id', 'internship_id'),
+        {'sqlite_with_rowid': False},
+    )
+    
+    internship_id = Column(String, primary_key=True)
+    skill_id = Column(Integer, primary_key=True)
+
+
+class SyncMetadata(Base):
+    __tablename__ = 'sync_metadata'
+    
+    key = Column(String, primary_key=True)
+    value = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
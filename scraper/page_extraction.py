@@ -0,0 +1,68 @@
+"""
+Job description extraction inside the browser
+
+Looping over JOB_DESCRIPTION_SELECTORS with find_elements() and element.text costs
+one WebDriver round trip per selector and per element. EXTRACT_SCRIPT runs every
+selector in the page instead and returns the best block in a single execute_script().
+
+Candidates are scored by text length weighted by text density: the share of a
+block's text that isn't link text, so navigation menus and footers that happen to
+match a broad selector (".content", "main") lose to the actual description.
+"""
+
+import logging
+import re
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
+
+import config
+
+# Selenium is only imported once a browser is actually needed
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_SCRIPT = """
+const [selectors, minLength, enough, bodyLimit] = arguments;
+const seen = new Set();
+let best = null;
+for (const selector of selectors) {
+    let elements;
+    try { elements = document.querySelectorAll(selector); } catch (e) { continue; }
+    for (const element of elements) {
+        if (seen.has(element)) continue;
+        seen.add(element);
+        const text = (element.innerText || '').trim();
+        if (text.length <= minLength) continue;
+        let linkText = 0;
+        for (const link of element.querySelectorAll('a')) linkText += (link.innerText || '').trim().length;
+        const density = Math.max(0, 1 - linkText / text.length);
+        const score = text.length * density;
+        if (!best || score > best[2]) best = [text, selector, score];
+    }
+    // Selectors run from most to least specific, so stop once a long block is found
+    if (best && best[0].length > enough) break;
+}
+if (best) return [best[0], best[1]];
+const body = document.body ? (document.body.innerText || '').trim() : '';
+return [bodyLimit ? body.slice(0, bodyLimit) : body, null];
+"""
+
+
+class Extraction(NamedTuple):
+    text: str
+    selector: Optional[str]  # None when the text fell back to the whole body
+
+
+def extract_in_page(driver: "webdriver.Chrome", selectors: List[str] = None, min_length: int = 100,
+                    enough: int = 500, body_limit: int = None) -> Extraction:
+    """Best description block on the loaded page, in one round trip.
+
+    Blocks of min_length characters or fewer are ignored, selectors stop being tried once a
+    block longer than enough is found, and the body text (cut to body_limit characters)
+    is the fallback. Whitespace is collapsed.
+    """
+    if selectors is None:
+        selectors = config.JOB_DESCRIPTION_SELECTORS
+    text, selector = driver.execute_script(EXTRACT_SCRIPT, selectors, min_length, enough, body_limit)
+    return Extraction(re.sub(r'\s+', ' ', text or '').strip(), selector)
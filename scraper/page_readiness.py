@@ -0,0 +1,208 @@
+"""
+When a browser page is ready to read
+
+Browsers load pages with Chrome's "eager" strategy, so driver.get() returns at
+DOMContentLoaded and PageReadiness decides when to read instead of a fixed sleep.
+A page is ready as soon as any of READINESS_WAITS holds:
+
+- "selector": one of READINESS_SELECTORS holds at least READINESS_MIN_TEXT characters
+- "ready_state": document.readyState is "complete"
+- "network_idle": the document is complete and no more than NETWORK_IDLE_MAX_REQUESTS
+  requests have been in flight for NETWORK_IDLE_TIME seconds (read from the DevTools
+  network events in Chrome's performance log, only once the document is complete)
+
+The time limit is learned per host from how long its pages took to become ready,
+the way TCP sizes its retransmission timeout: smoothed time plus four times its
+variation, doubled after a timeout.
+"""
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import config
+from resource_policy import ResourcePolicy
+
+# Selenium is only imported once a browser is actually needed
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+logger = logging.getLogger(__name__)
+
+WAITS = ('selector', 'ready_state', 'network_idle')
+TIMEOUT = 'timeout'
+
+# The document state and whether a selector has enough text, in one round trip
+_PROBE_SCRIPT = """
+const [selectors, minText] = arguments;
+for (const selector of selectors) {
+    let elements;
+    try { elements = document.querySelectorAll(selector); } catch (e) { continue; }
+    for (const element of elements) {
+        if ((element.innerText || '').trim().length >= minText) return [document.readyState, true];
+    }
+}
+return [document.readyState, false];
+"""
+
+
+class _HostTiming:
+    """Smoothed ready time of one host and the timeout derived from it."""
+
+    def __init__(self):
+        self.smoothed: Optional[float] = None
+        self.variation = 0.0
+        self.backoff = 1
+
+    def timeout(self, minimum: float, maximum: float, initial: float) -> float:
+        if self.smoothed is None:
+            base = initial
+        else:
+            base = self.smoothed + 4 * self.variation
+        return min(max(base * self.backoff, minimum), maximum)
+
+    def observe(self, seconds: float):
+        if self.smoothed is None:
+            self.smoothed = seconds
+            self.variation = seconds / 2
+        else:
+            self.variation = 0.75 * self.variation + 0.25 * abs(self.smoothed - seconds)
+            self.smoothed = 0.875 * self.smoothed + 0.125 * seconds
+        self.backoff = 1
+
+    def timed_out(self):
+        self.backoff = min(self.backoff * 2, 8)
+
+
+class PageReadiness:
+    """Waits until a loaded page is worth reading, with a per-host adaptive timeout.
+
+    Call configure(options) before starting Chrome, then wait(driver, url) right after
+    driver.get(url). One instance can be shared by every browser in a pool.
+    """
+
+    def __init__(self, resource_policy: ResourcePolicy = None, waits: List[str] = None,
+                 min_text: int = None, min_timeout: float = None, max_timeout: float = None):
+        self.resource_policy = resource_policy
+        self.waits = list(config.READINESS_WAITS if waits is None else waits)
+        unknown = set(self.waits) - set(WAITS)
+        if unknown:
+            raise ValueError(f"Unknown readiness waits {sorted(unknown)} (expected any of {', '.join(WAITS)})")
+        self.min_text = config.READINESS_MIN_TEXT if min_text is None else min_text
+        self.min_timeout = config.READINESS_MIN_TIMEOUT if min_timeout is None else min_timeout
+        self.max_timeout = config.READINESS_MAX_TIMEOUT if max_timeout is None else max_timeout
+
+        self._hosts: Dict[str, _HostTiming] = {}
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.waited = 0.0
+        self.reasons: Dict[str, int] = {}
+
+    @staticmethod
+    def configure(options: "Options"):
+        """Return from driver.get() at DOMContentLoaded and let wait() decide the rest."""
+        options.page_load_strategy = 'eager'
+
+    def timeout_for(self, url: str) -> float:
+        host = (urlparse(url).hostname or '').lower()
+        with self._lock:
+            timing = self._hosts.setdefault(host, _HostTiming())
+            return timing.timeout(self.min_timeout, self.max_timeout, config.PAGE_LOAD_TIMEOUT)
+
+    def wait(self, driver: "webdriver.Chrome", url: str, selectors: List[str] = None) -> str:
+        """Block until the page is ready or its host's timeout passes; returns why it stopped.
+
+        A timeout is not an error - the caller reads whatever the page has by then.
+        """
+        selectors = config.READINESS_SELECTORS if selectors is None else selectors
+        timeout = self.timeout_for(url)
+        network = _NetworkActivity(self.resource_policy, driver) if 'network_idle' in self.waits else None
+        start = time.monotonic()
+        reason = TIMEOUT
+        while True:
+            try:
+                state, has_text = driver.execute_script(_PROBE_SCRIPT, selectors, self.min_text)
+            except Exception as e:
+                logger.debug(f"Readiness probe failed on {url}: {e}")
+                state, has_text = None, False
+
+            complete = state == 'complete'
+            if 'selector' in self.waits and has_text:
+                reason = 'selector'
+            elif 'ready_state' in self.waits and complete:
+                reason = 'ready_state'
+            elif network is not None and network.idle(complete):
+                reason = 'network_idle'
+
+            elapsed = time.monotonic() - start
+            if reason != TIMEOUT or elapsed >= timeout:
+                break
+            time.sleep(min(config.READINESS_POLL_INTERVAL, timeout - elapsed))
+
+        self._record(url, reason, elapsed)
+        return reason
+
+    def _record(self, url: str, reason: str, elapsed: float):
+        host = (urlparse(url).hostname or '').lower()
+        with self._lock:
+            timing = self._hosts.setdefault(host, _HostTiming())
+            if reason == TIMEOUT:
+                timing.timed_out()
+            else:
+                timing.observe(elapsed)
+            self.pages += 1
+            self.waited += elapsed
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        logger.debug(f"{url} ready after {elapsed:.2f}s ({reason})")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pages': self.pages,
+                'avg_wait_ms': self.waited / self.pages * 1000 if self.pages else 0.0,
+                'reasons': dict(self.reasons),
+                'hosts': len(self._hosts),
+            }
+
+    def log_stats(self):
+        stats = self.stats()
+        if not stats['pages']:
+            return
+        reasons = ', '.join(f"{reason} {count}" for reason, count in sorted(stats['reasons'].items()))
+        logger.info(f"Page readiness: {stats['pages']} pages, wait avg {stats['avg_wait_ms']:.0f} ms "
+                    f"({reasons}), timeouts learned for {stats['hosts']} hosts")
+
+
+class _NetworkActivity:
+    """Requests in flight on the current page, from DevTools network events."""
+
+    def __init__(self, resource_policy: Optional[ResourcePolicy], driver: "webdriver.Chrome"):
+        self.resource_policy = resource_policy
+        self.driver = driver
+        self.in_flight = set()
+        self.quiet_since = time.monotonic()
+
+    def idle(self, complete: bool) -> bool:
+        if not complete:
+            # Idle needs a complete document anyway; Chrome buffers the log until it is read,
+            # so polls before then stay at one round trip and no event is missed
+            return False
+        events = self.resource_policy.network_events(self.driver) if self.resource_policy else None
+        if events is None:
+            # No network log to read, so a complete document is the best signal
+            return True
+        for method, params in ResourcePolicy.events(events):
+            if method == 'Network.requestWillBeSent':
+                self.in_flight.add(params.get('requestId'))
+            elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                self.in_flight.discard(params.get('requestId'))
+            else:
+                continue
+            self.quiet_since = time.monotonic()
+        if len(self.in_flight) > config.NETWORK_IDLE_MAX_REQUESTS:
+            self.quiet_since = time.monotonic()
+            return False
+        return time.monotonic() - self.quiet_since >= config.NETWORK_IDLE_TIME
@@ -0,0 +1,191 @@
+"""
+What the browser tier is allowed to download, and how much it did
+
+Chrome ignores flags like --disable-images or --disable-css, so requests are blocked
+through the DevTools protocol instead: Network.setBlockedURLs drops images, fonts,
+media and tracker/analytics hosts before they are requested. Documents, scripts,
+stylesheets and XHR still load - pages reach the browser tier because they render
+their description with JavaScript, and Selenium's element text relies on CSS to
+leave out hidden elements.
+
+Bytes transferred per page are read from Chrome's network performance log.
+"""
+
+import json
+import logging
+import threading
+import weakref
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import config
+
+# Selenium is only imported once a browser is actually needed
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+logger = logging.getLogger(__name__)
+
+
+class PageTraffic(NamedTuple):
+    bytes: int  # Encoded (on the wire) bytes of every finished request
+    requests: int
+    blocked: int
+
+
+def _host_matches(host: str, rule: str) -> bool:
+    return host == rule or host.endswith('.' + rule)
+
+
+def host_patterns(host: str) -> List[str]:
+    """setBlockedURLs patterns for every URL on a host and its subdomains."""
+    return [f"*://{host}/*", f"*.{host}/*"]
+
+
+def extension_patterns(extension: str) -> List[str]:
+    """setBlockedURLs patterns for a file extension, with or without a query string."""
+    return [f"*.{extension}", f"*.{extension}?*"]
+
+
+class ResourcePolicy:
+    """Blocks unneeded subresources per page and tallies network traffic.
+
+    Call configure(options) before starting Chrome, attach(driver) once it is up, then
+    before_page(driver, url) / after_page(driver, url) around each page. One policy can be
+    shared by every browser in a pool.
+    """
+
+    def __init__(self, enabled: bool = None, extensions: Iterable[str] = None,
+                 blocked_hosts: Iterable[str] = None, allowed_hosts: Iterable[str] = None,
+                 host_rules: Dict[str, List[str]] = None, metrics: bool = None):
+        self.enabled = config.RESOURCE_BLOCKING if enabled is None else enabled
+        self.extensions = list(config.BLOCKED_RESOURCE_EXTENSIONS if extensions is None else extensions)
+        self.blocked_hosts = list(config.BLOCKED_RESOURCE_HOSTS if blocked_hosts is None else blocked_hosts)
+        self.allowed_hosts = list(config.RESOURCE_ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts)
+        self.host_rules = dict(config.RESOURCE_HOST_PATTERNS if host_rules is None else host_rules)
+        self.metrics = config.RESOURCE_METRICS if metrics is None else metrics
+
+        self._extension_patterns = [p for extension in self.extensions for p in extension_patterns(extension)]
+
+        # Patterns last sent to each browser, so unchanged policies cost no DevTools call
+        self._applied = weakref.WeakKeyDictionary()
+        # Log entries of the current page already read by network_events()
+        self._pending = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+
+    def configure(self, options: "Options"):
+        """Chrome options the policy needs: the network performance log and no images."""
+        if self.metrics:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        if self.enabled:
+            # Content setting that Chrome does honour, on top of the URL patterns
+            prefs = options.experimental_options.setdefault('prefs', {})
+            prefs.setdefault('profile.managed_default_content_settings.images', 2)
+
+    def attach(self, driver: "webdriver.Chrome"):
+        """Enable the DevTools Network domain on a new browser."""
+        if self.enabled:
+            driver.execute_cdp_cmd('Network.enable', {})
+
+    def patterns_for(self, url: str) -> List[str]:
+        """URL patterns to block while loading a page."""
+        host = (urlparse(url).hostname or '').lower()
+        if not self.enabled or any(_host_matches(host, rule) for rule in self.allowed_hosts):
+            return []
+        patterns = list(self._extension_patterns)
+        for blocked in self.blocked_hosts:
+            # Never block the page's own site, even if it is on the list
+            if not (_host_matches(host, blocked) or _host_matches(blocked, host)):
+                patterns.extend(host_patterns(blocked))
+        for rule, extra in self.host_rules.items():
+            if _host_matches(host, rule):
+                patterns.extend(extra)
+        return patterns
+
+    def before_page(self, driver: "webdriver.Chrome", url: str):
+        """Apply the page's block list and discard network events from earlier pages."""
+        if self.enabled:
+            patterns = self.patterns_for(url)
+            with self._lock:
+                unchanged = self._applied.get(driver) == patterns
+            if not unchanged:
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+                with self._lock:
+                    self._applied[driver] = patterns
+        if self.metrics:
+            self._drain(driver)
+            with self._lock:
+                self._pending.pop(driver, None)
+
+    def network_events(self, driver: "webdriver.Chrome") -> Optional[List[Dict]]:
+        """Performance log entries since the last call, or None without metrics.
+
+        Entries read here still count towards the page's traffic in after_page().
+        """
+        if not self.metrics:
+            return None
+        entries = self._drain(driver)
+        with self._lock:
+            self._pending.setdefault(driver, []).extend(entries)
+        return entries
+
+    def after_page(self, driver: "webdriver.Chrome", url: str) -> Optional[PageTraffic]:
+        """Traffic of the page just loaded (None without metrics)."""
+        if not self.metrics:
+            return None
+        entries = self._drain(driver)
+        with self._lock:
+            entries = self._pending.pop(driver, []) + entries
+        traffic = self.traffic(entries)
+        with self._lock:
+            self.pages += 1
+            self.bytes += traffic.bytes
+            self.requests += traffic.requests
+            self.blocked += traffic.blocked
+        logger.debug(f"{url}: {traffic.bytes / 1024:.0f} KB in {traffic.requests} requests "
+                     f"({traffic.blocked} blocked)")
+        return traffic
+
+    @staticmethod
+    def _drain(driver: "webdriver.Chrome") -> List[Dict]:
+        try:
+            return driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Could not read the browser performance log: {e}")
+            return []
+
+    @staticmethod
+    def events(entries: Iterable[Dict]) -> Iterator[Tuple[str, Dict]]:
+        """(DevTools method, params) of every readable performance log entry."""
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            yield message.get('method'), message.get('params', {})
+
+    @classmethod
+    def traffic(cls, entries: Iterable[Dict]) -> PageTraffic:
+        """Tally performance log entries into bytes, requests and blocked requests."""
+        total = requests = blocked = 0
+        for method, params in cls.events(entries):
+            if method == 'Network.requestWillBeSent':
+                requests += 1
+            elif method == 'Network.loadingFinished':
+                total += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked += 1
+        return PageTraffic(total, requests, blocked)
+
+    def log_stats(self):
+        if not self.pages:
+            return
+        logger.info(f"Browser traffic: {self.bytes / (1024 * 1024):.1f} MB over {self.pages} pages "
+                    f"({self.bytes / self.pages / 1024:.0f} KB/page), {self.requests} requests, "
+                    f"{self.blocked} blocked")
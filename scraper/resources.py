@@ -0,0 +1,37 @@
+"""
+Process-wide heavy resources, created on first use instead of at import time
+"""
+
+import threading
+
+_lock = threading.Lock()
+_user_agent = None
+_chromedriver_path = None
+
+
+def get_user_agent():
+    """The shared fake_useragent.UserAgent instance."""
+    global _user_agent
+    with _lock:
+        if _user_agent is None:
+            from fake_useragent import UserAgent
+            _user_agent = UserAgent()
+    return _user_agent
+
+
+class LazyUserAgent:
+    """Stands in for UserAgent, loading it the first time a user agent string is needed."""
+
+    @property
+    def random(self) -> str:
+        return get_user_agent().random
+
+
+def get_chromedriver_path() -> str:
+    """Path to ChromeDriver, resolved (and downloaded if needed) once per process."""
+    global _chromedriver_path
+    with _lock:
+        if _chromedriver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
@@ -27,7 +27,11 @@ def main():
         
         # Create and run fast scraper
         scraper = FastInternshipScraper(max_workers=config.CONCURRENT_WORKERS)
-        scraper.scrape_all_fast()
+        incremental = "incremental" in sys.argv[1:]
+        if "async" in sys.argv[1:]:
+            scraper.scrape_all_async(incremental=incremental)
+        else:
+            scraper.scrape_all_fast(incremental=incremental)
         
         logger.info("Fast scraping completed successfully!")
         
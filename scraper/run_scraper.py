@@ -25,7 +25,7 @@ def main():
         
         # Create and run scraper
         scraper = InternshipScraper(db_path="internships.db")
-        scraper.scrape_all()
+        scraper.scrape_all(incremental="incremental" in sys.argv[1:])
         
         logger.info("Scraping completed successfully!")
         
@@ -1,81 +1,62 @@
-import json
 import time
 import random
-import requests
-import spacy
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-from sqlalchemy import create_engine, Column, String, Boolean, Integer, JSON, DateTime
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
-from fake_useragent import UserAgent
 import logging
-import re
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 import config
+from database import create_db_engine, ensure_schema, upsert_internships
+from fetcher import TieredFetcher
+from sync import IncrementalSync
+from feed import FeedStats, iter_recent_internships, stream_feed
+from keyword_extractor import KeywordExtractor
+from browser_pool import BrowserPool
+from resource_policy import ResourcePolicy
+from page_readiness import PageReadiness
+from page_extraction import extract_in_page
+from resources import LazyUserAgent, get_chromedriver_path
+
+# Selenium is only imported once a browser is actually needed
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 # Set up logging
 logging.basicConfig(level=getattr(logging, config.LOG_LEVEL), 
                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Database setup
-Base = declarative_base()
-
-class Internship(Base):
-    __tablename__ = 'internships'
-    
-    id = Column(String, primary_key=True)
-    active = Column(Boolean)
-    company_name = Column(String)
-    date_posted = Column(Integer)
-    date_updated = Column(Integer)
-    is_visible = Column(Boolean)
-    locations = Column(JSON)
-    season = Column(String)
-    sponsorship = Column(String)
-    title = Column(String)
-    url = Column(String)
-    keywords = Column(JSON)
-    xata = Column(JSON)
-    scraped_at = Column(DateTime, default=datetime.utcnow)
-
 class InternshipScraper:
     def __init__(self, db_path: str = None):
         """Initialize the scraper with database and NLP model."""
         # Database setup
         if db_path is None:
             db_path = config.DATABASE_PATH
-        self.engine = create_engine(f'sqlite:///{db_path}')
-        Base.metadata.create_all(self.engine)
+        self.engine = create_db_engine(db_path)
+        ensure_schema(self.engine)
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
+        self.sync = IncrementalSync(self.engine)
         
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            logger.info("Downloading spaCy model...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+        # Keyword matcher plus the spaCy components NLP_MODE asks for
+        self.keyword_extractor = KeywordExtractor()
+        
+        # User agent for requests (loaded on first use)
+        self.ua = LazyUserAgent()
         
-        # User agent for requests
-        self.ua = UserAgent()
+        # HTTP-first fetcher, Selenium is only used as a fallback
+        self.fetcher = TieredFetcher(ua=self.ua)
         
-        # Selenium setup
-        self.driver = None
+        # One pooled browser, health-checked and recycled like the fast scraper's,
+        # blocking the same images, fonts, media and trackers
+        self.resource_policy = ResourcePolicy()
+        self.readiness = PageReadiness(self.resource_policy)
+        self.browser_pool = BrowserPool(self.setup_selenium, size=1)
         
-    def setup_selenium(self) -> webdriver.Chrome:
+    def setup_selenium(self) -> "webdriver.Chrome":
         """Set up Selenium WebDriver with anti-detection measures."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         options = Options()
         if config.HEADLESS:
             options.add_argument('--headless')
@@ -89,9 +70,12 @@ class InternshipScraper:
         # Additional anti-detection measures
         options.add_argument('--disable-gpu')
         options.add_argument(f'--window-size={config.WINDOW_SIZE}')
+        self.resource_policy.configure(options)
+        self.readiness.configure(options)
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(get_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=options)
+        self.resource_policy.attach(driver)
         
         # Execute script to remove webdriver property
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -99,14 +83,9 @@ class InternshipScraper:
         return driver
     
     def fetch_internships(self, api_url: str = None) -> List[Dict[str, Any]]:
-        """Fetch internship data from the API."""
-        if api_url is None:
-            api_url = config.API_URL
+        """Fetch all internship data from the API."""
         try:
-            headers = {'User-Agent': self.ua.random}
-            response = requests.get(api_url, headers=headers)
-            response.raise_for_status()
-            internships = response.json()
+            internships = list(stream_feed(api_url, ua=self.ua, session=self.fetcher.session))
             logger.info(f"Fetched {len(internships)} internships from API")
             return internships
         except Exception as e:
@@ -114,49 +93,29 @@ class InternshipScraper:
             return []
     
     def scrape_job_description(self, url: str) -> Optional[str]:
+        """Scrape job description from a given URL, using Selenium only if plain HTTP falls short."""
+        return self.fetcher.fetch(url, self.scrape_with_selenium)
+    
+    def scrape_with_selenium(self, url: str) -> Optional[str]:
         """Scrape job description from a given URL using Selenium."""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        
+        driver = None
         try:
-            if not self.driver:
-                self.driver = self.setup_selenium()
-            
             # Add random delay to avoid rate limiting
             time.sleep(random.uniform(config.MIN_DELAY, config.MAX_DELAY))
             
-            self.driver.get(url)
-            
-            # Wait for page to load
-            wait = WebDriverWait(self.driver, config.PAGE_LOAD_TIMEOUT)
-            
-            # Try different selectors for job description
-            job_description = ""
+            driver = self.browser_pool.acquire()
+            self.resource_policy.before_page(driver, url)
+            driver.get(url)
             
-            # Try CSS selectors from config
-            for selector in config.JOB_DESCRIPTION_SELECTORS:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.text.strip()
-                        if len(text) > len(job_description) and len(text) > 100:
-                            job_description = text
-                except:
-                    continue
-                
-                if job_description and len(job_description) > 500:
-                    break
+            # Wait for the description to render (or the page to settle)
+            self.readiness.wait(driver, url)
             
-            # If no specific selector worked, get all text from body
-            if not job_description:
-                try:
-                    body = self.driver.find_element(By.TAG_NAME, "body")
-                    job_description = body.text
-                except:
-                    pass
+            # Best block over all selectors (or the body text), in one round trip
+            job_description = extract_in_page(driver).text
             
-            # Clean up the description
-            if job_description:
-                # Remove excessive whitespace
-                job_description = re.sub(r'\s+', ' ', job_description)
-                job_description = job_description.strip()
+            self.resource_policy.after_page(driver, url)
             
             return job_description if job_description else None
             
@@ -169,132 +128,154 @@ class InternshipScraper:
         except Exception as e:
             logger.error(f"Error scraping {url}: {e}")
             return None
+        finally:
+            if driver is not None:
+                self.browser_pool.release(driver)
     
     def extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text using spaCy."""
+        """Extract keywords from text."""
         if not text:
             return []
-        
-        # Process text with spaCy
-        doc = self.nlp(text.lower())
-        
-        # Keywords to look for from config
-        tech_keywords = config.TECH_KEYWORDS
-        
-        found_keywords = set()
-        
-        # Check for exact matches and partial matches
-        text_lower = text.lower()
-        for keyword in tech_keywords:
-            if keyword in text_lower:
-                found_keywords.add(keyword)
-        
-        # Extract noun phrases that might be technical terms
-        for chunk in doc.noun_chunks:
-            chunk_text = chunk.text.strip()
-            if len(chunk_text) > 2 and chunk_text in tech_keywords:
-                found_keywords.add(chunk_text)
-        
-        # Extract named entities that might be technologies
-        for ent in doc.ents:
-            if ent.label_ in ["ORG", "PRODUCT", "GPE"] and len(ent.text) > 2:
-                ent_lower = ent.text.lower()
-                if any(tech in ent_lower for tech in ["software", "framework", "platform", "system"]):
-                    found_keywords.add(ent_lower)
-        
-        return list(found_keywords)
+        return self.keyword_extractor.extract(text)
+    
+    def extract_keywords_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract keywords from many texts, running spaCy over them as one batch."""
+        return self.keyword_extractor.extract_many(texts)
+    
+    def add_keywords(self, internships: List[Dict[str, Any]], descriptions: List[Optional[str]]):
+        """Set keywords on a batch of internships, extracting every new description in one NLP pass."""
+        described = [(internship['url'], description)
+                     for internship, description in zip(internships, descriptions) if description]
+        keywords = iter(self.fetcher.keywords_for_many(described, self.extract_keywords_batch))
+        for internship, description in zip(internships, descriptions):
+            internship['keywords'] = next(keywords) if description else []
+        if described:
+            logger.info(f"Extracted keywords for {len(described)} descriptions")
     
     def save_internship(self, internship_data: Dict[str, Any]):
-        """Save or update internship in the database."""
+        """Save or update a single internship in the database."""
         try:
-            existing = self.session.query(Internship).filter_by(id=internship_data['id']).first()
-            
-            if existing:
-                # Update existing record
-                for key, value in internship_data.items():
-                    setattr(existing, key, value)
-                existing.scraped_at = datetime.utcnow()
-            else:
-                # Create new record
-                internship = Internship(**internship_data)
-                self.session.add(internship)
-            
-            self.session.commit()
+            upsert_internships(self.engine, [internship_data])
             logger.info(f"Saved internship: {internship_data['company_name']} - {internship_data['title']}")
-            
         except Exception as e:
             logger.error(f"Error saving internship: {e}")
-            self.session.rollback()
     
-    def scrape_all(self):
-        """Main method to scrape all internships."""
-        logger.info("Starting internship scraper...")
-        
-        # Fetch internships from API
-        internships = self.fetch_internships()
-        
+    def save_internships_batch(self, internships: List[Dict[str, Any]]):
+        """Save or update many internships with one set-based upsert."""
         if not internships:
-            logger.error("No internships fetched from API")
             return
+        try:
+            upsert_internships(self.engine, internships)
+            logger.info(f"Saved batch of {len(internships)} internships")
+        except Exception as e:
+            logger.error(f"Error saving batch: {e}")
+    
+    def fetch_filtered_internships(self, incremental: bool = False) -> List[Dict[str, Any]]:
+        """Fetch internships from the API and keep those that meet the date criteria.
         
-        # Filter internships by date (only May 2025 and newer)
-        filtered_internships = []
-        for internship in internships:
-            date_posted = internship.get('date_posted', 0)
-            date_updated = internship.get('date_updated', 0)
-            # Use the more recent of date_posted or date_updated
-            latest_date = max(date_posted, date_updated)
-            
-            if latest_date >= config.MIN_DATE_TIMESTAMP:
-                filtered_internships.append(internship)
+        In incremental mode only new or changed postings are returned, and postings
+        that dropped out of the feed are marked inactive.
+        """
+        # Stream the feed so only postings that pass the date filter are kept in memory
+        stats = FeedStats(collect_ids=incremental)
+        try:
+            filtered_internships = list(iter_recent_internships(stats=stats, ua=self.ua, session=self.fetcher.session))
+        except Exception as e:
+            logger.error(f"Error fetching internships: {e}")
+            return []
+        
+        if not stats.total:
+            logger.error("No internships fetched from API")
+            return []
         
-        logger.info(f"Total internships from API: {len(internships)}")
+        logger.info(f"Total internships from API: {stats.total}")
         logger.info(f"Internships from May 2025 or newer: {len(filtered_internships)}")
         
+        if incremental:
+            self.sync.deactivate_missing(stats.ids)
+            filtered_internships = self.sync.plan(filtered_internships)
+            self.feed_high_water_mark = stats.newest
+        
         if not filtered_internships:
             logger.warning("No internships found that meet the date criteria (May 2025 or newer)")
+        
+        return filtered_internships
+    
+    def scrape_all(self, incremental: bool = False):
+        """Main method to scrape all internships (or only new/changed ones if incremental)."""
+        logger.info("Starting internship scraper...")
+        
+        filtered_internships = self.fetch_filtered_internships(incremental)
+        if not filtered_internships:
             return
         
+        self.browser_pool.prewarm()
+        
         # Process each filtered internship
+        pending = []
+        descriptions = []
+        
+        def flush():
+            # A failed batch is logged and dropped, never carried into the next one
+            if not pending:
+                return
+            try:
+                self.add_keywords(pending, descriptions)
+            except Exception as e:
+                logger.error(f"Error extracting keywords: {e}")
+                for internship in pending:
+                    internship['keywords'] = []
+            try:
+                self.save_internships_batch(pending)
+            except Exception as e:
+                logger.error(f"Error saving batch: {e}")
+            finally:
+                pending.clear()
+                descriptions.clear()
+        
         for i, internship in enumerate(filtered_internships):
             try:
                 logger.info(f"Processing {i+1}/{len(filtered_internships)}: {internship['company_name']} - {internship['title']}")
                 
                 # Scrape job description
                 job_description = self.scrape_job_description(internship['url'])
-                
-                if job_description:
-                    # Extract keywords
-                    keywords = self.extract_keywords(job_description)
-                    internship['keywords'] = keywords
-                    logger.info(f"Found {len(keywords)} keywords")
-                else:
-                    internship['keywords'] = []
+                if not job_description:
                     logger.warning(f"Could not scrape description for {internship['url']}")
                 
-                # Save to database
-                self.save_internship(internship)
-                
-                # Random delay between requests
-                if i < len(filtered_internships) - 1:
-                    delay = random.uniform(config.MIN_DELAY, config.MAX_DELAY)
-                    logger.info(f"Waiting {delay:.2f} seconds before next request...")
-                    time.sleep(delay)
-                
             except Exception as e:
                 logger.error(f"Error processing internship {internship.get('id', 'unknown')}: {e}")
                 continue
+            
+            # Extract keywords and save to database in batches
+            pending.append(internship)
+            descriptions.append(job_description)
+            if len(pending) >= config.SAVE_BATCH_SIZE:
+                flush()
+            
+            # Random delay between requests
+            if i < len(filtered_internships) - 1:
+                delay = random.uniform(config.MIN_DELAY, config.MAX_DELAY)
+                logger.info(f"Waiting {delay:.2f} seconds before next request...")
+                time.sleep(delay)
+        
+        flush()
         
         # Clean up
-        if self.driver:
-            self.driver.quit()
+        self.browser_pool.clear()
+        
+        if incremental:
+            self.sync.finish(self.feed_high_water_mark)
         
+        self.fetcher.log_stats()
+        self.browser_pool.log_stats()
+        self.resource_policy.log_stats()
+        self.readiness.log_stats()
         logger.info("Scraping completed!")
     
     def close(self):
         """Clean up resources."""
-        if self.driver:
-            self.driver.quit()
+        self.browser_pool.close()
+        self.fetcher.close()
         self.session.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Skill queries over the internship_skills inverted index
+
+Usage:
+    python skill_index.py python kubernetes            # Postings needing python AND kubernetes
+    python skill_index.py python --any react vue --not java --season Summer --sponsorship "Offers Sponsorship"
+    python skill_index.py rebuild                      # Rebuild the index from skill_ids
+"""
+
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+from sqlalchemy import and_, exists, select
+
+from database import table_version
+from models import Internship, InternshipSkill
+from taxonomy import SKILLS_BY_ID, lookup
+
+SkillRef = Union[int, str]
+
+
+def resolve_skills(skills: Iterable[SkillRef]) -> List[int]:
+    """Taxonomy ids for skill names, aliases or ids."""
+    ids = []
+    for skill in skills or []:
+        if isinstance(skill, int):
+            if skill not in SKILLS_BY_ID:
+                raise ValueError(f"Unknown skill id: {skill}")
+            ids.append(skill)
+        else:
+            match = lookup(skill)
+            if match is None:
+                raise ValueError(f"Unknown skill: {skill!r}")
+            ids.append(match.id)
+    return list(dict.fromkeys(ids))
+
+
+def build_query(all_of: Iterable[SkillRef] = (), any_of: Iterable[SkillRef] = (),
+                none_of: Iterable[SkillRef] = (), season: Optional[str] = None,
+                sponsorship: Optional[str] = None, active_only: bool = True):
+    """SELECT of matching internship ids: every skill in all_of, at least one of any_of, none of none_of.
+
+    The query is driven from the index rows of the first all_of skill (or the any_of
+    skills) and every other condition is a primary-key probe, so its cost follows the
+    size of that posting list - list the rarest skill first. For many queries against
+    the same data, use SkillIndex instead.
+    """
+    all_of, any_of, none_of = resolve_skills(all_of), resolve_skills(any_of), resolve_skills(none_of)
+    internships = Internship.__table__
+    skills = InternshipSkill.__table__
+
+    def has_skill(internship_id, skill_ids):
+        probe = skills.alias()
+        return exists().where(and_(probe.c.internship_id == internship_id, probe.c.skill_id.in_(skill_ids)))
+
+    if all_of:
+        driver = skills.alias('driver')
+        internship_id = driver.c.internship_id
+        query = select(internship_id).where(driver.c.skill_id == all_of[0])
+        for skill_id in all_of[1:]:
+            query = query.where(has_skill(internship_id, [skill_id]))
+        if any_of:
+            query = query.where(has_skill(internship_id, any_of))
+    elif any_of:
+        driver = skills.alias('driver')
+        internship_id = driver.c.internship_id
+        query = select(internship_id).where(driver.c.skill_id.in_(any_of)).distinct()
+    else:
+        internship_id = internships.c.id
+        query = select(internship_id)
+
+    if none_of:
+        query = query.where(~has_skill(internship_id, none_of))
+
+    if season or sponsorship or active_only:
+        if internship_id is not internships.c.id:
+            query = query.join(internships, internships.c.id == internship_id)
+        if season:
+            query = query.where(internships.c.season == season)
+        if sponsorship:
+            query = query.where(internships.c.sponsorship == sponsorship)
+        if active_only:
+            query = query.where(internships.c.active == True)
+
+    return query
+
+
+def find_internships(engine, all_of: Iterable[SkillRef] = (), any_of: Iterable[SkillRef] = (),
+                     none_of: Iterable[SkillRef] = (), season: Optional[str] = None,
+                     sponsorship: Optional[str] = None, active_only: bool = True,
+                     limit: Optional[int] = None) -> List[str]:
+    """Ids of internships matching a skill query (see build_query)."""
+    query = build_query(all_of, any_of, none_of, season, sponsorship, active_only)
+    if limit is not None:
+        query = query.limit(limit)
+    with engine.connect() as conn:
+        return list(conn.execute(query).scalars())
+
+
+class SkillIndex:
+    """In-memory bitmaps loaded from the skill index, for sub-millisecond repeated queries.
+
+    Every posting gets a bit position; each skill, season and sponsorship value is a
+    packed bitmap, so a query is a handful of vectorized AND/OR/NOT operations. Call
+    refresh() to pick up writes made since the index was loaded.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.version = None
+        self.load()
+
+    def load(self):
+        internships = Internship.__table__
+        skills = InternshipSkill.__table__
+        with self.engine.connect() as conn:
+            self.version = table_version(conn)
+            rows = conn.execute(select(internships.c.id, internships.c.active, internships.c.season,
+                                       internships.c.sponsorship).order_by(internships.c.id)).all()
+            positions = {row.id: i for i, row in enumerate(rows)}
+
+            members: Dict[int, List[int]] = {}
+            for skill_id, internship_id in conn.execute(select(skills.c.skill_id, skills.c.internship_id)):
+                position = positions.get(internship_id)
+                if position is not None:
+                    members.setdefault(skill_id, []).append(position)
+
+        self.size = len(rows)
+        self.ids = np.array([row.id for row in rows], dtype=object)
+        self.everything = self._bitmap(range(self.size))
+        self.active = self._bitmap(i for i, row in enumerate(rows) if row.active)
+        self.seasons = self._group(rows, 'season')
+        self.sponsorships = self._group(rows, 'sponsorship')
+        self.skills = {skill_id: self._bitmap(found) for skill_id, found in members.items()}
+        self.empty = self._bitmap(())
+
+    def _bitmap(self, positions: Iterable[int]) -> np.ndarray:
+        bits = np.zeros(self.size, dtype=bool)
+        bits[np.fromiter(positions, dtype=np.int64)] = True
+        return np.packbits(bits)
+
+    def _group(self, rows, column: str) -> Dict[str, np.ndarray]:
+        groups: Dict[str, List[int]] = {}
+        for i, row in enumerate(rows):
+            groups.setdefault(getattr(row, column), []).append(i)
+        return {value: self._bitmap(found) for value, found in groups.items()}
+
+    def refresh(self) -> bool:
+        """Reload if the internships table changed since the last load."""
+        with self.engine.connect() as conn:
+            if table_version(conn) == self.version:
+                return False
+        self.load()
+        return True
+
+    def query(self, all_of: Iterable[SkillRef] = (), any_of: Iterable[SkillRef] = (),
+              none_of: Iterable[SkillRef] = (), season: Optional[str] = None,
+              sponsorship: Optional[str] = None, active_only: bool = True) -> List[str]:
+        """Same semantics as find_internships, answered from memory."""
+        all_of, any_of, none_of = resolve_skills(all_of), resolve_skills(any_of), resolve_skills(none_of)
+
+        mask = self.active if active_only else self.everything
+        for skill_id in all_of:
+            mask = mask & self.skills.get(skill_id, self.empty)
+        if any_of:
+            mask = mask & np.bitwise_or.reduce([self.skills.get(s, self.empty) for s in any_of])
+        for skill_id in none_of:
+            mask = mask & ~self.skills.get(skill_id, self.empty)
+        if season:
+            mask = mask & self.seasons.get(season, self.empty)
+        if sponsorship:
+            mask = mask & self.sponsorships.get(sponsorship, self.empty)
+
+        hits = np.flatnonzero(np.unpackbits(mask, count=self.size))
+        return self.ids[hits].tolist()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import config
+    from database import open_database, rebuild_skill_index
+
+    parser = argparse.ArgumentParser(description="Find internships by skill")
+    parser.add_argument("skills", nargs="*", help="Skills every posting must have (or 'rebuild')")
+    parser.add_argument("--any", nargs="+", default=[], help="At least one of these skills")
+    parser.add_argument("--not", dest="none", nargs="+", default=[], help="None of these skills")
+    parser.add_argument("--season")
+    parser.add_argument("--sponsorship")
+    parser.add_argument("--include-inactive", action="store_true")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rebuild = args.skills == ["rebuild"]
+    engine = open_database(config.DATABASE_PATH, readonly=not rebuild)
+
+    if rebuild:
+        rebuild_skill_index(engine)
+    else:
+        start = time.perf_counter()
+        ids = find_internships(engine, args.skills, args.any, args.none, args.season, args.sponsorship,
+                               active_only=not args.include_inactive)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{len(ids)} matching internships ({elapsed:.2f} ms)")
+
+        with engine.connect() as conn:
+            table = Internship.__table__
+            rows = conn.execute(select(table.c.company_name, table.c.title, table.c.url)
+                                .where(table.c.id.in_(ids[:args.limit]))).all()
+        for row in rows:
+            print(f"  - {row.company_name} - {row.title}")
+            print(f"    {row.url}")
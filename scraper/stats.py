@@ -3,19 +3,38 @@
 Display statistics about scraped internships
 """
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import String, func, select, true, type_coerce
 from sqlalchemy.orm import sessionmaker
-from scraper import Internship
+from models import Internship, InternshipSkill
+from database import open_database, json_array_elements
+from cooccurrence import load_cooccurrence
+from taxonomy import CATEGORIES, SKILLS_BY_ID
 import config
-from collections import Counter
-import json
+
+def top_json_values(session, column, limit: int):
+    """Most common elements of a JSON array column, counted in the database."""
+    elements = json_array_elements(column, session.get_bind().dialect.name)
+    count = func.count().label('count')
+    query = select(elements.c.value, count).select_from(Internship.__table__).join(elements, true())\
+        .group_by(elements.c.value)\
+        .order_by(count.desc(), elements.c.value)\
+        .limit(limit)
+    return session.execute(query).all()
+
+def skill_counts(session):
+    """Number of postings per taxonomy skill id, from the skill index."""
+    skills = InternshipSkill.__table__
+    query = select(skills.c.skill_id, func.count())\
+        .group_by(skills.c.skill_id)\
+        .order_by(func.count().desc(), skills.c.skill_id)
+    return session.execute(query).all()
 
 def display_stats(db_path: str = None):
     """Display statistics about the scraped internships."""
     if db_path is None:
         db_path = config.DATABASE_PATH
         
-    engine = create_engine(f'sqlite:///{db_path}')
+    engine = open_database(db_path)
     Session = sessionmaker(bind=engine)
     session = Session()
     
@@ -32,9 +51,10 @@ def display_stats(db_path: str = None):
             return
         
         # Internships with keywords
+        keywords = type_coerce(Internship.keywords, String)
         with_keywords = session.query(func.count(Internship.id)).filter(
-            Internship.keywords != None,
-            Internship.keywords != '[]'
+            keywords != None,
+            keywords != '[]'
         ).scalar()
         print(f"Internships with keywords: {with_keywords} ({with_keywords/total*100:.1f}%)")
         
@@ -49,15 +69,8 @@ def display_stats(db_path: str = None):
             print(f"  {i}. {company}: {count} position(s)")
         
         # Locations
-        all_locations = []
-        internships = session.query(Internship.locations).all()
-        for (locations,) in internships:
-            if locations:
-                all_locations.extend(locations)
-        
-        location_counts = Counter(all_locations)
         print(f"\nTop 10 Locations:")
-        for i, (location, count) in enumerate(location_counts.most_common(10), 1):
+        for i, (location, count) in enumerate(top_json_values(session, Internship.locations, 10), 1):
             print(f"  {i}. {location}: {count} position(s)")
         
         # Seasons
@@ -79,22 +92,10 @@ def display_stats(db_path: str = None):
             print(f"  {sponsorship}: {count} position(s)")
         
         # Most common keywords
-        all_keywords = []
-        keyword_internships = session.query(Internship.keywords).filter(
-            Internship.keywords != None,
-            Internship.keywords != '[]'
-        ).all()
-        
-        for (keywords,) in keyword_internships:
-            if keywords:
-                if isinstance(keywords, str):
-                    keywords = json.loads(keywords)
-                all_keywords.extend(keywords)
-        
-        if all_keywords:
-            keyword_counts = Counter(all_keywords)
+        top_keywords = top_json_values(session, Internship.keywords, 20)
+        if top_keywords:
             print(f"\nTop 20 Keywords:")
-            for i, (keyword, count) in enumerate(keyword_counts.most_common(20), 1):
+            for i, (keyword, count) in enumerate(top_keywords, 1):
                 print(f"  {i}. {keyword}: {count} occurrences")
         
         # Recent scrapes
@@ -115,7 +116,7 @@ def keyword_analysis(db_path: str = None):
     if db_path is None:
         db_path = config.DATABASE_PATH
         
-    engine = create_engine(f'sqlite:///{db_path}')
+    engine = open_database(db_path)
     Session = sessionmaker(bind=engine)
     session = Session()
     
@@ -124,56 +125,32 @@ def keyword_analysis(db_path: str = None):
         print(f"KEYWORD COMBINATION ANALYSIS")
         print(f"{'='*50}")
         
-        # Common keyword pairs
-        keyword_pairs = Counter()
-        
-        internships = session.query(Internship.keywords).filter(
-            Internship.keywords != None,
-            Internship.keywords != '[]'
-        ).all()
-        
-        for (keywords,) in internships:
-            if keywords:
-                if isinstance(keywords, str):
-                    keywords = json.loads(keywords)
-                # Create pairs
-                for i in range(len(keywords)):
-                    for j in range(i+1, len(keywords)):
-                        pair = tuple(sorted([keywords[i], keywords[j]]))
-                        keyword_pairs[pair] += 1
-        
+        # Common skill pairs, from the cached co-occurrence matrix
+        cooccurrence = load_cooccurrence(engine)
         print(f"\nTop 15 Keyword Pairs:")
-        for i, (pair, count) in enumerate(keyword_pairs.most_common(15), 1):
+        for i, (first, second, count, _) in enumerate(cooccurrence.top_pairs(15), 1):
+            pair = sorted([SKILLS_BY_ID[first].name, SKILLS_BY_ID[second].name])
             print(f"  {i}. {pair[0]} + {pair[1]}: {count} occurrences")
         
-        # Skills by category
-        categories = {
-            "Programming Languages": ["python", "java", "javascript", "c++", "go", "rust", "ruby", "php"],
-            "Frontend": ["react", "angular", "vue", "html", "css", "javascript", "typescript"],
-            "Backend": ["node.js", "django", "flask", "spring", "express", "rails"],
-            "Data/ML": ["machine learning", "data science", "tensorflow", "pytorch", "pandas", "numpy"],
-            "Cloud": ["aws", "azure", "gcp", "docker", "kubernetes"],
-            "Databases": ["sql", "postgresql", "mysql", "mongodb", "redis"]
-        }
+        # Pairs that appear together far more often than their popularity predicts
+        print(f"\nTop 10 Related Pairs (by lift, in at least 10 postings):")
+        for i, (first, second, count, lift) in enumerate(cooccurrence.top_pairs(10, 'lift', min_count=10), 1):
+            pair = sorted([SKILLS_BY_ID[first].name, SKILLS_BY_ID[second].name])
+            print(f"  {i}. {pair[0]} + {pair[1]}: {lift:.1f}x ({count} postings)")
         
+        # Skills by category, counted by taxonomy id so aliases aren't double-counted
         print(f"\nSkills by Category:")
-        all_keywords = []
-        for (keywords,) in internships:
-            if keywords:
-                if isinstance(keywords, str):
-                    keywords = json.loads(keywords)
-                all_keywords.extend(keywords)
-        
-        keyword_counts = Counter(all_keywords)
-        
-        for category, skills in categories.items():
-            category_total = sum(keyword_counts[skill] for skill in skills if skill in keyword_counts)
-            if category_total > 0:
+        by_category = {category: [] for category in CATEGORIES}
+        for skill_id, count in skill_counts(session):
+            skill = SKILLS_BY_ID.get(skill_id)
+            if skill:
+                by_category[skill.category].append((skill.name, count))
+        
+        for category, skills in by_category.items():
+            if skills:
                 print(f"\n{category}:")
-                for skill in skills:
-                    if skill in keyword_counts:
-                        count = keyword_counts[skill]
-                        print(f"  - {skill}: {count}")
+                for skill, count in skills[:10]:
+                    print(f"  - {skill}: {count}")
         
     finally:
         session.close()
@@ -37,7 +37,7 @@ def save_progress(progress):
     with open(PROGRESS_FILE, 'w') as f:
         json.dump(progress, f, indent=2)
 
-def super_fast_scrape_with_resume():
+def super_fast_scrape_with_resume(incremental: bool = False):
     """Run the super fast scraper with resume capability."""
     logger.info("Starting SUPER FAST batch scraper with resume capability...")
     
@@ -45,36 +45,23 @@ def super_fast_scrape_with_resume():
     progress = load_progress()
     processed_ids = set(progress["processed_ids"])
     
-    if processed_ids:
+    if processed_ids and not incremental:
         logger.info(f"Resuming from previous run. Already processed: {len(processed_ids)} internships")
     
     scraper = FastInternshipScraper(max_workers=config.CONCURRENT_WORKERS)
     
     try:
-        # Fetch all internships
-        internships = scraper.fetch_internships()
-        
-        if not internships:
-            logger.error("No internships fetched from API")
-            return
-        
-        # Filter internships by date (only May 2025 and newer)
-        date_filtered = []
-        for internship in internships:
-            date_posted = internship.get('date_posted', 0)
-            date_updated = internship.get('date_updated', 0)
-            latest_date = max(date_posted, date_updated)
+        if incremental:
+            # The database records what is up to date, so the progress file is not consulted
+            remaining = scraper.fetch_filtered_internships(incremental=True)
+        else:
+            date_filtered = scraper.fetch_filtered_internships()
             
-            if latest_date >= config.MIN_DATE_TIMESTAMP:
-                date_filtered.append(internship)
-        
-        # Filter out already processed internships
-        remaining = [i for i in date_filtered if i['id'] not in processed_ids]
-        
-        logger.info(f"Total internships: {len(internships)}")
-        logger.info(f"Date filtered (May 2025+): {len(date_filtered)}")
-        logger.info(f"Already processed: {len(processed_ids)}")
-        logger.info(f"Remaining to process: {len(remaining)}")
+            # Filter out already processed internships
+            remaining = [i for i in date_filtered if i['id'] not in processed_ids]
+            
+            logger.info(f"Already processed: {len(processed_ids)}")
+            logger.info(f"Remaining to process: {len(remaining)}")
         
         if not remaining:
             logger.info("All internships have been processed!")
@@ -116,6 +103,10 @@ def super_fast_scrape_with_resume():
                 logger.error(f"Error processing batch {batch_num + 1}: {e}")
                 continue
         
+        if incremental:
+            scraper.sync.finish(scraper.feed_high_water_mark)
+        
+        scraper.fetcher.log_stats()
         logger.info("Super fast batch scraping completed!")
         
     except KeyboardInterrupt:
@@ -136,6 +127,8 @@ def reset_progress():
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "reset":
         reset_progress()
+    elif len(sys.argv) > 1 and sys.argv[1] == "incremental":
+        super_fast_scrape_with_resume(incremental=True)
     else:
         super_fast_scrape_with_resume()
 
@@ -0,0 +1,92 @@
+"""
+Incremental sync: only scrape postings that are new or changed since the last run
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import column, select, table
+
+from database import bump_data_version, get_metadata, set_metadata
+from feed import latest_timestamp
+from models import SyncMetadata
+
+logger = logging.getLogger(__name__)
+
+# Lightweight handle on the internships table (only the columns compared here)
+internships = table('internships', column('id'), column('active'), column('date_updated'), column('row_version'))
+
+HIGH_WATER_MARK = 'high_water_mark'
+LAST_SYNC_AT = 'last_sync_at'
+
+# SQLite limits bound parameters per statement
+UPDATE_CHUNK_SIZE = 500
+
+
+class IncrementalSync:
+    """Compare the feed with the internships table and keep sync state in sync_metadata."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        SyncMetadata.__table__.create(engine, checkfirst=True)
+
+    def get(self, key: str, default: str = None) -> str:
+        return get_metadata(self.engine, key, default)
+
+    def set(self, key: str, value: str):
+        set_metadata(self.engine, key, value)
+
+    @property
+    def high_water_mark(self) -> int:
+        return int(self.get(HIGH_WATER_MARK, '0'))
+
+    def plan(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep only candidates that are not stored yet or whose date_updated/active changed."""
+        with self.engine.connect() as conn:
+            stored = {
+                row.id: (row.date_updated, row.active)
+                for row in conn.execute(select(internships.c.id, internships.c.date_updated, internships.c.active))
+            }
+
+        changed = []
+        new_count = 0
+        for internship in candidates:
+            previous = stored.get(internship['id'])
+            if previous is None:
+                new_count += 1
+                changed.append(internship)
+            elif previous != (internship.get('date_updated'), internship.get('active')):
+                changed.append(internship)
+
+        high_water_mark = self.high_water_mark
+        past_mark = sum(1 for i in candidates if latest_timestamp(i) > high_water_mark)
+        logger.info(f"Incremental sync: {new_count} new, {len(changed) - new_count} changed, "
+                    f"{len(candidates) - len(changed)} unchanged "
+                    f"({past_mark} updated since last high-water mark {high_water_mark})")
+        return changed
+
+    def deactivate_missing(self, feed_ids: Iterable[str]) -> int:
+        """Mark active postings that are no longer in the feed as inactive, touching nothing else."""
+        feed_ids = set(feed_ids)
+        with self.engine.begin() as conn:
+            active_ids = [
+                row.id for row in conn.execute(select(internships.c.id).where(internships.c.active == True))
+            ]
+            missing = [i for i in active_ids if i not in feed_ids]
+            # Readers that cache the table (skill index, scorers, co-occurrence) must reload,
+            # and incremental exports must pick the deactivated rows up again
+            version = bump_data_version(conn) if missing else None
+            for start in range(0, len(missing), UPDATE_CHUNK_SIZE):
+                chunk = missing[start:start + UPDATE_CHUNK_SIZE]
+                conn.execute(internships.update().where(internships.c.id.in_(chunk))
+                             .values(active=False, row_version=version))
+
+        if missing:
+            logger.info(f"Marked {len(missing)} postings missing from the feed as inactive")
+        return len(missing)
+
+    def finish(self, newest_timestamp: int):
+        """Advance the high-water mark after a successful sync."""
+        self.set(HIGH_WATER_MARK, str(max(newest_timestamp, self.high_water_mark)))
+        self.set(LAST_SYNC_AT, datetime.utcnow().isoformat())
@@ -0,0 +1,74 @@
+"""
+Skill taxonomy lookups: canonical skills, their aliases, categories and stable integer ids
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import config
+
+
+class Skill(NamedTuple):
+    id: int
+    name: str
+    category: str
+    aliases: Tuple[str, ...]
+
+
+def _build(taxonomy) -> Tuple[Dict[int, Skill], Dict[str, Skill]]:
+    by_id = {}
+    by_name = {}
+    for skill_id, name, category, aliases in taxonomy:
+        skill = Skill(skill_id, name, category, tuple(aliases))
+        if skill_id in by_id:
+            raise ValueError(f"Duplicate skill id {skill_id} in SKILL_TAXONOMY")
+        by_id[skill_id] = skill
+        for alias in (name, *aliases):
+            if alias in by_name:
+                raise ValueError(f"{alias!r} is listed under both {by_name[alias].name!r} and {name!r}")
+            by_name[alias] = skill
+    return by_id, by_name
+
+
+SKILLS_BY_ID, SKILLS_BY_NAME = _build(config.SKILL_TAXONOMY)
+
+# Changes whenever the taxonomy or the matcher's keyword rules do, so cached keywords can be invalidated
+TAXONOMY_VERSION = hashlib.sha256(
+    repr((config.SKILL_TAXONOMY, config.HYPHEN_BOUNDED_KEYWORDS)).encode('utf-8')).hexdigest()[:16]
+
+# Categories in taxonomy order
+CATEGORIES = list(dict.fromkeys(skill.category for skill in SKILLS_BY_ID.values()))
+
+
+def lookup(name: str) -> Optional[Skill]:
+    """The skill a canonical name or alias belongs to."""
+    return SKILLS_BY_NAME.get(name.lower().strip())
+
+
+def canonical_name(name: str) -> str:
+    """Canonical form of a keyword; names outside the taxonomy are returned lower-cased."""
+    skill = lookup(name)
+    return skill.name if skill else name.lower().strip()
+
+
+def normalize_keywords(names: Iterable[str]) -> Tuple[List[str], List[int]]:
+    """Deduplicate keywords by canonical form.
+
+    Returns (display names, sorted skill ids). Names outside the taxonomy (e.g. named
+    entities found by spaCy) are kept for display but have no id.
+    """
+    display = []
+    ids = set()
+    for name in names or []:
+        canonical = canonical_name(name)
+        if canonical not in display:
+            display.append(canonical)
+        skill = SKILLS_BY_NAME.get(canonical)
+        if skill:
+            ids.add(skill.id)
+    return display, sorted(ids)
+
+
+def skill_names(skill_ids: Iterable[int]) -> List[str]:
+    """Display names for skill ids, skipping ids no longer in the taxonomy."""
+    return [SKILLS_BY_ID[i].name for i in skill_ids if i in SKILLS_BY_ID]
@@ -3,25 +3,29 @@
 Test script to verify API access and basic functionality
 """
 
-import requests
 import json
 from scraper import InternshipScraper
+from ats_extractors import find_extractor, load_fixtures
+from feed import stream_feed
 
 def test_api():
     """Test if the API is accessible and returns data."""
     print("Testing API access...")
     
     try:
-        response = requests.get("https://jobs.cvrve.me/api/intern")
-        response.raise_for_status()
+        total = 0
+        first = None
+        for internship in stream_feed():
+            if first is None:
+                first = internship
+            total += 1
         
-        data = response.json()
         print(f"✓ API is accessible")
-        print(f"✓ Found {len(data)} internships")
+        print(f"✓ Found {total} internships")
         
-        if data:
+        if first:
             print(f"\nFirst internship:")
-            print(json.dumps(data[0], indent=2))
+            print(json.dumps(first, indent=2))
         
         return True
         
@@ -51,6 +55,36 @@ def test_keyword_extraction():
     
     return len(keywords) > 0
 
+def test_ats_extractors():
+    """Test ATS extractors offline against recorded API responses."""
+    print("\n\nTesting ATS extractors (offline fixtures)...")
+    
+    all_ok = True
+    for fixture in load_fixtures():
+        found = find_extractor(fixture['url'])
+        if not found:
+            print(f"✗ {fixture['name']}: no extractor matched {fixture['url']}")
+            all_ok = False
+            continue
+        
+        extractor, match = found
+        api_url = extractor.api_url(match)
+        description = extractor.parse(fixture['response'], match) or ""
+        
+        problems = []
+        if api_url != fixture['api_url']:
+            problems.append(f"API URL {api_url}")
+        problems.extend(f"missing '{text}'" for text in fixture.get('expected_contains', []) if text not in description)
+        problems.extend(f"unexpected '{text}'" for text in fixture.get('expected_excludes', []) if text in description)
+        
+        if problems:
+            print(f"✗ {fixture['name']}: {'; '.join(problems)}")
+            all_ok = False
+        else:
+            print(f"✓ {extractor.name}: {len(description)} characters")
+    
+    return all_ok
+
 def test_single_scrape():
     """Test scraping a single URL."""
     print("\n\nTesting single URL scrape...")
@@ -81,9 +115,13 @@ if __name__ == "__main__":
     # Test keyword extraction
     keywords_ok = test_keyword_extraction()
     
+    # Test ATS extractors against recorded responses
+    ats_ok = test_ats_extractors()
+    
     # Test URL scraping
     test_single_scrape()
     
     print("\n\nTest summary:")
     print(f"API access: {'✓ PASS' if api_ok else '✗ FAIL'}")
     print(f"Keyword extraction: {'✓ PASS' if keywords_ok else '✗ FAIL'}")
+    print(f"ATS extractors: {'✓ PASS' if ats_ok else '✗ FAIL'}")
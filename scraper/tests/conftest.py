@@ -0,0 +1,11 @@
+import pytest
+
+from database import create_db_engine, ensure_schema
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(str(tmp_path / 'internships.db'))
+    ensure_schema(engine)
+    yield engine
+    engine.dispose()
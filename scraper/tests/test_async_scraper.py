@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+
+import httpx
+
+import config
+from async_scraper import AsyncScrapeEngine
+from fetcher import TIER_BROWSER, TIER_STATIC, TieredFetcher
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'pages')
+
+
+def serve_fixture(request):
+    with open(os.path.join(PAGES_DIR, request.url.path.strip('/')), encoding='utf-8') as f:
+        return httpx.Response(200, text=f.read(), headers={'Content-Type': 'text/html'})
+
+
+class FakeScraper:
+    max_workers = 1
+
+    def __init__(self):
+        self.fetcher = TieredFetcher()
+        self.batches = []
+
+    def get_driver(self):
+        return None
+
+    def return_driver(self, driver):
+        pass
+
+    def scrape_with_driver(self, url, driver):
+        return "rendered description"
+
+    def add_keywords(self, internships, descriptions):
+        self.batches.append(len(internships))
+        for internship, description in zip(internships, descriptions):
+            internship['keywords'] = ['python'] if description else []
+
+
+class FakeWriter:
+    def __init__(self):
+        self.rows = []
+
+    def put(self, internship):
+        self.rows.append(internship)
+
+
+def make_engine(monkeypatch):
+    monkeypatch.setattr(config, 'DESCRIPTION_CACHE_ENABLED', False)
+    engine = AsyncScrapeEngine(FakeScraper(), concurrency=4)
+    engine.writer = FakeWriter()
+    return engine
+
+
+def test_async_path_follows_the_fetcher_tiers(monkeypatch):
+    engine = make_engine(monkeypatch)
+
+    async def scrape():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(serve_fixture)) as client:
+            browsers = asyncio.Semaphore(1)
+            return [await engine.scrape_description(client, browsers, f'https://example.com/{page}')
+                    for page in ('careers_site.html', 'no_selector.html')]
+
+    static, rendered = asyncio.run(scrape())
+    assert len(static) > engine.scraper.fetcher.min_length
+    assert rendered == "rendered description"
+    stats = engine.scraper.fetcher.stats
+    assert stats[TIER_STATIC] == 1 and stats[TIER_BROWSER] == 1
+
+
+def test_workers_extract_keywords_in_batches(monkeypatch):
+    engine = make_engine(monkeypatch)
+    monkeypatch.setattr(config, 'NLP_BATCH_SIZE', 3)
+
+    async def scrape():
+        queue = asyncio.Queue()
+        for i in range(7):
+            queue.put_nowait({'id': str(i), 'url': 'https://example.com/careers_site.html'})
+        async with httpx.AsyncClient(transport=httpx.MockTransport(serve_fixture)) as client:
+            workers = [asyncio.create_task(engine.worker(queue, client, asyncio.Semaphore(1))) for _ in range(2)]
+            await queue.join()
+            for task in workers:
+                task.cancel()
+        await engine.add_keywords(engine.pending)
+
+    asyncio.run(scrape())
+    assert engine.scraper.batches == [3, 3, 1]
+    assert [row['keywords'] for row in engine.writer.rows] == [['python']] * 7
+
+
+def test_concurrent_postings_share_one_board_download(monkeypatch):
+    engine = make_engine(monkeypatch)
+    with open(os.path.join(os.path.dirname(PAGES_DIR), 'ats', 'ashby.json'), encoding='utf-8') as f:
+        board = json.load(f)['response']
+    requested = []
+
+    def serve_board(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, json=board)
+
+    async def scrape():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(serve_board)) as client:
+            browsers = asyncio.Semaphore(1)
+            return await asyncio.gather(*(
+                engine.scrape_description(client, browsers, f'https://jobs.ashbyhq.com/examplecorp/{job["id"]}')
+                for job in board['jobs']))
+
+    assert all(asyncio.run(scrape()))
+    assert requested == ['https://api.ashbyhq.com/posting-api/job-board/examplecorp']
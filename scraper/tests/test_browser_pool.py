@@ -0,0 +1,153 @@
+import threading
+import time
+import types
+
+import pytest
+
+from browser_pool import RECYCLE_BROKEN, RECYCLE_DEAD, RECYCLE_PAGES, BrowserPool
+
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.responding = True
+        self.quit_called = False
+        self.service = types.SimpleNamespace(process=types.SimpleNamespace(pid=None, poll=lambda: None))
+
+    def execute_script(self, script):
+        if not self.responding:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self):
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            driver = FakeDriver(len(self.drivers))
+            self.drivers.append(driver)
+            return driver
+
+
+def make_pool(size=2, max_pages=0):
+    factory = Factory()
+    return BrowserPool(factory, size=size, max_pages=max_pages, max_memory_mb=None, acquire_timeout=5), factory
+
+
+def test_pool_never_exceeds_its_size():
+    pool, factory = make_pool(size=2)
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+    pool.release(first)
+    assert pool.acquire(timeout=0.05) is first
+    assert len(factory.drivers) == 2
+
+
+def test_concurrent_workers_share_the_bounded_pool():
+    pool, factory = make_pool(size=3)
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        for _ in range(10):
+            with pool.driver() as driver:
+                with lock:
+                    in_use.append(driver)
+                    peak.append(len(in_use))
+                time.sleep(0.001)
+                with lock:
+                    in_use.remove(driver)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 3
+    assert len(factory.drivers) <= 3
+    assert pool.stats()['acquired'] == 80 and pool.stats()['in_use'] == 0
+
+
+def test_a_waiting_worker_gets_the_released_browser():
+    pool, factory = make_pool(size=1)
+    driver = pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    assert borrowed == []
+    pool.release(driver)
+    waiter.join()
+    assert borrowed == [driver]
+
+
+@pytest.mark.parametrize('kill', ['unresponsive', 'exited'])
+def test_dead_browsers_are_replaced_on_acquire(kill):
+    pool, factory = make_pool(size=1)
+    driver = pool.acquire()
+    pool.release(driver)
+    if kill == 'unresponsive':
+        driver.responding = False
+    else:
+        driver.service.process.poll = lambda: 1
+
+    replacement = pool.acquire()
+    assert replacement is not driver and driver.quit_called
+    assert pool.stats()['recycled'] == {RECYCLE_DEAD: 1}
+
+
+def test_browsers_are_recycled_after_max_pages():
+    pool, factory = make_pool(size=1, max_pages=3)
+    used = []
+    for _ in range(7):
+        with pool.driver() as driver:
+            used.append(driver.number)
+
+    assert used == [0, 0, 0, 1, 1, 1, 2]
+    assert factory.drivers[0].quit_called and factory.drivers[1].quit_called
+    assert not factory.drivers[2].quit_called
+    assert pool.stats()['recycled'] == {RECYCLE_PAGES: 2}
+
+
+def test_broken_browsers_are_restarted():
+    pool, factory = make_pool(size=1)
+    driver = pool.acquire()
+    pool.release(driver, broken=True)
+    assert driver.quit_called
+    assert pool.acquire() is not driver
+    assert pool.stats()['recycled'] == {RECYCLE_BROKEN: 1}
+
+
+def test_a_failed_start_frees_its_slot():
+    pool, factory = make_pool(size=1)
+
+    def fail():
+        raise RuntimeError("chromedriver missing")
+    pool.factory = fail
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    pool.factory = factory
+    assert pool.acquire(timeout=0.05) is factory.drivers[0]
+    assert pool.stats()['failed'] == 1
+
+
+def test_close_quits_idle_and_released_browsers():
+    pool, factory = make_pool(size=2)
+    idle, leased = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.quit_called and not leased.quit_called
+    pool.release(leased)
+    assert leased.quit_called
+    with pytest.raises(RuntimeError):
+        pool.acquire()
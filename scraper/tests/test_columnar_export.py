@@ -0,0 +1,62 @@
+import runpy
+import sys
+
+import pytest
+
+import config
+from database import upsert_internships
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq  # noqa: E402
+
+from columnar_export import export_columnar  # noqa: E402
+
+POSTINGS = [
+    {'id': 'a', 'active': True, 'company_name': "Acme", 'title': "Intern", 'season': "Summer",
+     'locations': ["NYC", "SF"], 'date_updated': 1, 'keywords': ["python", "sql"], 'xata': {'version': 2}},
+    {'id': 'b', 'active': True, 'company_name': "Initech", 'title': "Intern", 'season': "Summer",
+     'locations': [], 'date_updated': 2, 'keywords': []},
+    {'id': 'c', 'active': False, 'company_name': "Acme", 'title': "Co-op", 'season': None,
+     'locations': ["Remote"], 'date_updated': 3, 'keywords': ["react"]},
+]
+
+
+def test_parquet_round_trip(engine, tmp_path):
+    upsert_internships(engine, POSTINGS)
+    path, count = export_columnar(engine, str(tmp_path / 'internships.parquet'), chunk_size=2)
+    assert count == 3
+
+    table = pq.read_table(path)
+    for name in ('company_name', 'season', 'sponsorship'):
+        assert pa.types.is_dictionary(table.schema.field(name).type)
+    assert table.schema.field('keywords').type == pa.list_(pa.string())
+    assert table.schema.field('skill_ids').type == pa.list_(pa.int32())
+    assert pq.ParquetFile(path).num_row_groups == 2
+
+    rows = {row['id']: row for row in table.to_pylist()}
+    assert rows['a']['company_name'] == rows['c']['company_name'] == "Acme"
+    assert rows['a']['keywords'] == ["python", "sql"] and rows['b']['keywords'] == []
+    assert rows['a']['locations'] == ["NYC", "SF"]
+    assert rows['a']['xata'] == '{"version": 2}' and rows['b']['xata'] is None
+    assert rows['c']['season'] is None and rows['c']['active'] is False
+    assert len(rows['a']['skill_ids']) == 2
+
+
+def test_incremental_cli_skips_a_second_run_with_nothing_new(engine, tmp_path, monkeypatch, capsys):
+    upsert_internships(engine, POSTINGS)
+    monkeypatch.setattr(config, 'DATABASE_PATH', str(tmp_path / 'internships.db'))
+    exports = str(tmp_path / 'exports')
+
+    def run():
+        monkeypatch.setattr(sys, 'argv', ['columnar_export.py', exports, '--incremental'])
+        runpy.run_module('columnar_export', run_name='__main__')
+        return capsys.readouterr().out
+
+    assert "Exported 3 internships" in run()
+    assert "Nothing new to export" in run()
+
+    upsert_internships(engine, [dict(POSTINGS[1], title="Senior Intern", date_updated=4)])
+    assert "Exported 1 internships" in run()
+    parts = sorted((tmp_path / 'exports').iterdir())
+    assert len(parts) == 2
+    assert pq.read_table(parts[-1]).column('title').to_pylist() == ["Senior Intern"]
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import OperationalError
+
+from database import create_db_engine, open_database, upsert_internships
+from models import Internship, InternshipSkill
+from taxonomy import SKILLS_BY_NAME
+
+
+def posting(id, **fields):
+    return dict({'id': id, 'active': True, 'company_name': "Acme", 'title': "Intern",
+                 'date_updated': 1, 'keywords': ["python"]}, **fields)
+
+
+def stored(engine):
+    table = Internship.__table__
+    with engine.connect() as conn:
+        return {row.id: row for row in conn.execute(select(table))}
+
+
+def skill_rows(engine):
+    table = InternshipSkill.__table__
+    with engine.connect() as conn:
+        return sorted(conn.execute(select(table.c.internship_id, table.c.skill_id)).all())
+
+
+def test_upsert_updates_existing_rows_in_place(engine):
+    upsert_internships(engine, [posting('a'), posting('b')])
+    upsert_internships(engine, [posting('a', title="Senior Intern", date_updated=2)])
+
+    rows = stored(engine)
+    assert len(rows) == 2
+    assert (rows['a'].title, rows['a'].date_updated) == ("Senior Intern", 2)
+    assert rows['b'].title == "Intern"
+
+
+def test_upsert_normalizes_keywords_and_replaces_skill_rows(engine):
+    upsert_internships(engine, [posting('a', keywords=["python", "k8s"])])
+    assert stored(engine)['a'].keywords == ["python", "kubernetes"]
+
+    upsert_internships(engine, [posting('a', keywords=["golang"])])
+    assert stored(engine)['a'].keywords == ["go"]
+    assert skill_rows(engine) == [('a', SKILLS_BY_NAME["go"].id)]
+
+
+def test_duplicate_ids_are_written_once_with_the_last_values(engine):
+    # PostgreSQL rejects an ON CONFLICT statement that touches the same row twice
+    assert upsert_internships(engine, [posting('a', title="first"), posting('b'), posting('a', title="second")]) == 2
+    assert stored(engine)['a'].title == "second"
+
+
+def test_readers_open_without_migrating(engine, tmp_path):
+    upsert_internships(engine, [posting('a')])
+    db_path = str(tmp_path / 'internships.db')
+    reader = open_database(db_path)
+    assert list(stored(reader)) == ['a']
+    with pytest.raises(OperationalError):
+        with reader.begin() as conn:
+            conn.execute(text("DELETE FROM internships"))
+    reader.dispose()
+
+
+def test_readers_refuse_an_old_schema_instead_of_upgrading_it(tmp_path):
+    db_path = str(tmp_path / 'old.db')
+    old = create_db_engine(db_path)
+    with old.begin() as conn:
+        conn.execute(text("CREATE TABLE internships (id VARCHAR PRIMARY KEY, title VARCHAR)"))
+    old.dispose()
+
+    with pytest.raises(RuntimeError, match='internships.skill_ids'):
+        open_database(db_path)
+    with pytest.raises(FileNotFoundError):
+        open_database(str(tmp_path / 'missing.db'))
+    assert not os.path.exists(tmp_path / 'missing.db')
+    assert 'skill_ids' not in {c['name'] for c in inspect(create_db_engine(db_path)).get_columns('internships')}
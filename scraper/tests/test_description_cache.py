@@ -0,0 +1,129 @@
+import types
+
+import pytest
+
+import config
+import description_cache
+from description_cache import DescriptionCache
+from fetcher import TIER_API, TIER_NOT_MODIFIED, TIER_STATIC, TieredFetcher
+
+URL = 'https://example.com/jobs/1'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.time() for the cache module."""
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(description_cache, 'time', types.SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = DescriptionCache(str(tmp_path / 'description_cache.db'), ttl=60, max_mb=1)
+    yield cache
+    cache.engine.dispose()
+
+
+def test_validators_are_only_sent_to_the_tier_that_produced_them(cache):
+    cache.store(URL, "Build things in Python.", TIER_STATIC, etag='"v1"', last_modified="Mon, 01 Sep 2025 00:00:00 GMT")
+    entry = cache.get(URL)
+    assert DescriptionCache.conditional_headers(entry, TIER_STATIC) == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': "Mon, 01 Sep 2025 00:00:00 GMT"}
+    assert DescriptionCache.conditional_headers(entry, TIER_API) == {}
+    assert DescriptionCache.conditional_headers(None, TIER_STATIC) == {}
+
+
+def test_touch_resets_the_ttl(cache, clock):
+    cache.store(URL, "Build things in Python.", TIER_STATIC, etag='"v1"')
+    clock.value += 61
+    assert not cache.is_fresh(cache.get(URL))
+    cache.touch(URL)
+    assert cache.is_fresh(cache.get(URL))
+
+
+class NotModifiedSession:
+    def __init__(self):
+        self.headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.headers.append(headers)
+        return types.SimpleNamespace(status_code=304, headers={})
+
+    def close(self):
+        pass
+
+
+def test_stale_entries_are_revalidated_with_a_conditional_request(cache, clock, monkeypatch):
+    monkeypatch.setattr(config, 'DESCRIPTION_CACHE_ENABLED', False)
+    fetcher = TieredFetcher()
+    fetcher.cache = cache
+    fetcher.session = NotModifiedSession()
+    cache.store(URL, "Build things in Python.", TIER_STATIC, etag='"v1"')
+
+    assert fetcher.fetch(URL) == "Build things in Python."
+    assert fetcher.session.headers == []  # Still fresh, no request at all
+
+    clock.value += 61
+    assert fetcher.fetch(URL) == "Build things in Python."
+    assert fetcher.session.headers[0]['If-None-Match'] == '"v1"'
+    assert fetcher.stats[TIER_NOT_MODIFIED] == 1
+    assert cache.is_fresh(cache.get(URL))
+
+
+def test_unchanged_descriptions_skip_keyword_extraction(cache, monkeypatch):
+    monkeypatch.setattr(config, 'DESCRIPTION_CACHE_ENABLED', False)
+    fetcher = TieredFetcher()
+    fetcher.cache = cache
+    extracted = []
+
+    def extract_many(descriptions):
+        extracted.extend(descriptions)
+        return [["python"] for _ in descriptions]
+
+    cache.store(URL, "Build things in Python.", TIER_STATIC)
+    assert fetcher.keywords_for_many([(URL, "Build things in Python.")], extract_many) == [["python"]]
+    assert fetcher.keywords_for_many([(URL, "Build things in Python.")], extract_many) == [["python"]]
+    assert extracted == ["Build things in Python."]
+
+    # The page changed: same URL, new text
+    assert fetcher.keywords_for_many([(URL, "Build things in Go.")], extract_many) == [["python"]]
+    assert extracted == ["Build things in Python.", "Build things in Go."]
+
+
+@pytest.mark.parametrize('module, setting, value', [
+    (config, 'NLP_MODE', 'other'),
+    (config, 'SPACY_MODEL', 'other'),
+    (config, 'KEYWORD_TEXT_MIN_CHARS', 0),
+    (config, 'KEYWORD_TEXT_MAX_CHARS', 1),
+    (description_cache, 'TAXONOMY_VERSION', 'other'),
+])
+def test_extractor_settings_invalidate_cached_keywords(cache, monkeypatch, module, setting, value):
+    cache.store(URL, "Build things in Python.", TIER_STATIC)
+    cache.store_keywords(URL, "Build things in Python.", ["python"])
+    assert cache.keywords_for(URL, "Build things in Python.") == ["python"]
+
+    monkeypatch.setattr(module, setting, value)
+    assert cache.keywords_for(URL, "Build things in Python.") is None
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(cache, clock):
+    cache.max_bytes = 2500
+    for i in range(3):
+        clock.value += 1
+        cache.store(f'{URL}/{i}', "x" * 1000, TIER_STATIC)
+    clock.value += 1
+    cache.get(f'{URL}/0')  # Now the most recently used
+
+    cache.evict()
+    assert cache.get(f'{URL}/1') is None
+    assert cache.get(f'{URL}/0') and cache.get(f'{URL}/2')
+
+
+def test_eviction_runs_every_few_stores(cache, clock, monkeypatch):
+    monkeypatch.setattr(description_cache, 'EVICT_EVERY', 2)
+    cache.max_bytes = 1500
+    for i in range(2):
+        clock.value += 1
+        cache.store(f'{URL}/{i}', "x" * 1000, TIER_STATIC)
+    assert cache.get(f'{URL}/0') is None and cache.get(f'{URL}/1')
@@ -0,0 +1,36 @@
+import config
+from extraction_pool import ExtractionPool
+from keyword_extractor import KeywordExtractor
+
+
+class NoCacheFetcher:
+    cache = None
+
+
+class ListWriter:
+    def __init__(self):
+        self.rows = []
+
+    def put(self, internship):
+        self.rows.append(internship)
+
+
+def pool_keywords(descriptions, processes):
+    writer = ListWriter()
+    pool = ExtractionPool(NoCacheFetcher(), writer, processes=processes, batch_size=len(descriptions))
+    pool.start()
+    for i, description in enumerate(descriptions):
+        pool.put({'id': str(i), 'url': f'https://example.com/{i}'}, description)
+    pool.close()
+    return {row['id']: row['keywords'] for row in writer.rows}
+
+
+def test_pool_and_inline_paths_extract_the_same_keywords(monkeypatch):
+    monkeypatch.setattr(config, 'NLP_MODE', 'off')
+    long_description = "Python and SQL. " + "filler " * config.KEYWORD_TEXT_MAX_CHARS + "Rust and Kubernetes."
+    descriptions = [long_description, "Go", "Java and React"]
+
+    expected = dict(zip(('0', '1', '2'), KeywordExtractor().extract_many(descriptions)))
+    assert expected == {'0': ['python', 'sql'], '1': [], '2': ['java', 'react']}
+    assert pool_keywords(descriptions, processes=1) == expected
+    assert pool_keywords(descriptions, processes=0) == expected
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from feed import iter_json_array
+
+FEEDS = {
+    'objects': [{'id': 'a', 'locations': ["NYC", "SF"], 'xata': {'version': 3}}, {'id': 'b', 'active': False}],
+    'strings': ['say "hi" [ok]', 'back\\slash {', "café ✓", '\\"]'],
+    'scalars': [3.25, 3.25e10, -12, 0, 1e-3, True, False, None, 700],
+}
+
+
+def splits(data: bytes):
+    """The feed cut into two chunks at every byte offset, then one byte at a time."""
+    for offset in range(len(data) + 1):
+        yield [data[:offset], data[offset:]]
+    yield [data[i:i + 1] for i in range(len(data))]
+
+
+@pytest.mark.parametrize('name', FEEDS)
+@pytest.mark.parametrize('indent', [None, 2])
+def test_elements_survive_every_chunk_boundary(name, indent):
+    data = json.dumps(FEEDS[name], indent=indent, ensure_ascii=False).encode('utf-8')
+    for chunks in splits(data):
+        assert list(iter_json_array(chunks)) == FEEDS[name], chunks
+
+
+@pytest.mark.parametrize('chunks', [[b'[3.', b'25]'], [b'[3.25e', b'10]'], [b'[1', b'2, -', b'5]']])
+def test_numbers_are_not_cut_short(chunks):
+    assert list(iter_json_array(chunks)) == json.loads(b''.join(chunks))
+
+
+@pytest.mark.parametrize('data', [b'[1, 2', b'{"id": 1}', b'[3.x, 4]'])
+def test_malformed_feeds_raise(data):
+    for chunks in splits(data):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunks))
@@ -0,0 +1,64 @@
+import json
+
+import feed_snapshot
+from feed_snapshot import FeedSnapshotStore, diff
+
+PREVIOUS = [
+    {'id': 'a', 'title': "Intern", 'locations': ["NYC"], 'active': True},
+    {'id': 'b', 'title': "Intern", 'locations': [], 'active': True},
+    {'id': 'c', 'title': "Co-op", 'locations': [], 'active': True},
+]
+CURRENT = [
+    {'active': True, 'locations': ["NYC"], 'title': "Intern", 'id': 'a'},  # Same content, other key order
+    {'id': 'b', 'title': "Intern", 'locations': [], 'active': False},
+    {'id': 'd', 'title': "New Grad", 'locations': ["SF"], 'active': True},
+]
+
+
+def test_diff_reports_added_changed_and_removed():
+    changes = diff(PREVIOUS, CURRENT)
+    assert changes == {'added': [CURRENT[2]], 'changed': [CURRENT[1]], 'removed': ['c']}
+
+
+def test_diff_of_identical_feeds_is_empty():
+    assert diff(PREVIOUS, PREVIOUS) == {'added': [], 'changed': [], 'removed': []}
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, items):
+        self.body = json.dumps(items).encode('utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        return (self.body[i:i + 7] for i in range(0, len(self.body), 7))
+
+
+class FakeSession:
+    def __init__(self, *feeds):
+        self.feeds = list(feeds)
+
+    def get(self, url, headers=None, stream=None, timeout=None):
+        return FakeResponse(self.feeds.pop(0))
+
+
+def test_diff_latest_compares_the_last_two_snapshots(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(feed_snapshot.time, 'time', lambda: next(clock))
+    store = FeedSnapshotStore(str(tmp_path), ttl=0)
+    session = FakeSession(PREVIOUS, CURRENT)
+
+    store.refresh('https://example.com/feed', session=session)
+    assert store.diff_latest('https://example.com/feed') is None
+    store.refresh('https://example.com/feed', session=session)
+    assert store.diff_latest('https://example.com/feed') == diff(PREVIOUS, CURRENT)
@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+import config
+from fetcher import TIER_API, TIER_BROWSER, TIER_STATIC, TieredFetcher
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+PAGES_DIR = os.path.join(FIXTURES_DIR, 'pages')
+ATS_DIR = os.path.join(FIXTURES_DIR, 'ats')
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession:
+    def __init__(self, page):
+        with open(os.path.join(PAGES_DIR, page), encoding='utf-8') as f:
+            self.text = f.read()
+
+    def get(self, url, headers=None, timeout=None):
+        return FakeResponse(self.text)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_fetcher(monkeypatch):
+    monkeypatch.setattr(config, 'DESCRIPTION_CACHE_ENABLED', False)
+
+    def make(page):
+        fetcher = TieredFetcher()
+        fetcher.session = FakeSession(page)
+        return fetcher
+    return make
+
+
+def test_selector_match_skips_the_browser(make_fetcher):
+    fetcher = make_fetcher('careers_site.html')
+    browser_urls = []
+    description = fetcher.fetch('https://example.com/jobs/1', lambda url: browser_urls.append(url))
+    assert description and browser_urls == []
+    assert fetcher.stats[TIER_STATIC] == 1
+
+
+def test_fallback_text_escalates_to_the_browser(make_fetcher):
+    fetcher = make_fetcher('no_selector.html')
+    assert fetcher.fetch('https://example.com/jobs/1', lambda url: "rendered description") == "rendered description"
+    assert fetcher.stats[TIER_BROWSER] == 1
+
+
+def test_fallback_text_is_kept_when_the_browser_finds_nothing(make_fetcher):
+    fetcher = make_fetcher('no_selector.html')
+    description = fetcher.fetch('https://example.com/jobs/1', lambda url: None)
+    assert len(description) > fetcher.min_length
+    assert fetcher.stats[TIER_STATIC] == 1
+
+
+class BoardSession:
+    """Serves the recorded Ashby board and counts the requests made for it."""
+
+    def __init__(self):
+        with open(os.path.join(ATS_DIR, 'ashby.json'), encoding='utf-8') as f:
+            self.board = json.load(f)['response']
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.urls.append(url)
+        return FakeResponse(json.dumps(self.board))
+
+    def close(self):
+        pass
+
+
+def test_shared_ats_board_is_downloaded_once_per_run(make_fetcher):
+    fetcher = make_fetcher('no_selector.html')
+    fetcher.session = BoardSession()
+    descriptions = [fetcher.fetch(f'https://jobs.ashbyhq.com/examplecorp/{job["id"]}')
+                    for job in fetcher.session.board['jobs']]
+    assert all(descriptions) and descriptions[0] != descriptions[1]
+    assert fetcher.session.urls == ['https://api.ashbyhq.com/posting-api/job-board/examplecorp']
+    assert fetcher.stats[TIER_API] == 2
@@ -0,0 +1,87 @@
+import pytest
+from lxml import etree, html as lxml_html
+
+import config
+from html_extraction import css_to_xpath
+
+
+def classes(*names):
+    return {f'.{name}': (f'<div class="intro {name}" title="hit">', f'<div class="{name}s intro">')
+            for name in names}
+
+
+def ids(*names):
+    return {f'#{name}': (f'<div id="{name}" title="hit">', f'<div id="{name}-2">') for name in names}
+
+
+# Selector -> (element it must match, title="hit"; near miss it must not match)
+SAMPLES = {
+    **classes('job-description', 'job-details', 'description', 'job-summary', 'position-description',
+              'role-description', 'job-content', 'job-info', 'posting-description', 'job-desc',
+              'jobDescription', 'job-description-content', 'job-posting-description', 'content',
+              'main-content'),
+    **ids('job-description', 'job-details', 'description', 'job-summary', 'jobDescription', 'job-desc',
+          'job-content', 'content'),
+    "[data-testid='job-description']": ('<div data-testid="job-description" title="hit">',
+                                        '<div data-testid="job-description-header">'),
+    "[data-test='job-description']": ('<div data-test="job-description" title="hit">',
+                                      '<div data-testid="job-description">'),
+    "[data-qa='job-description']": ('<div data-qa="job-description" title="hit">', '<div data-qa="job">'),
+    "[data-automation='job-description']": ('<div data-automation="job-description" title="hit">',
+                                            '<div data-automation="Job-Description">'),
+    "div[class*='description']": ('<div class="fullDescription description-body" title="hit">',
+                                  '<span class="description">'),
+    "div[class*='job-desc']": ('<div class="main-job-desc-body" title="hit">', '<div class="job_desc">'),
+    "div[class*='posting']": ('<div class="job-posting" title="hit">', '<div class="post">'),
+    "section[class*='description']": ('<section class="descriptions" title="hit">',
+                                      '<section class="summary">'),
+    "[aria-label*='job description']": ('<section aria-label="Full job description" title="hit">',
+                                        '<section aria-label="job">'),
+    "[aria-label*='description']": ('<div aria-label="Role description" title="hit">',
+                                    '<div aria-label="Summary">'),
+    "article": ('<article title="hit">', '<div class="article">'),
+    "main[role='main']": ('<main role="main" title="hit">', '<main>'),
+}
+
+
+def hits(selector, snippet):
+    # The parser closes the sample element itself
+    document = lxml_html.fromstring(f"<html><body><p>Intro</p>{snippet}text</body></html>")
+    return [element.get('title') for element in document.xpath(css_to_xpath(selector))]
+
+
+def test_every_configured_selector_has_a_sample():
+    assert set(SAMPLES) == set(config.JOB_DESCRIPTION_SELECTORS)
+    assert set(config.PAGE_SHELL_SELECTORS) | set(config.READINESS_SELECTORS) == set(SAMPLES)
+
+
+@pytest.mark.parametrize('selector', config.READINESS_SELECTORS + config.PAGE_SHELL_SELECTORS)
+def test_configured_selectors_match_like_css(selector):
+    match, near_miss = SAMPLES[selector]
+    etree.XPath(css_to_xpath(selector))
+    assert hits(selector, match) == ['hit']
+    assert hits(selector, near_miss) == []
+
+
+@pytest.mark.parametrize('selector, xpath', [
+    (".job-description", "descendant-or-self::*[contains(concat(' ', normalize-space(@class), ' '), ' job-description ')]"),
+    ("#job-description", "descendant-or-self::*[@id='job-description']"),
+    ("[data-testid='job-description']", "descendant-or-self::*[@data-testid='job-description']"),
+    ("div[class*='description']", "descendant-or-self::div[contains(@class, 'description')]"),
+    ("[aria-label*='job description']", "descendant-or-self::*[contains(@aria-label, 'job description')]"),
+    ("article", "descendant-or-self::article"),
+    ("main[role='main']", "descendant-or-self::main[@role='main']"),
+    ("div > p", "descendant-or-self::div/child::p"),
+    ("ul li#a, b", "descendant-or-self::ul/descendant::li[@id='a'] | descendant-or-self::b"),
+    ("[title=\"it's\"]", "descendant-or-self::*[@title=\"it's\"]"),
+])
+def test_xpath_translation(selector, xpath):
+    assert css_to_xpath(selector) == xpath
+
+
+@pytest.mark.parametrize('selector', [
+    "", "a:hover", "p:nth-child(2)", "div::before", "div + p", "div ~ p", "div >", ", a", "[data-x", "div.",
+])
+def test_unsupported_syntax_raises(selector):
+    with pytest.raises(ValueError):
+        css_to_xpath(selector)
@@ -0,0 +1,94 @@
+import sys
+import types
+from collections import namedtuple
+
+import pytest
+
+import keyword_extractor
+from keyword_extractor import EXCLUDED_COMPONENTS, KeywordExtractor
+
+Span = namedtuple('Span', 'text label_')
+
+# Phrases the fake pipeline reports as named entities and noun chunks
+ENTITIES = ["Acme Cloud Platform", "Initech"]
+CHUNKS = ["machine learning", "the team"]
+
+
+class FakeDoc:
+    def __init__(self, text):
+        self.ents = [Span(entity, 'ORG') for entity in ENTITIES if entity in text]
+        self.noun_chunks = [Span(chunk, '') for chunk in CHUNKS if chunk in text.lower()]
+
+
+class FakeNlp:
+    def __init__(self, exclude):
+        self.exclude = exclude
+        self.batches = []
+
+    def pipe(self, texts, batch_size=None, n_process=None):
+        texts = list(texts)
+        self.batches.append(len(texts))
+        return (FakeDoc(text) for text in texts)
+
+
+@pytest.fixture
+def fake_spacy(monkeypatch):
+    """A stand-in spacy module recording what each load() excluded."""
+    loads = []
+
+    def load(name, exclude=()):
+        nlp = FakeNlp(list(exclude))
+        loads.append(nlp)
+        return nlp
+
+    monkeypatch.setitem(sys.modules, 'spacy', types.SimpleNamespace(load=load))
+    monkeypatch.setattr(keyword_extractor, '_models', {})
+    return loads
+
+
+TEXTS = [
+    "Python on the Acme Cloud Platform, with machine learning and Initech.",
+    None,
+    "Hi",
+    "React and TypeScript for the team.",
+]
+
+
+def test_off_mode_never_loads_spacy(monkeypatch):
+    def fail(mode):
+        raise AssertionError("spaCy loaded with NLP_MODE off")
+    monkeypatch.setattr(keyword_extractor, '_load_model', fail)
+
+    extractor = KeywordExtractor(mode="off")
+    assert extractor.nlp is None
+    assert extractor.extract_many(TEXTS)[0] == ['machine learning', 'python']
+
+
+@pytest.mark.parametrize("mode, excluded", [
+    ("lightweight", {"tagger", "parser", "attribute_ruler", "lemmatizer", "senter"}),
+    ("full", {"lemmatizer", "senter"}),
+])
+def test_modes_exclude_the_documented_components(fake_spacy, mode, excluded):
+    KeywordExtractor(mode=mode).extract_many(TEXTS)
+    assert len(fake_spacy) == 1
+    assert set(fake_spacy[0].exclude) == set(EXCLUDED_COMPONENTS[mode]) == excluded
+
+
+def test_models_are_loaded_once_per_mode(fake_spacy):
+    KeywordExtractor(mode="lightweight").extract_many(TEXTS)
+    KeywordExtractor(mode="lightweight").extract_many(TEXTS)
+    assert len(fake_spacy) == 1
+
+
+@pytest.mark.parametrize("mode", ["off", "lightweight", "full"])
+def test_extract_many_matches_extract(fake_spacy, mode):
+    extractor = KeywordExtractor(mode=mode)
+    assert extractor.extract_many(TEXTS) == [extractor.extract(text) for text in TEXTS]
+
+
+def test_extract_many_runs_one_pipe_over_the_batch(fake_spacy):
+    keywords = KeywordExtractor(mode="full").extract_many(TEXTS)
+    # Empty and too-short texts never reach spaCy
+    assert fake_spacy[0].batches == [2]
+    assert keywords[0] == ['acme cloud platform', 'machine learning', 'python']
+    assert keywords[1] == keywords[2] == []
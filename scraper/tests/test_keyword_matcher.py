@@ -0,0 +1,38 @@
+from keyword_matcher import KeywordMatcher, find_keywords
+
+
+def test_symbol_keywords_keep_their_boundaries():
+    assert find_keywords("C++ and C# developers") == ['c#', 'c++']
+    assert find_keywords("RxJava and Gopher") == []
+
+
+def test_js_suffix_matches_the_framework():
+    assert find_keywords("React.js and Express.js") == ['express', 'react']
+    assert find_keywords("Vue.js") == ['vue']
+
+
+def test_dotted_names_are_kept():
+    assert 'node.js' in find_keywords("Node.js services")
+    assert 'next.js' in find_keywords("built with Next.js")
+
+
+def test_method_calls_are_not_keywords():
+    assert find_keywords("call express.json() first") == []
+
+
+def test_hyphenated_short_words_are_not_keywords():
+    assert find_keywords("our go-to tool") == []
+    assert find_keywords("R-squared and the C-suite") == []
+
+
+def test_standalone_short_keywords_match():
+    assert find_keywords("Go, R and SQL") == ['go', 'r', 'sql']
+
+
+def test_hyphen_bounding_only_applies_to_listed_keywords():
+    assert find_keywords("ai-powered search") == ['ai']
+    assert KeywordMatcher(['go'], hyphen_bounded=[]).find("our go-to tool") == {'go'}
+
+
+def test_aliases_resolve_to_canonical_names():
+    assert find_keywords("k8s and golang") == ['go', 'kubernetes']
@@ -0,0 +1,43 @@
+import config
+from page_readiness import PageReadiness
+from resource_policy import ResourcePolicy
+
+
+class FakeDriver:
+    """Loading for the first few probes, then complete; counts performance log reads."""
+
+    def __init__(self, loading_polls=3):
+        self.loading_polls = loading_polls
+        self.probes = 0
+        self.log_reads = 0
+        self.selectors = None
+
+    def execute_script(self, script, selectors, min_text):
+        self.probes += 1
+        self.selectors = selectors
+        return ['loading' if self.probes <= self.loading_polls else 'complete', False]
+
+    def get_log(self, kind):
+        self.log_reads += 1
+        return []
+
+
+def make_readiness(monkeypatch):
+    monkeypatch.setattr(config, 'READINESS_POLL_INTERVAL', 0.001)
+    monkeypatch.setattr(config, 'NETWORK_IDLE_TIME', 0.0)
+    policy = ResourcePolicy(enabled=False, metrics=True)
+    return PageReadiness(policy, waits=['selector', 'network_idle'], min_timeout=1.0, max_timeout=1.0)
+
+
+def test_performance_log_is_only_read_once_the_document_is_complete(monkeypatch):
+    driver = FakeDriver(loading_polls=3)
+    assert make_readiness(monkeypatch).wait(driver, 'https://example.com/job') == 'network_idle'
+    assert driver.probes == 4
+    assert driver.log_reads == 1
+
+
+def test_page_shells_do_not_count_as_ready(monkeypatch):
+    driver = FakeDriver(loading_polls=0)
+    make_readiness(monkeypatch).wait(driver, 'https://example.com/job')
+    assert '.job-description' in driver.selectors
+    assert not set(config.PAGE_SHELL_SELECTORS) & set(driver.selectors)
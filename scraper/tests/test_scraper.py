@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+
+import config
+from scraper import InternshipScraper
+
+
+def make_scraper(monkeypatch, count=4):
+    monkeypatch.setattr(config, 'SAVE_BATCH_SIZE', 2)
+    monkeypatch.setattr(config, 'MIN_DELAY', 0)
+    monkeypatch.setattr(config, 'MAX_DELAY', 0)
+    scraper = InternshipScraper.__new__(InternshipScraper)
+    for name in ('browser_pool', 'fetcher', 'resource_policy', 'readiness'):
+        setattr(scraper, name, MagicMock())
+    internships = [{'id': str(i), 'url': f'https://example.com/{i}', 'company_name': "Acme", 'title': "Intern"}
+                   for i in range(count)]
+    scraper.fetch_filtered_internships = lambda incremental: internships
+    scraper.scrape_job_description = lambda url: "description"
+    scraper.add_keywords = lambda internships, descriptions: [i.update(keywords=['python']) for i in internships]
+    scraper.saved = []
+    return scraper
+
+
+def test_failed_save_is_not_resubmitted_with_the_next_batch(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+
+    def save(internships):
+        scraper.saved.append([i['id'] for i in internships])
+        if len(scraper.saved) == 1:
+            raise RuntimeError("database is locked")
+    scraper.save_internships_batch = save
+
+    scraper.scrape_all()
+    assert scraper.saved == [['0', '1'], ['2', '3']]
+
+
+def test_failed_keyword_extraction_still_saves_the_batch(monkeypatch):
+    scraper = make_scraper(monkeypatch)
+
+    def add_keywords(internships, descriptions):
+        raise RuntimeError("model not loaded")
+    scraper.add_keywords = add_keywords
+    scraper.save_internships_batch = lambda internships: scraper.saved.extend(internships)
+
+    scraper.scrape_all()
+    assert [(i['id'], i['keywords']) for i in scraper.saved] == [(str(i), []) for i in range(4)]
@@ -0,0 +1,51 @@
+from sqlalchemy import select
+
+from database import data_version, upsert_internships
+from models import Internship
+from skill_index import SkillIndex, find_internships
+from sync import IncrementalSync
+
+
+def posting(id, **fields):
+    return dict({'id': id, 'active': True, 'company_name': "Acme", 'title': "Intern",
+                 'date_updated': 1, 'keywords': ["python"]}, **fields)
+
+
+def row_versions(engine):
+    table = Internship.__table__
+    with engine.connect() as conn:
+        return dict(conn.execute(select(table.c.id, table.c.row_version)).all())
+
+
+def test_every_write_bumps_the_data_version(engine):
+    upsert_internships(engine, [posting('a'), posting('b')])
+    upsert_internships(engine, [posting('b', date_updated=2)])
+    assert row_versions(engine) == {'a': 1, 'b': 2}
+
+    IncrementalSync(engine).deactivate_missing(['a'])
+    assert row_versions(engine) == {'a': 1, 'b': 3}
+    with engine.connect() as conn:
+        assert data_version(conn) == 3
+
+
+def test_skill_index_matches_sql_after_deactivation(engine):
+    upsert_internships(engine, [
+        posting('a', keywords=["python", "go"]),
+        posting('b', keywords=["python"]),
+        posting('c', keywords=["go", "rust"]),
+        posting('d', keywords=["rust"], active=False),
+    ])
+    index = SkillIndex(engine)
+    IncrementalSync(engine).deactivate_missing(['b', 'c'])
+
+    assert index.refresh()
+    assert index.refresh() is False
+    queries = [
+        {'all_of': ["python"]},
+        {'any_of': ["go", "rust"]},
+        {'all_of': ["rust"], 'active_only': False},
+        {'none_of': ["python"]},
+    ]
+    for query in queries:
+        assert sorted(index.query(**query)) == sorted(find_internships(engine, **query))
+    assert index.query(all_of=["python"]) == ['b']
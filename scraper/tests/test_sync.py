@@ -0,0 +1,34 @@
+from sqlalchemy import select
+
+from database import upsert_internships
+from models import Internship
+from sync import IncrementalSync
+
+
+def posting(id, **fields):
+    return dict({'id': id, 'active': True, 'company_name': "Acme", 'title': "Intern",
+                 'date_updated': 1, 'keywords': ["python"]}, **fields)
+
+
+def active_ids(engine):
+    table = Internship.__table__
+    with engine.connect() as conn:
+        return set(conn.execute(select(table.c.id).where(table.c.active == True)).scalars())
+
+
+def test_plan_keeps_new_and_changed_postings(engine):
+    upsert_internships(engine, [posting('same'), posting('updated'), posting('closed')])
+    candidates = [posting('same'), posting('updated', date_updated=2),
+                  posting('closed', active=False), posting('new')]
+
+    planned = IncrementalSync(engine).plan(candidates)
+    assert [p['id'] for p in planned] == ['updated', 'closed', 'new']
+
+
+def test_deactivate_missing_only_touches_missing_active_rows(engine):
+    upsert_internships(engine, [posting('kept'), posting('gone'), posting('old', active=False)])
+    sync = IncrementalSync(engine)
+
+    assert sync.deactivate_missing(['kept']) == 1
+    assert active_ids(engine) == {'kept'}
+    assert sync.deactivate_missing(['kept']) == 0
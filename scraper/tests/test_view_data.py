@@ -0,0 +1,71 @@
+import gzip
+import json
+
+import pytest
+
+from database import upsert_internships
+from view_data import EXPORT_FIELDS, export_to_json
+
+POSTINGS = [
+    {'id': 'a', 'active': True, 'company_name': "Acme", 'title': "Intern ✓", 'locations': ["NYC"],
+     'date_updated': 1, 'keywords': ["python"]},
+    {'id': 'b', 'active': True, 'company_name': "Initech", 'title': "Intern", 'date_updated': 2, 'keywords': []},
+    {'id': 'c', 'active': False, 'company_name': "Acme", 'title': "Co-op", 'date_updated': 3, 'keywords': ["react"]},
+]
+
+
+def read_export(path, fmt, compression):
+    if compression == 'gzip':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            text = f.read()
+    elif compression == 'zstd':
+        zstandard = pytest.importorskip('zstandard')
+        with open(path, 'rb') as f:
+            text = zstandard.ZstdDecompressor().stream_reader(f).read().decode('utf-8')
+    else:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+    if fmt == 'json':
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.fixture
+def db_path(engine, tmp_path):
+    upsert_internships(engine, POSTINGS)
+    return str(tmp_path / 'internships.db')
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip', 'zstd'])
+@pytest.mark.parametrize('fmt', ['json', 'ndjson'])
+def test_streamed_export_parses_back_to_the_rows(db_path, tmp_path, fmt, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    path = str(tmp_path / f'export.{fmt}')
+    assert export_to_json(db_path, path, fmt, compression=compression, chunk_size=2) == 3
+
+    rows = read_export(path, fmt, compression)
+    assert [row['id'] for row in rows] == ['a', 'b', 'c']
+    assert set(rows[0]) == set(EXPORT_FIELDS)
+    assert rows[0]['title'] == "Intern ✓" and rows[0]['locations'] == ["NYC"]
+    assert [row['keywords'] for row in rows] == [["python"], [], ["react"]]
+
+
+@pytest.mark.parametrize('fmt', ['json', 'ndjson'])
+def test_fields_and_keywords_only(db_path, tmp_path, fmt):
+    path = str(tmp_path / f'export.{fmt}.gz')
+    export_to_json(db_path, path, fmt, ['id', 'keywords'], 'gzip', with_keywords_only=True, chunk_size=1)
+    assert read_export(path, fmt, 'gzip') == [{'id': 'a', 'keywords': ["python"]},
+                                              {'id': 'c', 'keywords': ["react"]}]
+
+
+@pytest.mark.parametrize('fmt', ['json', 'ndjson'])
+def test_empty_export_is_still_valid(engine, tmp_path, fmt):
+    path = str(tmp_path / f'export.{fmt}')
+    assert export_to_json(str(tmp_path / 'internships.db'), path, fmt) == 0
+    assert read_export(path, fmt, None) == []
+
+
+def test_unknown_fields_are_rejected(db_path, tmp_path):
+    with pytest.raises(ValueError, match='salary'):
+        export_to_json(db_path, str(tmp_path / 'export.json'), fields=['id', 'salary'])
@@ -3,14 +3,21 @@
 View scraped internship data from the database
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from scraper import Internship
+import gzip
+import io
 import json
+from typing import List
+
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.orm import sessionmaker
+
+import config
+from models import Internship
+from database import open_database, stream_rows
 
 def view_internships(db_path: str = "internships.db"):
     """View all internships in the database."""
-    engine = create_engine(f'sqlite:///{db_path}')
+    engine = open_database(db_path)
     Session = sessionmaker(bind=engine)
     session = Session()
     
@@ -39,46 +46,90 @@ def view_internships(db_path: str = "internships.db"):
     finally:
         session.close()
 
-def export_to_json(db_path: str = "internships.db", output_file: str = "internships.json"):
-    """Export internships to JSON file."""
-    engine = create_engine(f'sqlite:///{db_path}')
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    
-    try:
-        internships = session.query(Internship).all()
-        
-        data = []
-        for internship in internships:
-            data.append({
-                'id': internship.id,
-                'company_name': internship.company_name,
-                'title': internship.title,
-                'locations': internship.locations,
-                'season': internship.season,
-                'sponsorship': internship.sponsorship,
-                'url': internship.url,
-                'keywords': internship.keywords,
-                'active': internship.active,
-                'is_visible': internship.is_visible,
-                'date_posted': internship.date_posted,
-                'date_updated': internship.date_updated,
-                'xata': internship.xata,
-                'scraped_at': internship.scraped_at.isoformat() if internship.scraped_at else None
-            })
-        
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        print(f"Exported {len(data)} internships to {output_file}")
-        
-    finally:
-        session.close()
+# Columns written by export_to_json unless fields are given
+EXPORT_FIELDS = ['id', 'company_name', 'title', 'locations', 'season', 'sponsorship', 'url', 'keywords',
+                 'active', 'is_visible', 'date_posted', 'date_updated', 'xata', 'scraped_at']
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def open_export(output_file: str, compression: str = None):
+    """Text file for the export, compressed on the fly with gzip or zstd (needs zstandard)."""
+    if compression is None:
+        return open(output_file, 'w', encoding='utf-8')
+    if compression == 'gzip':
+        return gzip.open(output_file, 'wt', encoding='utf-8', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression needs zstandard: pip install -r requirements-optional.txt") from None
+        raw = open(output_file, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding='utf-8')
+    raise ValueError(f"Unknown compression {compression!r} (expected gzip or zstd)")
+
+
+def export_to_json(db_path: str = "internships.db", output_file: str = "internships.json",
+                   fmt: str = 'json', fields: List[str] = None, compression: str = None,
+                   with_keywords_only: bool = False, chunk_size: int = None) -> int:
+    """Stream internships to a JSON array or NDJSON file in constant memory.
+
+    Rows are read chunk_size at a time and written one object per line; a JSON export
+    is the same lines wrapped in a well-formed array.
+    """
+    if fmt not in ('json', 'ndjson'):
+        raise ValueError(f"Unknown export format {fmt!r} (expected json or ndjson)")
+    fields = fields or EXPORT_FIELDS
+    table = Internship.__table__
+    unknown = [name for name in fields if name not in table.c]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    engine = open_database(db_path)
+    query = select(*[table.c[name] for name in fields]).order_by(table.c.id)
+    if with_keywords_only:
+        keywords = type_coerce(table.c.keywords, String)
+        query = query.where(keywords != None).where(keywords != '[]')
+
+    count = 0
+    with engine.connect() as conn, open_export(output_file, compression) as f:
+        separator = '[\n' if fmt == 'json' else ''
+        for rows in stream_rows(conn, query, chunk_size):
+            lines = []
+            for row in rows:
+                record = dict(zip(fields, row))
+                if record.get('scraped_at') is not None:
+                    record['scraped_at'] = record['scraped_at'].isoformat()
+                lines.append(json.dumps(record, ensure_ascii=False))
+            f.write(separator + (',\n' if fmt == 'json' else '\n').join(lines))
+            separator = ',\n' if fmt == 'json' else '\n'
+            count += len(rows)
+        if fmt == 'json':
+            f.write('\n]\n' if count else '[]\n')
+        elif count:
+            f.write('\n')
+
+    print(f"Exported {count} internships to {output_file}")
+    return count
+
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="View or export scraped internships")
+    parser.add_argument("command", nargs="?", choices=["view", "export"], default="view")
+    parser.add_argument("--output", help="Export file (default: internships.json / .ndjson)")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    parser.add_argument("--fields", help=f"Comma-separated columns to export (default: all of {','.join(EXPORT_FIELDS)})")
+    parser.add_argument("--compress", choices=sorted(COMPRESSION_SUFFIXES), help="Compress the export")
+    parser.add_argument("--with-keywords-only", action="store_true", help="Skip internships without keywords")
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1 and sys.argv[1] == "export":
-        export_to_json()
+    if args.command == "export":
+        output = args.output or f"internships.{args.format}"
+        if args.compress and not output.endswith(COMPRESSION_SUFFIXES[args.compress]):
+            output += COMPRESSION_SUFFIXES[args.compress]
+        fields = [name.strip() for name in args.fields.split(',')] if args.fields else None
+        export_to_json(config.DATABASE_PATH, output, args.format, fields, args.compress, args.with_keywords_only)
     else:
         view_internships()